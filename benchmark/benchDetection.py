@@ -0,0 +1,363 @@
+import argparse
+import ast
+import concurrent.futures
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+# main.py is in the parent folder of this benchmark
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+# resource is only available on Unix
+try:
+    import resource
+except ImportError:
+    resource = None
+
+baselineFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# default benchmark scenarios: name, number of ball, overlap in pixel
+# (positive overlap lets touching balls merge so the hough path is used)
+defaultScenarios = [('2balls', 2, 0),
+                    ('2balls-overlap', 2, 6),
+                    ('6balls-overlap', 6, 6)]
+
+def makeVideo(videoFile, ballNumber, frameCount=150, overlap=0, noise=4.0, seed=0):
+    """ a function to generate a synthetic 1280x720 video of bouncing balls
+
+    The balls have a radius inside the minBallRadius and maxBallRadius window
+    of main.py, bounce on the border and on each other, and the frame gets
+    gaussian noise. If overlap is positive, the balls only bounce when they
+    are overlap pixels inside each other, so the touching balls become one
+    blob and main.py has to use the hough transform.
+
+    :param videoFile: file name of the generated video
+    :type videoFile: str
+    :param ballNumber: number of ball
+    :type ballNumber: int
+    :param frameCount: number of frame. Default is 150.
+    :type frameCount: int
+    :param overlap: overlap of touching balls in pixel. Default is 0.
+    :type overlap: int
+    :param noise: standard deviation of the gaussian noise. Default is 4.0.
+    :type noise: float
+    :param seed: seed of the random generator. Default is 0.
+    :type seed: int
+    :return: ground truth position with shape (frameCount, ballNumber, 2)
+    :rtype: numpy.ndarray
+    """
+
+    rng = np.random.default_rng(seed)
+    width, height = main.frameWidth, main.frameHeigth
+
+    # radius inside the detection window, one pixel margin for the
+    # anti-aliased border
+    radius = rng.integers(main.minBallRadius + 1, main.maxBallRadius - 1, ballNumber)
+
+    # place the balls on a grid so they do not start inside each other
+    columns = int(np.ceil(np.sqrt(ballNumber * width / height)))
+    rows = int(np.ceil(ballNumber / columns))
+    cells = rng.permutation(columns * rows)[:ballNumber]
+    pos = np.stack([(cells % columns + 0.5) * width / columns,
+                    (cells // columns + 0.5) * height / rows], axis=1)
+    velocity = rng.uniform(-6, 6, (ballNumber, 2))
+
+    # put the first two balls on a collision course so they touch
+    if overlap > 0 and ballNumber >= 2:
+        pos[1] = [min(pos[0, 0] + 4 * radius[0], width - radius[1]), pos[0, 1]]
+        velocity[0] = (3, 0)
+        velocity[1] = (-3, 0)
+
+    # a different bright color for every ball
+    hue = np.linspace(0, 179, ballNumber, endpoint=False).astype(np.uint8)
+    colors = cv2.cvtColor(np.stack([hue, np.full(ballNumber, 220, np.uint8),
+                                    np.full(ballNumber, 230, np.uint8)], axis=1)[np.newaxis],
+                          cv2.COLOR_HSV2BGR)[0]
+
+    writer = cv2.VideoWriter(videoFile, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'),
+                             main.fps, (width, height))
+    truth = np.zeros((frameCount, ballNumber, 2))
+
+    for f in range(frameCount):
+
+        # move the balls and bounce on the border
+        pos += velocity
+        for axis, size in ((0, width), (1, height)):
+            low = pos[:, axis] < radius
+            high = pos[:, axis] > size - radius
+            velocity[low | high, axis] *= -1
+            pos[:, axis] = np.clip(pos[:, axis], radius, size - radius)
+
+        # bounce between balls that are too close
+        for a in range(ballNumber):
+            for b in range(a + 1, ballNumber):
+                diff = pos[b] - pos[a]
+                distance = np.hypot(*diff)
+                approaching = np.dot(velocity[b] - velocity[a], diff) < 0
+                if distance < radius[a] + radius[b] - overlap and approaching:
+                    velocity[[a, b]] = velocity[[b, a]]
+
+        truth[f] = pos
+
+        # draw the frame
+        frame = np.zeros((height, width, 3), np.uint8)
+        for k in range(ballNumber):
+            cv2.circle(frame, (int(round(pos[k, 0])), int(round(pos[k, 1]))), int(radius[k]),
+                       tuple(int(c) for c in colors[k]), -1, cv2.LINE_AA)
+        frame = cv2.add(frame, rng.normal(0, noise, frame.shape).clip(0, 255).astype(np.uint8))
+        writer.write(frame)
+
+    writer.release()
+    return truth
+
+def scoreTracking(csvPosFile, truth):
+    """ a function to compare the position CSV file with the ground truth
+
+    The identity of main.py is mapped to the ground truth identity at the
+    first written frame. An identity swap is counted every time the nearest
+    ground truth ball of an identity changes between two written frames.
+
+    :param csvPosFile: position CSV file written by main.py
+    :type csvPosFile: str
+    :param truth: ground truth position with shape (frames, balls, 2)
+    :type truth: numpy.ndarray
+    :return: detection rate, identity accuracy, identity swap and mean
+        position error in pixel
+    :rtype: dict
+    """
+
+    ballNumber = truth.shape[1]
+    rows = []
+    with open(csvPosFile) as readFile:
+        next(readFile)
+        for row in csv.reader(readFile):
+            if row:
+                rows.append([float(value) for value in row[:1 + 2 * ballNumber]])
+
+    if not rows:
+        return {'detectionRate': 0.0, 'idAccuracy': 0.0, 'idSwaps': 0, 'meanErrorPx': None}
+
+    data = np.array(rows)
+    frames = data[:, 0].astype(int) - 1
+    detected = data[:, 1:].reshape(len(data), ballNumber, 2)
+
+    mapping = None
+    previous = None
+    correct = 0
+    swaps = 0
+    errors = []
+
+    for f, pos in zip(frames, detected):
+
+        # nearest ground truth ball of every identity
+        rowInd, colInd = main.linearSumAssignment(main.calcCostMatrix(pos, truth[f]))
+        if mapping is None:
+            mapping = colInd
+
+        correct += int(np.sum(colInd == mapping))
+        if previous is not None:
+            swaps += int(np.sum(colInd != previous))
+        previous = colInd
+        errors.append(np.hypot(*(pos - truth[f][colInd]).T).mean())
+
+    return {'detectionRate': round(len(data) / len(truth), 4),
+            'idAccuracy': round(correct / (len(data) * ballNumber), 4),
+            'idSwaps': swaps,
+            'meanErrorPx': round(float(np.mean(errors)), 3)}
+
+def runScenario(name, ballNumber, overlap, frameCount, noise, workFolder, settings=None):
+    """ a function to generate one video, run the detection loop and score it
+
+    This function runs in its own process so the peak RSS belongs to one
+    scenario only.
+
+    :param name: name of the scenario
+    :type name: str
+    :param ballNumber: number of ball
+    :type ballNumber: int
+    :param overlap: overlap of touching balls in pixel
+    :type overlap: int
+    :param frameCount: number of frame
+    :type frameCount: int
+    :param noise: standard deviation of the gaussian noise
+    :type noise: float
+    :param workFolder: folder for the video and the output
+    :type workFolder: str
+    :param settings: main.py settings changed for this run. Default is None.
+    :type settings: dict
+    :return: result of the scenario
+    :rtype: dict
+    """
+
+    videoFile = os.path.join(workFolder, name + '.avi')
+    truth = makeVideo(videoFile, ballNumber, frameCount, overlap, noise)
+
+    # run main.py on the video with its output in the work folder
+    main.openFile = videoFile
+    main.ballNumber = ballNumber
+    main.setOutputFolder(os.path.join(workFolder, name))
+    main.profileRun = True
+    main.profileReportFile = os.path.join(workFolder, name, 'profile')
+    for key, value in (settings or {}).items():
+        setattr(main, key, value)
+
+    start = time.perf_counter()
+    frames, detectedFrame = main.runDetection(showFrame=False)
+    wallTime = time.perf_counter() - start
+
+    with open(main.profileReportFile + '.json') as readFile:
+        profile = json.load(readFile)
+
+    # peak RSS in MB, ru_maxrss is in KB on Linux
+    peakRss = None
+    if resource is not None:
+        peakRss = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    result = {'frames': frames,
+              'fps': round(frames / wallTime, 2),
+              'peakRssMb': peakRss,
+              'hough': profile['counters'].get('hough', 0),
+              'stagesMs': {stage: value['meanMs'] for stage, value in profile['stages'].items()}}
+    result.update(scoreTracking(main.csvPosFile, truth))
+
+    return result
+
+def runSuite(scenarios, frameCount=150, noise=4.0, settings=None):
+    """ a function to run every scenario in a fresh process
+
+    :param scenarios: list of (name, number of ball, overlap)
+    :type scenarios: list
+    :param frameCount: number of frame of every video. Default is 150.
+    :type frameCount: int
+    :param noise: standard deviation of the gaussian noise. Default is 4.0.
+    :type noise: float
+    :param settings: main.py settings changed for this run. Default is None.
+    :type settings: dict
+    :return: dictionary of scenario name and result
+    :rtype: dict
+    """
+
+    results = {}
+    context = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as workFolder:
+        for name, ballNumber, overlap in scenarios:
+            with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as pool:
+                results[name] = pool.submit(runScenario, name, ballNumber, overlap,
+                                            frameCount, noise, workFolder, settings).result()
+
+    return results
+
+def printResults(results, baseline=None):
+    """ a function to print the results and the change against the baseline
+
+    :param results: dictionary of scenario name and result
+    :type results: dict
+    :param baseline: results of the baseline run. Default is None.
+    :type baseline: dict
+    :return: None
+    """
+
+    def change(name, key, value):
+        if not baseline or name not in baseline or not baseline[name].get(key):
+            return ''
+        return ' (%+.1f%%)' % ((value - baseline[name][key]) * 100 / baseline[name][key])
+
+    for name, result in results.items():
+        print("%s: %.1f fps%s, detection %.2f, id accuracy %.3f, id swaps %d, error %s px, "
+              "hough %d, peak RSS %s MB%s" % (
+                  name, result['fps'], change(name, 'fps', result['fps']),
+                  result['detectionRate'], result['idAccuracy'], result['idSwaps'],
+                  result['meanErrorPx'], result['hough'], result['peakRssMb'],
+                  change(name, 'peakRssMb', result['peakRssMb'] or 0)))
+        for stage, meanMs in result['stagesMs'].items():
+            previous = ''
+            if baseline and name in baseline:
+                previous = baseline[name]['stagesMs'].get(stage, '')
+            print("    %-14s %8.3f ms   %s" % (stage, meanMs, previous and 'baseline %.3f ms' % previous))
+
+def printComparison(setting, offResults, onResults):
+    """ a function to print the speedup of a main.py flag on every scenario
+
+    :param setting: name of the main.py flag
+    :type setting: str
+    :param offResults: results with the flag False
+    :type offResults: dict
+    :param onResults: results with the flag True
+    :type onResults: dict
+    :return: None
+    """
+
+    for name in offResults:
+        off, on = offResults[name], onResults[name]
+        print("%s: %s speedup x%.2f (%.1f -> %.1f fps), detection %.2f -> %.2f, "
+              "id accuracy %.3f -> %.3f, error %s -> %s px" % (
+                  name, setting, on['fps'] / off['fps'], off['fps'], on['fps'],
+                  off['detectionRate'], on['detectionRate'], off['idAccuracy'], on['idAccuracy'],
+                  off['meanErrorPx'], on['meanErrorPx']))
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark main.py on synthetic multi-ball videos.')
+    parser.add_argument('--balls', type=int, nargs='*',
+                        help='number of ball of custom scenarios (default: built-in suite)')
+    parser.add_argument('--overlap', type=int, default=6,
+                        help='overlap in pixel of the custom scenarios')
+    parser.add_argument('--frames', type=int, default=150, help='number of frame per video')
+    parser.add_argument('--noise', type=float, default=4.0, help='standard deviation of the noise')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='save the results as the baseline of later runs, the fps and stage times '
+                             'of the committed baseline.json are from a 1-core machine')
+    parser.add_argument('--baseline', default=baselineFile, help='baseline file')
+    parser.add_argument('--compare', metavar='FLAG[=VALUE]',
+                        help='run the suite with a main.py flag (e.g. roiTracking) False and True, '
+                             'or with its default and VALUE (e.g. coarseScale=4), and print the speedup')
+    arguments = parser.parse_args()
+
+    if arguments.balls:
+        scenarios = [('%dballs' % n, n, arguments.overlap) for n in arguments.balls]
+    else:
+        scenarios = defaultScenarios
+
+    # only the detection is measured, the image output is turned off
+    settings = {'printRaw': False, 'printHSV': False, 'printFiltered': False,
+                'printResult': False, 'renderVideoResult': False}
+
+    # compare a flag instead of the baseline
+    if arguments.compare:
+        flag, equal, value = arguments.compare.partition('=')
+        if equal:
+            offSettings = dict(settings)
+            onSettings = dict(settings, **{flag: ast.literal_eval(value)})
+        else:
+            offSettings = dict(settings, **{flag: False})
+            onSettings = dict(settings, **{flag: True})
+
+        offResults = runSuite(scenarios, arguments.frames, arguments.noise, offSettings)
+        onResults = runSuite(scenarios, arguments.frames, arguments.noise, onSettings)
+        printComparison(arguments.compare, offResults, onResults)
+        sys.exit(0)
+
+    results = runSuite(scenarios, arguments.frames, arguments.noise, settings)
+
+    baseline = None
+    if os.path.exists(arguments.baseline):
+        with open(arguments.baseline) as readFile:
+            baseline = json.load(readFile)
+
+    printResults(results, baseline)
+
+    if arguments.save_baseline:
+        with open(arguments.baseline, 'w') as writeFile:
+            json.dump(results, writeFile, indent=2)
+        print("baseline saved: " + arguments.baseline)
@@ -0,0 +1,114 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+# main.py is in the parent folder of this benchmark
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+class SyntheticCamera:
+    """ a class to make frames of moving balls at a frame rate like a camera
+
+    It has the read, isOpened, get and release functions of
+    cv2.VideoCapture, so it can be the source of main.runLive.
+    """
+
+    def __init__(self, ballNumber=2, frameCount=300, frameRate=30, seed=0):
+        """
+        :param ballNumber: number of ball. Default is 2.
+        :type ballNumber: int
+        :param frameCount: number of frame before the camera ends. Default is 300.
+        :type frameCount: int
+        :param frameRate: frame per second. Default is 30.
+        :type frameRate: float
+        :param seed: seed of the random generator. Default is 0.
+        :type seed: int
+        """
+
+        rng = np.random.default_rng(seed)
+        self.size = (main.frameWidth, main.frameHeigth)
+        self.radius = rng.integers(main.minBallRadius + 1, main.maxBallRadius - 1, ballNumber)
+        self.pos = rng.uniform(self.radius[:, None], np.array(self.size) - self.radius[:, None], (ballNumber, 2))
+        self.velocity = rng.uniform(-6, 6, (ballNumber, 2))
+        self.frameCount = frameCount
+        self.interval = 1.0 / frameRate
+        self.frameNumber = 0
+        self.nextTime = None
+
+    def read(self):
+        """ a function to wait for the time of the next frame and draw it
+
+        :return: ret and frame like cv2.VideoCapture.read()
+        :rtype: tuple
+        """
+
+        if self.frameNumber >= self.frameCount:
+            return False, None
+
+        # wait like a camera
+        now = time.perf_counter()
+        if self.nextTime is None:
+            self.nextTime = now
+        time.sleep(max(0.0, self.nextTime - now))
+        self.nextTime += self.interval
+
+        # move the balls and bounce on the border
+        self.pos += self.velocity
+        for axis in (0, 1):
+            outside = (self.pos[:, axis] < self.radius) | (self.pos[:, axis] > self.size[axis] - self.radius)
+            self.velocity[outside, axis] *= -1
+
+        frame = np.zeros((self.size[1], self.size[0], 3), np.uint8)
+        for (x, y), radius in zip(self.pos, self.radius):
+            cv2.circle(frame, (int(x), int(y)), int(radius), (0, 200, 255), -1)
+
+        self.frameNumber += 1
+        return True, frame
+
+    def isOpened(self):
+        return self.frameNumber < self.frameCount
+
+    def get(self, propertyId):
+        return 0
+
+    def release(self):
+        return
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark the latency of main.py live mode.')
+    parser.add_argument('--balls', type=int, default=2, help='number of ball')
+    parser.add_argument('--frames', type=int, default=150, help='number of frame per run')
+    parser.add_argument('--fps', type=float, nargs='*', default=[30, 60, 120],
+                        help='frame rate of the synthetic camera')
+    arguments = parser.parse_args()
+
+    print("fps  snapshots  processed  dropped  p50 (ms)  p95 (ms)  p99 (ms)")
+
+    with tempfile.TemporaryDirectory() as folder:
+        main.setOutputFolder(folder)
+        main.latencyReportFile = os.path.join(folder, 'latency')
+        main.renderVideoResult = False
+
+        # without and with the JPEG images of every interval
+        for snapshots in (False, True):
+            main.printRaw = main.printHSV = main.printFiltered = main.printResult = snapshots
+            main.Interval = 5
+
+            for frameRate in arguments.fps:
+                camera = SyntheticCamera(arguments.balls, arguments.frames, frameRate)
+                main.runLive(False, camera)
+                with open(main.latencyReportFile + '.json') as readFile:
+                    report = json.load(readFile)
+                stage = report['stages']['endToEnd']
+                print("%3d  %-9s  %9d  %7d  %8.1f  %8.1f  %8.1f" % (
+                    frameRate, snapshots, report['counters']['processed'], report['counters']['dropped'],
+                    stage['p50Ms'], stage['p95Ms'], stage['p99Ms']))
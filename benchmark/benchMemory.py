@@ -0,0 +1,105 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+
+# main.py is in the parent folder of this benchmark
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from benchDetection import makeVideo
+
+def runLoop(videoFile, frameCount, trace=False):
+    """ a function to run the read, resize and detect part of the serial loop
+
+    :param videoFile: file name of the video
+    :type videoFile: str
+    :param frameCount: maximum number of frame
+    :type frameCount: int
+    :param trace: if True then the memory allocated in every frame is
+        measured with tracemalloc. Default is False.
+    :type trace: bool
+    :return: time per frame in milliseconds and mean of the largest memory
+        allocated inside one frame in bytes (0 if trace is False)
+    :rtype: tuple
+    """
+
+    capture = cv2.VideoCapture(videoFile)
+
+    frameNumber = 0
+    framePeak = 0
+    start = time.perf_counter()
+
+    while frameNumber < frameCount:
+
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+
+        ret, frame = main.readFrame(capture)
+        if ret == False:
+            break
+        frame = main.resizeFrame(frame)
+        frameNumber += 1
+        main.detectBall(frame, frameNumber, False)
+
+        if trace:
+            framePeak += tracemalloc.get_traced_memory()[1] - before
+
+    elapsed = time.perf_counter() - start
+    capture.release()
+
+    return elapsed * 1000 / max(1, frameNumber), framePeak / max(1, frameNumber)
+
+def benchSize(videoFile, frameCount, width, height):
+    """ a function to compare the loop without and with reuseBuffers at one frame size
+
+    :param videoFile: file name of the video
+    :type videoFile: str
+    :param frameCount: number of frame
+    :type frameCount: int
+    :param width: frameWidth of main.py
+    :type width: int
+    :param height: frameHeigth of main.py
+    :type height: int
+    :return: None
+    """
+
+    main.frameWidth, main.frameHeigth = width, height
+
+    for reuse in (False, True):
+        main.reuseBuffers = reuse
+
+        # the time is measured without tracemalloc because it slows the loop
+        msPerFrame, _ = runLoop(videoFile, frameCount)
+        tracemalloc.start()
+        _, framePeak = runLoop(videoFile, frameCount, trace=True)
+        tracemalloc.stop()
+
+        print("%4dx%-4d  %-12s  %8.2f ms/frame  %8.2f MB allocated per frame" % (
+            width, height, 'reuseBuffers' if reuse else 'allocate', msPerFrame, framePeak / 2 ** 20))
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark the memory allocated by the main.py frame loop.')
+    parser.add_argument('--balls', type=int, default=2, help='number of ball')
+    parser.add_argument('--frames', type=int, default=100, help='number of frame')
+    arguments = parser.parse_args()
+
+    # only the detection is measured, the image output is turned off
+    main.printRaw = main.printHSV = main.printFiltered = main.printResult = False
+    main.renderVideoResult = False
+
+    with tempfile.TemporaryDirectory() as folder:
+        videoFile = os.path.join(folder, 'bench.avi')
+        makeVideo(videoFile, arguments.balls, arguments.frames)
+
+        # the video has the frame size (no resize) and a smaller frame size (resize)
+        benchSize(videoFile, arguments.frames, main.frameWidth, main.frameHeigth)
+        main.minBallRadius, main.maxBallRadius = main.minBallRadius * 3 // 4, main.maxBallRadius * 3 // 4
+        benchSize(videoFile, arguments.frames, main.frameWidth * 3 // 4, main.frameHeigth * 3 // 4)
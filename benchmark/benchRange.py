@@ -0,0 +1,82 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# main.py is in the parent folder of this benchmark
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+def makePositions(ballNumber, spacing=250, seed=0):
+    """ a function to generate random object position with a constant density
+
+    The objects are spread over a square with side sqrt(ballNumber) times
+    spacing, so the number of near objects does not grow with ballNumber.
+
+    :param ballNumber: number of the object
+    :type ballNumber: int
+    :param spacing: mean distance between objects in pixel. Default is 250.
+    :type spacing: float
+    :param seed: seed of the random generator. Default is 0.
+    :type seed: int
+    :return: list of object position
+    :rtype: list
+    """
+
+    rng = np.random.default_rng(seed)
+    side = np.sqrt(ballNumber) * spacing
+
+    return rng.uniform(0, side, (ballNumber, 2)).astype(int).tolist()
+
+def benchRange(function, repeat):
+    """ a function to measure the average time of a range function
+
+    :param function: function without argument
+    :type function: function
+    :param repeat: number of call
+    :type repeat: int
+    :return: average time per call in milliseconds and the last result
+    :rtype: tuple
+    """
+
+    result = function()
+    start = time.perf_counter()
+    for i in range(repeat):
+        function()
+
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark the dense and the neighbor range of main.py.')
+    parser.add_argument('--balls', type=int, nargs='*', default=[10, 50, 200, 500, 2000],
+                        help='number of object')
+    parser.add_argument('--cutoff', type=float, default=main.rangeCutoff, help='neighbor cutoff in pixel')
+    parser.add_argument('--loop-limit', type=int, default=500,
+                        help='largest number of object measured with the calcRangeBall loop')
+    arguments = parser.parse_args()
+
+    print("objects  loop (ms/frame)  numpy dense (ms/frame)  neighbor (ms/frame)  dense values  neighbor pairs")
+
+    for ballNumber in arguments.balls:
+        pos = makePositions(ballNumber)
+        repeat = max(3, 2000 // ballNumber)
+
+        # the loop is too slow for many objects
+        loop = '-'
+        if ballNumber <= arguments.loop_limit:
+            loopMs, result = benchRange(lambda: main.calcRangeBall(pos, ballNumber), max(1, repeat // 10))
+            loop = '%.3f' % loopMs
+
+        denseMs, dense = benchRange(lambda: main.pairwiseRange(pos, ballNumber), repeat)
+        neighborMs, pairs = benchRange(lambda: main.neighborRange(pos, arguments.cutoff), repeat)
+
+        # the neighbor pairs must be the dense pairs within the cutoff
+        assert len(pairs[2]) == int(np.sum(dense <= arguments.cutoff))
+
+        print("%7d  %15s  %22.3f  %19.3f  %12d  %14d" % (
+            ballNumber, loop, denseMs, neighborMs, len(dense), len(pairs[2])))
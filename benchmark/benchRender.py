@@ -0,0 +1,84 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# main.py is in the parent folder of this benchmark
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from benchDetection import makeVideo
+
+def runRender(videoFile, outputFolder, render, asyncRender, codec):
+    """ a function to measure the serial loop with one result video setting
+
+    :param videoFile: file name of the video
+    :type videoFile: str
+    :param outputFolder: directory of the output
+    :type outputFolder: str
+    :param render: renderVideoResult flag of main.py
+    :type render: bool
+    :param asyncRender: asyncRender flag of main.py
+    :type asyncRender: bool
+    :param codec: videoCodec of main.py
+    :type codec: str
+    :return: processed frame per second, mean time of render.write in
+        milliseconds and size of the result video in bytes
+    :rtype: tuple
+    """
+
+    main.setOutputFolder(outputFolder)
+    main.openFile = videoFile
+    main.renderVideoResult = render
+    main.asyncRender = asyncRender
+    main.videoCodec = codec
+    main.profileRun = True
+    main.profileReportFile = os.path.join(outputFolder, 'profile')
+
+    start = time.perf_counter()
+    frameNumber, detectedFrame = main.runDetection(False)
+    elapsed = time.perf_counter() - start
+
+    # the time of render.write in the frame loop
+    writeMs = 0.0
+    if render:
+        with open(main.profileReportFile + '.csv') as readFile:
+            for row in readFile:
+                if row.startswith('avi,'):
+                    writeMs = float(row.split(',')[3])
+
+    size = os.path.getsize(main.videoResultFile) if render else 0
+
+    return frameNumber / elapsed, writeMs, size
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark the result video encoder of main.py.')
+    parser.add_argument('--balls', type=int, default=2, help='number of ball')
+    parser.add_argument('--frames', type=int, default=150, help='number of frame')
+    parser.add_argument('--codecs', nargs='*', default=['MJPG', 'XVID'], help='codec of the result video')
+    arguments = parser.parse_args()
+
+    # only the detection and the result video are measured
+    main.printRaw = main.printHSV = main.printFiltered = main.printResult = False
+
+    # the encoder process needs a free CPU core to make the loop faster
+    print("CPU cores: %d" % os.cpu_count())
+    print("render            codec  fps    write (ms/frame)  video (MB)")
+
+    with tempfile.TemporaryDirectory() as folder:
+        videoFile = os.path.join(folder, 'bench.avi')
+        makeVideo(videoFile, arguments.balls, arguments.frames)
+
+        framesPerSecond, writeMs, size = runRender(videoFile, os.path.join(folder, 'off'), False, False, 'MJPG')
+        print("%-16s  %-5s  %5.1f  %16.2f  %10.2f" % ('off', '-', framesPerSecond, writeMs, size / 2 ** 20))
+
+        for codec in arguments.codecs:
+            for asyncRender in (False, True):
+                name = 'encoder process' if asyncRender else 'frame loop'
+                framesPerSecond, writeMs, size = runRender(videoFile, os.path.join(folder, name + codec),
+                                                           True, asyncRender, codec)
+                print("%-16s  %-5s  %5.1f  %16.2f  %10.2f" % (name, codec, framesPerSecond, writeMs,
+                                                             size / 2 ** 20))
@@ -0,0 +1,169 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# main.py is in the parent folder of this benchmark
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from benchDetection import makeVideo, scoreTracking
+
+def runStride(videoFile, outputFolder, stride, maxMotion):
+    """ a function to run the serial loop with one frameStride setting
+
+    :param videoFile: file name of the video
+    :type videoFile: str
+    :param outputFolder: directory of the output
+    :type outputFolder: str
+    :param stride: frameStride of main.py
+    :type stride: int
+    :param maxMotion: strideMaxMotion of main.py
+    :type maxMotion: float
+    :return: processed frame per second, number of detected frame and
+        number of processed frame
+    :rtype: tuple
+    """
+
+    main.setOutputFolder(outputFolder)
+    main.openFile = videoFile
+    main.frameStride = stride
+    main.strideMaxMotion = maxMotion
+
+    start = time.perf_counter()
+    frameNumber, detectedFrame = main.runDetection(False)
+    elapsed = time.perf_counter() - start
+
+    return frameNumber / elapsed, detectedFrame, frameNumber
+
+def runResume(videoFile, outputFolder, stride, maxMotion, stopFrame, interval, crash):
+    """ a function to stop a checkpointed frameStride run and resume it
+
+    The run is stopped at the first skipped frame from stopFrame, like a
+    SIGINT, or crashes in detectBall at stopFrame, so it is resumed from
+    the last periodic checkpoint.
+
+    :param videoFile: file name of the video
+    :type videoFile: str
+    :param outputFolder: directory of the output
+    :type outputFolder: str
+    :param stride: frameStride of main.py
+    :type stride: int
+    :param maxMotion: strideMaxMotion of main.py
+    :type maxMotion: float
+    :param stopFrame: frame number where the run is stopped
+    :type stopFrame: int
+    :param interval: checkpointInterval of main.py
+    :type interval: int
+    :param crash: if True then the run crashes instead of stopping
+    :type crash: bool
+    :return: None
+    """
+
+    main.setOutputFolder(outputFolder)
+    main.openFile = videoFile
+    main.frameStride = stride
+    main.strideMaxMotion = maxMotion
+    main.checkpointInterval = interval
+    needFrame = main.needFrame
+    detectBall = main.detectBall
+
+    # the skipped frame asks needFrame if its image is used
+    def stopAtSkippedFrame(frameNumber, *arguments):
+        if frameNumber >= stopFrame:
+            main.stopRequested.set()
+        return needFrame(frameNumber, *arguments)
+
+    def crashAtFrame(frame, frameNumber, *arguments):
+        if frameNumber >= stopFrame:
+            raise RuntimeError('crash at frame %d' % frameNumber)
+        return detectBall(frame, frameNumber, *arguments)
+
+    try:
+        if crash:
+            main.detectBall = crashAtFrame
+        else:
+            main.needFrame = stopAtSkippedFrame
+        main.runDetection(False)
+    except RuntimeError:
+        pass
+    finally:
+        main.needFrame = needFrame
+        main.detectBall = detectBall
+        main.stopRequested.clear()
+
+    # continue from the checkpoint
+    main.resumeRun = True
+    try:
+        main.runDetection(False)
+    finally:
+        main.resumeRun = False
+        main.checkpointInterval = 0
+
+def sameResult(folderA, folderB):
+    """ a function to compare the CSV files of two runs
+
+    :param folderA: directory of the first run
+    :type folderA: str
+    :param folderB: directory of the second run
+    :type folderB: str
+    :return: True if the position, radius and range CSV files are equal
+    :rtype: bool
+    """
+
+    for name in ('dataPosBola.csv', 'dataRadBola.csv', 'dataRangeBola.csv'):
+        with open(os.path.join(folderA, name), 'rb') as fileA, open(os.path.join(folderB, name), 'rb') as fileB:
+            if fileA.read() != fileB.read():
+                return False
+
+    return True
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark the frameStride mode of main.py.')
+    parser.add_argument('--balls', type=int, default=2, help='number of ball')
+    parser.add_argument('--frames', type=int, default=150, help='number of frame')
+    parser.add_argument('--strides', type=int, nargs='*', default=[1, 2, 3, 5], help='frameStride')
+    parser.add_argument('--motion', type=float, nargs='*', default=[main.strideMaxMotion, 1000],
+                        help='strideMaxMotion, a large value never detects every frame')
+    parser.add_argument('--resume', type=int, default=25, metavar='FRAMES',
+                        help='checkpointInterval of the resume check, 0 skips the check')
+    arguments = parser.parse_args()
+
+    # only the detection and the CSV files are measured
+    main.printRaw = main.printHSV = main.printFiltered = main.printResult = False
+    main.renderVideoResult = False
+
+    print("stride  maxMotion  fps     detected  written  idAccuracy  swaps  error (px)")
+
+    with tempfile.TemporaryDirectory() as folder:
+        videoFile = os.path.join(folder, 'bench.avi')
+        truth = makeVideo(videoFile, arguments.balls, arguments.frames)
+
+        for maxMotion in arguments.motion:
+            for stride in arguments.strides:
+                outputFolder = os.path.join(folder, '%d-%g' % (stride, maxMotion))
+                framesPerSecond, detectedFrame, frameNumber = runStride(videoFile, outputFolder, stride, maxMotion)
+                score = scoreTracking(main.csvPosFile, truth)
+                print("%6d  %9g  %6.1f  %8d  %7.0f  %10.4f  %5d  %10s" % (
+                    stride, maxMotion, framesPerSecond, detectedFrame, score['detectionRate'] * frameNumber,
+                    score['idAccuracy'], score['idSwaps'], score['meanErrorPx']))
+
+        # a stopped or crashed run resumed from the checkpoint gives the rows of an uninterrupted run
+        if arguments.resume > 0:
+            print("")
+            print("resume  stride  maxMotion  stop  same rows")
+            stopFrame = arguments.frames // 2 + 1
+            for maxMotion in arguments.motion:
+                for stride in arguments.strides:
+                    wholeFolder = os.path.join(folder, 'whole-%d-%g' % (stride, maxMotion))
+                    main.checkpointInterval = arguments.resume
+                    runStride(videoFile, wholeFolder, stride, maxMotion)
+                    main.checkpointInterval = 0
+                    for crash in (False, True):
+                        resumeFolder = os.path.join(folder, 'resume-%d-%g-%s' % (stride, maxMotion, crash))
+                        runResume(videoFile, resumeFolder, stride, maxMotion, stopFrame, arguments.resume, crash)
+                        print("%-6s  %6d  %9g  %4d  %9s" % ('crash' if crash else 'stop', stride, maxMotion,
+                                                           stopFrame, sameResult(wholeFolder, resumeFolder)))
@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+# main.py is in the parent folder of this benchmark
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+def makeFrames(ballNumber, frameCount, seed=0):
+    """ a function to generate random object position over some frames
+
+    Every object moves a few pixels per frame and the detection order of the
+    objects is shuffled in every frame, like the order of findContours.
+
+    :param ballNumber: number of the object
+    :type ballNumber: int
+    :param frameCount: number of the generated frame
+    :type frameCount: int
+    :param seed: seed of the random generator
+    :type seed: int
+    :return: list of object position list for every frame
+    :rtype: list
+    """
+
+    rng = np.random.default_rng(seed)
+
+    # initial position inside 1280x720 frame
+    pos = rng.uniform((0, 0), (main.frameWidth, main.frameHeigth), (ballNumber, 2))
+
+    frames = []
+    for i in range(frameCount):
+
+        # move every object a little
+        pos = pos + rng.normal(0, 2, pos.shape)
+
+        # shuffle the detection order
+        order = rng.permutation(ballNumber)
+        frames.append([[int(x), int(y)] for x, y in pos[order]])
+
+    return frames
+
+def benchTracker(tracker, frames):
+    """ a function to measure the average time per frame of a tracker
+
+    :param tracker: tracking function with TrackingObject signature
+    :type tracker: function
+    :param frames: list of object position list for every frame
+    :type frames: list
+    :return: average time per frame in milliseconds
+    :rtype: float
+    """
+
+    # warm up the tracker before measuring
+    tracker(frames[0], list(frames[1]), list(range(len(frames[1]))))
+
+    oldPos = frames[0]
+    start = time.perf_counter()
+
+    for newPos in frames[1:]:
+        radList = list(range(len(newPos)))
+        oldPos, radList = tracker(oldPos, list(newPos), radList)
+
+    return (time.perf_counter() - start) * 1000 / (len(frames) - 1)
+
+def makeDetections(ballNumber, frameCount, missRate=0.05, seed=0):
+    """ a function to generate detections with missed objects over some frames
+
+    Every object moves with a constant velocity and a little noise, every
+    detection is missed with the probability missRate and the detection
+    order is shuffled in every frame.
+
+    :param ballNumber: number of the object
+    :type ballNumber: int
+    :param frameCount: number of the generated frame
+    :type frameCount: int
+    :param missRate: probability of a missed detection. Default is 0.05.
+    :type missRate: float
+    :param seed: seed of the random generator. Default is 0.
+    :type seed: int
+    :return: list of (position list, true identity array) for every frame
+    :rtype: list
+    """
+
+    rng = np.random.default_rng(seed)
+
+    # the objects are spread so the mean distance is about 100 pixel
+    side = np.sqrt(ballNumber) * 100
+    pos = rng.uniform(0, side, (ballNumber, 2))
+    velocity = rng.uniform(-5, 5, (ballNumber, 2))
+
+    frames = []
+    for i in range(frameCount):
+        pos = pos + velocity + rng.normal(0, 1, pos.shape)
+
+        # drop some detections and shuffle the order
+        detected = rng.permutation(np.flatnonzero(rng.random(ballNumber) >= missRate))
+        frames.append(([[int(x), int(y)] for x, y in pos[detected]], detected))
+
+    return frames
+
+def benchManager(frames, gate, maxCoast):
+    """ a function to measure the time per frame and the identity switches of TrackManager
+
+    :param frames: list of (position list, true identity array) for every frame
+    :type frames: list
+    :param gate: trackGate of the track manager
+    :type gate: float
+    :param maxCoast: trackCoast of the track manager
+    :type maxCoast: int
+    :return: average time per frame in milliseconds, number of identity
+        switches and number of track
+    :rtype: tuple
+    """
+
+    tracks = main.TrackManager(gate, maxCoast)
+    truthOfTrack = {}
+    switches = 0
+    elapsed = 0.0
+
+    for newPos, truth in frames:
+        radList = [20] * len(newPos)
+        start = time.perf_counter()
+        ids, positions, radii, coasting = tracks.update(newPos, radList)
+        elapsed += time.perf_counter() - start
+
+        # the detected tracks are in the order of their identity, find their detection
+        detectedIds = ids[~coasting]
+        detectedPos = positions[~coasting]
+        lookup = {tuple(p): k for k, p in enumerate(newPos)}
+        for trackId, p in zip(detectedIds.tolist(), detectedPos.astype(int).tolist()):
+            trueId = truth[lookup[tuple(p)]]
+            if truthOfTrack.setdefault(trackId, trueId) != trueId:
+                switches += 1
+                truthOfTrack[trackId] = trueId
+
+    return elapsed * 1000 / len(frames), switches, tracks.nextId - 1
+
+
+if __name__ == '__main__':
+
+    print("objects  greedy (ms/frame)  optimal (ms/frame)")
+
+    # measure the tracker at 2, 50 and 500 objects
+    for ballNumber in (2, 50, 500):
+        frames = makeFrames(ballNumber, 21)
+        greedy = benchTracker(main.TrackingObject, frames)
+        optimal = benchTracker(main.TrackingObjectOptimal, frames)
+        print("%7d  %17.3f  %18.3f" % (ballNumber, greedy, optimal))
+
+    print("objects  TrackManager (ms/frame)  identity switches  tracks")
+
+    # measure the track manager with 5 percent missed detections
+    for ballNumber in (2, 50, 500):
+        frames = makeDetections(ballNumber, 100)
+        msPerFrame, switches, trackNumber = benchManager(frames, main.trackGate // 2, main.trackCoast)
+        print("%7d  %23.3f  %17d  %6d" % (ballNumber, msPerFrame, switches, trackNumber))
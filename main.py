@@ -1,667 +1,5580 @@
-import cv2
-import numpy as np
-import math
-import csv
-
-def printImage2JPG(image, folderName, frameNumber=1, Interval = 1):
-    """a function to print an OpenCV image into a JPEG file at a directory
-
-    :param image : OpenCV variable that contain image matrix
-    :type image : img
-    :param folderName : Folder directory of the printed image (JPEG image)
-    :type folderName : str
-    :param frameNumber : Current frame if the source is video. Default is 1.
-    :type frameNumber : int
-    :param Interval : Interval of printing image to JPEG if the source is
-        video. Default is 1.
-    :type Interval : int
-    :return : none
-
-    """
-
-
-    # get filename so that it combined with the current frame number
-    # and having jpeg extension
-    filename = folderName +  "image ke-" + str(frameNumber) + '.jpeg'
-
-    # checking if the frame number is at the interval.
-    # If true then print the image
-    if frameNumber % Interval == 0:
-        cv2.imwrite(filename, image)
-    return
-
-def TrackingObject(oldPos, newPos, radList):
-    """a function to track object identity that has been detected
-
-    This function calculate and track the object identity by comparing
-    list of position (x,y) in a previous frame and current frame. An
-    object is said to be same from previous and current frame if it has
-    shortest distance. The Object that has been given identity is excluded
-    from calculation of shortest distance, therefore it will not get
-    multiple identity. This function only works if the number of the objects
-    is conserve. This function also sort the current object position and radius
-    based on the identity
-
-    :param oldPos: List of objects position in the previous frame
-    :type oldPos : list
-    :param newPos: list of objects position in the current frame
-    :type newPos: list
-    :param radList: list of objects radius in the current frame
-    :type : list
-    :return: list of sorted object position based on their identity
-    :rtype: list
-    """
-
-
-    # checking whether oldPos has value or not. if oldPos
-    # hasn't get any value, it must be the first frame.
-    # So, there's no previous position list.
-    if not oldPos :
-
-        # it returns as it be
-        return newPos, radList
-
-    # if there is previous position list
-    else:
-        # a is just iterator variable
-        a = 0
-
-        # get the list size of oldPos
-        sizeOldPos = len(oldPos)
-
-        #for every object position in newPos (list of current position)
-        for i in newPos :
-
-            #for every object in oldPos that has not given identity
-            for j in range(a,sizeOldPos) :
-
-                # Remember that every position consist of (x,y)
-                # So position[0] equal to x and position[1] equal to y
-                xRange = int(i[0] - oldPos[j][0])
-                yRange = int(i[1] - oldPos[j][1])
-
-                # get the range distance by using phytagorean theorem
-                Range = math.sqrt(math.pow(xRange,2) + math.pow(yRange, 2))
-
-                # get the minimum distance of the object between previous
-                # and the current frame
-                if j == a:
-                    minRange = Range
-                    location = j
-                else:
-                    if minRange > Range:
-                        minRange = Range
-                        location = j
-
-            # swap the element of newPos so it has same identity order as oldPos
-            newPos[a], newPos[location] = newPos[location], newPos[a]
-
-            # also for the radius
-            radList[a], radList[location] = radList[location], radList[a]
-
-            #increase the iterator
-            a += 1
-
-    #return sorted newPos and radList
-    return newPos, radList
-
-def clean():
-    """ a function to clean a list
-
-    :return: an empty list
-    :rtype: list
-    """
-
-
-    A = []
-    return A
-
-def writingID(sortedPos, image):
-    """ a function to write object ID at an image
-
-    :param sortedPos: list of sorted object position
-    :type sortedPos: list
-    :param image: Image where to draw or write the ID
-    """
-
-    # Just an iterator variable
-    a = 0;
-
-    #  For every position in sortedPos list
-    for i in sortedPos:
-        # increase the iterator value by 1
-        a += 1
-
-        # draw a black filled circle with radius equal to 20 px
-        cv2.circle(image, (i[0],i[1]), 20, (0, 0, 0), -1)
-
-        # write the ID number at the center of object
-        cv2.putText(image,str(a),(i[0]-10,i[1]+10), cv2.FONT_HERSHEY_SIMPLEX,1,(255,255,255))
-
-def writePosToCSV(csvFile, frameNumber, posList) :
-    """ a function to write every position of object to a CSV file
-
-    :param csvFile: file name and directory of CSV file
-    :type csvFile: str
-    :param frameNumber: current frame number of the position
-    :type frameNumber: int
-    :param posList: list of object position at the current frame number
-    :type posList: list
-    :return: None
-    """
-
-    # initiation for row container list
-    row = []
-
-    # adding frame Number to the first element
-    row.append(frameNumber)
-
-    # for every position in the position list
-    for pos in posList:
-
-        #for every component in the position
-        for component in pos:
-
-            # adding that component in to next element
-            row.append(component)
-
-    # open the csv file with append mode
-    with open(csvFile, 'a') as writeFile:
-        writer = csv.writer(writeFile)
-
-        # insert the row list to next row in csv file
-        writer.writerow(row)
-
-    # close the csv file
-    writeFile.close()
-
-def InitPosToCSV(csvFile, ballNumber):
-    """ a function to initiate writing position object into CSV file
-
-    :param csvFile: file name and directory of CSV file
-    :type csvFile: str
-    :param ballNumber: total number of the object
-    :type ballNumber: int
-    :return: none
-    """
-
-
-    # Open the CSV file with write mode
-    with open(csvFile, 'w') as writeFile:
-
-        # Insert Frame in first column
-        writeFile.write("Frame,")
-
-        # For every object
-        for i in range(ballNumber):
-
-            # Write X + number Object in next column
-            writeFile.write("X" + str(i+1) + ",")
-
-            # Write Y + number Object in next column
-            writeFile.write("Y" + str(i+1) + ",")
-
-        # Change to the next row for further writing
-        writeFile.write("\n")
-
-    # Close the csv File
-    writeFile.close()
-
-def InitRadToCSV(csvFile, ballNumber):
-    """ a function initiate writing radius object into csv file
-
-    :param csvFile: file name and directory of the csv file
-    :type csvFile: str
-    :param ballNumber: total number of the object
-    :type ballNumber: int
-    :return: None
-    """
-
-    # Open the csv file with write mode
-    with open(csvFile, 'w') as writeFile:
-
-        # write Frame in the first column
-        writeFile.write("Frame,")
-
-        # for every object
-        for i in range(ballNumber):
-
-            # write redBall + object number in next column
-            writeFile.write("radBall" + str(i+1) + ",")
-
-        # change line for further writing
-        writeFile.write("\n")
-
-    # close the file
-    writeFile.close()
-
-def InitRangeToCSV(csvFile, ballNumber):
-    """ a function to initiate writing distance between object to CSV file
-
-
-    :param csvFile: file name and directory of csv file
-    :type csvFile: str
-    :param ballNumber: the total number of the object
-    :type ballNumber: int
-    :return: None
-    """
-
-    # initiate iterator variable
-    a = 1
-
-    # open the csv File in write mode
-    with open(csvFile, 'w') as writeFile:
-
-        # write Frame into first column
-        writeFile.write("Frame,")
-
-        # for every object
-        for i in range(ballNumber):
-
-            # also for every object but without itself
-            # and without object that has been counted
-            for j in range(a, ballNumber):
-
-                #write range + combination of two object into next column
-                writeFile.write("Range" + str(i+1) + str(j+1) + ",")
-
-            # adding the iterator
-            a += 1
-
-        # Change line for further writing
-        writeFile.write("\n")
-
-    # Close the csv file
-    writeFile.close()
-
-def writeRadToCSV(csvFile, frameNumber, radList):
-    """ a function to write object radius into csv file
-
-    :param csvFile: file name and directory of the csv file
-    :type csvFile: str
-    :param frameNumber: current frame number of the object
-    :type frameNumber: int
-    :param radList: list of object radius
-    :type: list
-    :return: None
-    """
-
-
-    # Initiate for row container list
-    row = []
-
-    # Adding current frame Number to the row list
-    row.append(frameNumber)
-
-    #for every object radius in radList
-    for rad in radList:
-
-        # add the radius to the row list
-        row.append(rad)
-
-    # open the csv file in append mode
-    with open(csvFile, 'a') as writeFile:
-        writer = csv.writer(writeFile)
-
-        # insert row list into next row on csv file
-        writer.writerow(row)
-
-    # close the csv file
-    writeFile.close()
-
-def writeRangeToCSV(csvFile, frameNumber, rangeBallList):
-    """ a function to write range distance between objects into csv File
-
-    :param csvFile: file name and directory of the csv file
-    :type csvFile: str
-    :param frameNumber: current frame number of the object
-    :type frameNumber: int
-    :param rangeBallList: list of range distance between every objects
-    :type rangeBallList: list
-    :return: None
-    """
-
-
-    # initiate row container list
-    row = []
-
-    # insert the current frame number to row list
-    row.append(frameNumber)
-
-    # for every range distance in rangeBallList
-    for dist in rangeBallList:
-
-        # insert the distance to row list
-        row.append(dist)
-
-    # open the csv file with append mode
-    with open(csvFile, 'a') as writeFile:
-        writer = csv.writer(writeFile)
-
-        # insert row list into the next row of csv file
-        writer.writerow(row)
-
-    # close the file
-    writeFile.close()
-
-def calcRangeBall(sortedPos, ballNumber):
-    """ a function to calculate range distance between objects
-
-    :param sortedPos: list of sorted object position list
-    :type sortedPos: list
-    :param ballNumber: the total number of the object
-    :type ballNumber: int
-    :return: list of range distance between objects
-    :rtype: list
-    """
-
-    # initiate a container list for range distance value
-    rangeBallList = []
-
-    # iterator variable
-    a = 1
-
-    # for every object position in sortedPos list
-    for posA in sortedPos:
-
-        # for every object position in sortedPos list
-        # except itself and others which have been calculated
-        for B in range(a, ballNumber):
-
-            # calculate x distance
-            xRange = int(posA[0] - sortedPos[B][0])
-
-            # calculate y distance
-            yRange = int(posA[1] - sortedPos[B][1])
-
-            # calculate the range distance using phytagorean theorem
-            Range = math.sqrt(math.pow(xRange, 2) + math.pow(yRange, 2))
-
-            # insert the range distance value to rangeBallList
-            rangeBallList.append(Range)
-
-        # increase the iterator value by one
-        a += 1
-
-    # return the rangeBallList which contain calculated range distance
-    return rangeBallList
-
-
-#Settings path file and file name (Change the Green one)
-
-pathFile = 'D:\\Github\\multiballDetc\\'                   # Directory of the program file
-openFile = pathFile +'video1.mp4'                           # Name of the input video, put video next to program file
-csvPosFile = pathFile + 'dataPosBola.csv'                   # name of the csv file that contain object position
-                                                            # over time
-csvRadFile = pathFile + 'dataRadBola.csv'                   # name of the csv file that contain object radius over time
-csvRangeBallFile = pathFile + 'dataRangeBola.csv'           # name of the csv file that contain object range distance
-                                                            # over time
-folderNameRaw = pathFile + 'output\\raw\\'                  # folder directory for saving raw image screenshot
-folderNameHSV = pathFile + 'output\\hsv\\'                  # folder directory for saving HSV image screenshot
-folderNameFiltered = pathFile + 'output\\filtered\\'        # folder directory for saving filtered image screenshot
-folderNameResult = pathFile + 'output\\result\\'            # folder directory for saving result image screenshot
-videoResultFile = pathFile + 'output\\video\\result.avi'    # folder directory for saving video result
-
-#Settings System (change the value if system make false detection)
-minBallRadius = 60      # minimum radius object that can be detected
-maxBallRadius = 65      # maximum radius object that can be detected
-minDistance = 125       # minimum distance between object that allowed
-ballNumber = 2          # number object that need to be detected
-Interval = 30           # use to capture screenshot per some frame
-frameWidth = 1280       # frame width of the image
-frameHeigth = 720       # frame height of the image
-fps = 30                # frame per seconds of the video
-
-# Setting flag (change based on fiture that wanted to use)
-# Remember : more fitures make system slower
-printRaw = True            # if True then system will print raw image per interval
-printHSV = True            # if True then system will print HSV image per interval
-printFiltered = True       # if True then system will print filtered image per interval
-printResult = True         # if True then system will print result image per interval
-renderVideoResult = True   # if True then system will render result video
-getPositionBall = True      # if True then system will generate CSV file contained object position per frame
-getRadiusBall = True        # if True then system will generate CSV file contained object radius per frame
-getRangeBall = True         # if True then system will generate CSV file contained distance between objects per frame
-
-#Settings for HSV treshold (change to detect object color)
-h_Min = 0           # minimum hue, related to basic color
-h_Max = 255         # maximum hue, related to basic color
-s_Min = 0           # minimum saturated, related to shade
-s_Max = 255         # maximum saturated, related to shade
-v_Min = 10          # minimum value, related to brightness
-v_Max = 255         # maximum value, related to brightness
-
-# lower treshold is combined from minimum arguments
-lowerTreshold = (h_Min, s_Min, v_Min)
-
-# upper treshold is combined from maximum arguments
-upperTreshold = (h_Max, s_Max, v_Max)
-
-#Settings for boundary color (change to make boundary color better)
-red = 0             # red value in RGB
-green = 255         # green value in RGB
-blue = 0            # blue value in RGB
-
-# bounColor is RGB color format contain 3 variable above
-boundColor = (blue, green, red)
-
-#open the video file
-capture = cv2.VideoCapture(openFile)
-
-#checking render flag, if True then render
-if renderVideoResult == True :
-    render = cv2.VideoWriter(videoResultFile,                               # Video result name and director
-                             cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'),    # MJPG format is supported for AVI ext
-                             fps, (frameWidth, frameHeigth))                # Properties of video
-
-frameNumber = 0         # Initialize frame umber variable
-oldPos = []             # Initialize old object position list
-newPos = []             # Initialize new object position list
-radList = []            # Initialize object radius list
-rangeBallList = []      # Initalize range distance between objects list
-
-# as long as video being opened
-while(capture.isOpened()):
-
-    # variable that count number object detected
-    ballCount = 0
-
-    # reading the video file, image send to frame, ret contain boolean True or False
-    ret, frame = capture.read()
-
-    # if there isn't any frame ret equal to False
-    if ret == False:
-
-        # break the while loop
-        break
-
-    # resize image so it will have same size
-    frame = cv2.resize(frame, (frameWidth,frameHeigth))
-
-    # add the frame number value by 1
-    frameNumber += 1
-
-    # check if print raw flag equal to True
-    if printRaw == True:
-
-        # printing raw image
-        printImage2JPG(frame, folderNameRaw, frameNumber, Interval)
-
-    # convert color space from RGB to HSV
-    HSV = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-
-    # check if print HSV flah equal to True
-    if printHSV == True:
-
-        # printing HSV image
-        printImage2JPG(HSV, folderNameHSV, frameNumber, Interval)
-
-    # filter image based on color treshold
-    filtered = cv2.inRange(HSV,lowerTreshold,upperTreshold)
-
-    # check if print Filtered flag equal to True
-    if printFiltered == True:
-
-        # Printing filtered image
-        printImage2JPG(filtered, folderNameFiltered, frameNumber, Interval)
-
-    # find contours in filtered image
-    contours, hierrarchy = cv2.findContours(filtered, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-
-    # for every contour detected
-    for cnt in contours:
-
-        # find minimum enclosing circle
-        (x,y) , radius = cv2.minEnclosingCircle(cnt)
-
-        # get the center value
-        center = (int(x), int(y))
-
-        # get the radius value
-        radius = int(radius)
-
-        # if radius is inside of radius treshold
-        if radius < maxBallRadius and radius > minBallRadius :
-
-            # draw circle surrounding the object
-            cv2.circle(frame, center, radius, boundColor, 2)
-
-            # insert center position to newPos list
-            newPos.append([int(x),int(y)])
-
-            # insert object radius to radList list
-            radList.append(radius)
-
-            # increase the ballCount by 1
-            ballCount += 1
-
-        # if contour radius above the radius treshold
-        elif radius >= 65 :
-
-            # find a bounding rectangle
-            x, y, w, h = cv2.boundingRect(cnt)      # (x,y) equal to bottom-left point, w = width, h = height
-
-            # get Region of Interest (ROI) image within the bounding rectangle
-            roiFrame = frame[y:y+h,x:x+w]
-
-            # convert the color space of ROI image from RGB to Grayscale
-            roiGray = cv2.cvtColor(roiFrame, cv2.COLOR_BGR2GRAY)
-
-            # apply median blur to Grayscale ROI image
-            roiGray = cv2.medianBlur(roiGray, 5)
-
-            # find circle shape in Grayscale ROI image using hough transform
-            circles = cv2.HoughCircles(roiGray, cv2.HOUGH_GRADIENT, 1,
-                                       minDistance, None, 50, 30,
-                                       minBallRadius, maxBallRadius)
-
-            # if there is circle found
-            if circles is not None :
-
-                # change the type value to UINT16 and round it up
-                circles = np.uint16(np.around(circles))
-
-                # for every circle detected
-                for i in circles[0,:] :
-
-                    # draw circle surrounding the object
-                    cv2.circle(roiFrame,(i[0],i[1]),i[2],boundColor, 2)
-
-                    # insert center position to newPos list
-                    newPos.append([i[0]+x, i[1]+y])
-
-                    # insert object radius to radList list
-                    radList.append(i[2])
-
-                    # increase ballCount value by 1
-                    ballCount += 1
-
-    # if object detected is same with the number object that should be detected
-    if ballCount == ballNumber:
-
-        # track the object so it get sorted Position and Radius based by the identity
-        oldPos, radList = TrackingObject(oldPos, newPos, radList)
-
-        # calculate the range distance between objects
-        rangeBallList = calcRangeBall(oldPos, ballNumber)
-
-        # write ID object to result image
-        writingID(oldPos, frame)
-
-        # check get position objec flag
-        if getPositionBall == True:
-
-            # check frame Number
-            if frameNumber == 1:
-
-                # initialize CSV file if it is first frame
-                InitPosToCSV(csvPosFile, ballNumber)
-
-            # save object position to csv file
-            writePosToCSV(csvPosFile, frameNumber, oldPos)
-
-        # check get object radius flag
-        if getRadiusBall == True:
-
-            # check frame Number
-            if frameNumber == 1:
-
-                # initialize CSV file if it is first frame
-                InitRadToCSV(csvRadFile, ballNumber)
-
-            # save object radius to csv file
-            writeRadToCSV(csvRadFile, frameNumber, radList)
-
-        # check get range distance between object flag
-        if getRangeBall == True:
-
-            # check frame number
-            if frameNumber == 1:
-
-                # initialize CSV file if it is first time
-                InitRangeToCSV(csvRangeBallFile, ballNumber)
-
-            # save object range distance to csv file
-            writeRangeToCSV(csvRangeBallFile, frameNumber, rangeBallList)
-
-    # clean the newPos list
-    newPos = clean()
-
-    # clean the radList list
-    radList = clean()
-
-    # clean the rangeBallList
-    rangeBallList = clean()
-
-    # check print result value
-    if printResult == True:
-
-        # if True then printing the result image
-        printImage2JPG(frame, folderNameResult, frameNumber, Interval)
-
-    # check render result video flag
-    if renderVideoResult == True:
-
-        # write the video
-        render.write(frame)
-
-    # show the image in windows frame
-    cv2.imshow('frame', frame)
-
-    # if 'q' keyword pressed and image has been showed
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-
-        # break the while loop
-        break
-
-# release capture
-capture.release()
-
-# check render result video flag
-if renderVideoResult == True:
-
-    # release render
-    render.release()
-
-# destroy all created windows frame
-cv2.destroyAllWindows()
+import cv2
+import numpy as np
+import math
+import argparse
+import ast
+import collections
+import csv
+import concurrent.futures
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+# scipy is optional, it is only used to make the assignment faster
+try:
+    from scipy.optimize import linear_sum_assignment as _scipyAssignment
+except ImportError:
+    _scipyAssignment = None
+
+def printImage2JPG(image, folderName, frameNumber=1, Interval = 1):
+    """a function to print an OpenCV image into a JPEG file at a directory
+
+    :param image : OpenCV variable that contain image matrix
+    :type image : img
+    :param folderName : Folder directory of the printed image (JPEG image)
+    :type folderName : str
+    :param frameNumber : Current frame if the source is video. Default is 1.
+    :type frameNumber : int
+    :param Interval : Interval of printing image to JPEG if the source is
+        video. Default is 1.
+    :type Interval : int
+    :return : none
+
+    """
+
+
+    # checking if the frame number is at the interval.
+    # If true then print the image
+    if frameNumber % Interval == 0:
+
+        # get filename so that it combined with the current frame number
+        # and having jpeg extension
+        filename = folderName +  "image ke-" + str(frameNumber) + '.jpeg'
+
+        # give the image to the snapshot writer if it is running
+        if snapshotWriter is not None:
+            snapshotWriter.submit(image, filename)
+        else:
+            tick = profiler.start()
+            cv2.imwrite(filename, image)
+            profiler.stop('jpeg', tick)
+    return
+
+def TrackingObject(oldPos, newPos, radList):
+    """a function to track object identity that has been detected
+
+    This function calculate and track the object identity by comparing
+    list of position (x,y) in a previous frame and current frame. An
+    object is said to be same from previous and current frame if it has
+    shortest distance. The Object that has been given identity is excluded
+    from calculation of shortest distance, therefore it will not get
+    multiple identity. This function only works if the number of the objects
+    is conserve. This function also sort the current object position and radius
+    based on the identity
+
+    :param oldPos: List of objects position in the previous frame
+    :type oldPos : list
+    :param newPos: list of objects position in the current frame
+    :type newPos: list
+    :param radList: list of objects radius in the current frame
+    :type : list
+    :return: list of sorted object position based on their identity
+    :rtype: list
+    """
+
+
+    # checking whether oldPos has value or not. if oldPos
+    # hasn't get any value, it must be the first frame.
+    # So, there's no previous position list.
+    if not oldPos :
+
+        # it returns as it be
+        return newPos, radList
+
+    # if there is previous position list
+    else:
+        # a is just iterator variable
+        a = 0
+
+        # get the list size of oldPos
+        sizeOldPos = len(oldPos)
+
+        #for every object position in newPos (list of current position)
+        for i in newPos :
+
+            #for every object in oldPos that has not given identity
+            for j in range(a,sizeOldPos) :
+
+                # Remember that every position consist of (x,y)
+                # So position[0] equal to x and position[1] equal to y
+                xRange = int(i[0] - oldPos[j][0])
+                yRange = int(i[1] - oldPos[j][1])
+
+                # get the range distance by using phytagorean theorem
+                Range = math.sqrt(math.pow(xRange,2) + math.pow(yRange, 2))
+
+                # get the minimum distance of the object between previous
+                # and the current frame
+                if j == a:
+                    minRange = Range
+                    location = j
+                else:
+                    if minRange > Range:
+                        minRange = Range
+                        location = j
+
+            # swap the element of newPos so it has same identity order as oldPos
+            newPos[a], newPos[location] = newPos[location], newPos[a]
+
+            # also for the radius
+            radList[a], radList[location] = radList[location], radList[a]
+
+            #increase the iterator
+            a += 1
+
+    #return sorted newPos and radList
+    return newPos, radList
+
+def calcCostMatrix(oldPos, newPos):
+    """ a function to calculate distance between every object in the previous
+    frame and every object in the current frame
+
+    The distance is calculated in one NumPy broadcast, row i is the object
+    in the previous frame and column j is the object in the current frame.
+
+    :param oldPos: list of objects position in the previous frame
+    :type oldPos: list
+    :param newPos: list of objects position in the current frame
+    :type newPos: list
+    :return: matrix of distance with size len(oldPos) x len(newPos)
+    :rtype: numpy.ndarray
+    """
+
+    # change the position list into float array with shape (N, 2)
+    oldArr = np.asarray(oldPos, dtype=np.float64).reshape(-1, 2)
+    newArr = np.asarray(newPos, dtype=np.float64).reshape(-1, 2)
+
+    # get the x and y distance for every pair by broadcasting
+    diff = oldArr[:, np.newaxis, :] - newArr[np.newaxis, :, :]
+
+    # get the range distance by using phytagorean theorem
+    return np.hypot(diff[..., 0], diff[..., 1])
+
+def linearSumAssignment(costMatrix):
+    """ a function to solve the linear sum assignment problem (Hungarian method)
+
+    This function uses scipy.optimize.linear_sum_assignment if scipy is
+    installed. Otherwise it uses the shortest augmenting path version of the
+    Hungarian method in NumPy, every row is assigned to a different column
+    so the total cost is minimum.
+
+    :param costMatrix: cost matrix with size N x M
+    :type costMatrix: numpy.ndarray
+    :return: row index and column index of the assignment, sorted by row
+    :rtype: tuple
+    """
+
+    costMatrix = np.asarray(costMatrix, dtype=np.float64)
+
+    # use scipy if it is available because it is much faster
+    if _scipyAssignment is not None:
+        return _scipyAssignment(costMatrix)
+
+    # the algorithm needs row number less than or equal to column number
+    transposed = costMatrix.shape[0] > costMatrix.shape[1]
+    if transposed:
+        costMatrix = costMatrix.T
+
+    n, m = costMatrix.shape
+
+    # u and v are the potential of the rows and columns, p is the row
+    # assigned to every column (index start from 1, 0 means not assigned)
+    # and way is the previous column in the augmenting path
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    # for every row, find the augmenting path
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+
+            # reduced cost from row i0 to every column
+            cur = costMatrix[i0 - 1] - u[i0] - v[1:]
+
+            # update the minimum value of the columns that are not used
+            free = ~used[1:]
+            update = free & (cur < minv[1:])
+            minv[1:][update] = cur[update]
+            way[1:][update] = j0
+
+            # get the column with minimum value
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+
+            # update the potential
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+
+            j0 = j1
+
+            # stop if the column has not been assigned
+            if p[j0] == 0:
+                break
+
+        # flip the assignment along the augmenting path
+        while j0 != 0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    # collect the assignment (zero base index)
+    colInd = np.nonzero(p[1:])[0]
+    rowInd = p[1:][colInd] - 1
+
+    if transposed:
+        rowInd, colInd = colInd, rowInd
+
+    # sort by row index
+    order = np.argsort(rowInd)
+    return rowInd[order], colInd[order]
+
+def TrackingObjectOptimal(oldPos, newPos, radList):
+    """a function to track object identity using optimal assignment
+
+    This function has the same purpose and return value as TrackingObject,
+    but the identity is given by minimizing the total distance of every
+    object between previous and current frame (Hungarian method) instead
+    of greedy swapping, so identity does not flip when objects are close.
+    If the current frame has more objects than the previous frame, the
+    unassigned objects are put at the end of the list.
+
+    :param oldPos: List of objects position in the previous frame
+    :type oldPos : list
+    :param newPos: list of objects position in the current frame
+    :type newPos: list
+    :param radList: list of objects radius in the current frame
+    :type : list
+    :return: list of sorted object position and radius based on their identity
+    :rtype: tuple
+    """
+
+
+    # if it is the first frame or there is no object, return as it be
+    if not oldPos or not newPos:
+        return newPos, radList
+
+    # calculate distance between every old and new object
+    costMatrix = calcCostMatrix(oldPos, newPos)
+
+    # get the nearest new object for every old object
+    nearest = np.argmin(costMatrix, axis=1)
+
+    # if every old object has different nearest new object, then the
+    # nearest object is already the optimal assignment
+    if len(oldPos) == len(newPos) and np.unique(nearest).size == nearest.size:
+        colInd = nearest
+    else:
+        rowInd, colInd = linearSumAssignment(costMatrix)
+
+    # put the object that is not assigned at the end of the list
+    assigned = np.zeros(len(newPos), dtype=bool)
+    assigned[colInd] = True
+    order = list(colInd) + list(np.nonzero(~assigned)[0])
+
+    #return sorted newPos and radList
+    return [newPos[k] for k in order], [radList[k] for k in order]
+
+def trackBall(oldPos, newPos, radList):
+    """ a function to track object identity with the selected tracker engine
+
+    :param oldPos: List of objects position in the previous frame
+    :type oldPos : list
+    :param newPos: list of objects position in the current frame
+    :type newPos: list
+    :param radList: list of objects radius in the current frame
+    :type : list
+    :return: list of sorted object position and radius based on their identity
+    :rtype: tuple
+    """
+
+    # check the tracker engine setting
+    if trackerEngine == 'greedy':
+        return TrackingObject(oldPos, newPos, radList)
+
+    return TrackingObjectOptimal(oldPos, newPos, radList)
+
+class TrackManager:
+    """ a class to keep the identity of a varying number of object over the frames
+
+    Every track has an identity, a position, a velocity, a radius and the
+    number of frame since its last detection, kept in NumPy arrays with one
+    row for every track slot, so there is no Python object for every track.
+    In every frame the tracks are moved by their velocity, the detections
+    are assigned to the predicted positions with linearSumAssignment and an
+    assignment farther than gate pixel is not allowed. A track without
+    detection coasts on its prediction and dies after maxCoast frames, a
+    detection without track starts a new track with a new identity.
+    """
+
+    def __init__(self, gate=100, maxCoast=5, capacity=64):
+        """
+        :param gate: maximum distance in pixel between the predicted and the
+            detected position. Default is 100.
+        :type gate: float
+        :param maxCoast: number of frame a track is kept without detection.
+            Default is 5.
+        :type maxCoast: int
+        :param capacity: number of track slot allocated at the start, the
+            arrays grow when more tracks are alive. Default is 64.
+        :type capacity: int
+        """
+
+        self.gate = gate
+        self.maxCoast = maxCoast
+        self.nextId = 1
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        """ a function to allocate or grow the track arrays
+
+        :param capacity: new number of track slot
+        :type capacity: int
+        :return: None
+        """
+
+        old = getattr(self, 'alive', np.zeros(0, dtype=bool))
+        size = len(old)
+
+        arrays = {'ids': ((), np.int64), 'pos': ((2,), np.float64), 'observed': ((2,), np.float64),
+                  'vel': ((2,), np.float64), 'rad': ((), np.float64), 'missed': ((), np.int64),
+                  'alive': ((), bool)}
+        for name, (shape, dtype) in arrays.items():
+            grown = np.zeros((capacity,) + shape, dtype=dtype)
+            if size > 0:
+                grown[:size] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def update(self, newPos, radList):
+        """ a function to assign the detections of the current frame to the tracks
+
+        :param newPos: list of objects position in the current frame
+        :type newPos: list
+        :param radList: list of objects radius in the current frame
+        :type radList: list
+        :return: identity, position (N, 2), radius and coasting flag of every
+            alive track, sorted by identity
+        :rtype: tuple
+        """
+
+        newArr = np.asarray(newPos, dtype=np.float64).reshape(-1, 2)
+        radArr = np.asarray(radList, dtype=np.float64).reshape(-1)
+        live = np.flatnonzero(self.alive)
+
+        # assign the detections to the predicted position of the tracks
+        matchedTrack = np.zeros(0, dtype=np.int64)
+        matchedDetection = np.zeros(0, dtype=np.int64)
+        if len(live) > 0 and len(newArr) > 0:
+            costMatrix = calcCostMatrix(self.pos[live] + self.vel[live], newArr)
+            inGate = costMatrix <= self.gate
+
+            # a track and a detection that have only each other inside the gate are matched at once
+            rowCount = inGate.sum(axis=1)
+            colCount = inGate.sum(axis=0)
+            rowInd, colInd = np.nonzero(inGate & (rowCount[:, np.newaxis] == 1) & (colCount == 1))
+
+            # the other tracks and detections inside the gate are assigned by linearSumAssignment
+            restRow = np.flatnonzero(rowCount > 0)
+            restRow = restRow[~np.isin(restRow, rowInd)]
+            restCol = np.flatnonzero(colCount > 0)
+            restCol = restCol[~np.isin(restCol, colInd)]
+            if len(restRow) > 0 and len(restCol) > 0:
+                subMatrix = costMatrix[np.ix_(restRow, restCol)]
+                gated = ~inGate[np.ix_(restRow, restCol)]
+
+                # a gated pair costs more than any allowed assignment
+                subMatrix[gated] = self.gate * (len(restRow) + len(restCol)) + 1
+                subRow, subCol = linearSumAssignment(subMatrix)
+                allowed = ~gated[subRow, subCol]
+                rowInd = np.concatenate((rowInd, restRow[subRow[allowed]]))
+                colInd = np.concatenate((colInd, restCol[np.asarray(subCol)[allowed]]))
+
+            matchedTrack = live[rowInd]
+            matchedDetection = colInd
+
+        # move every track by its velocity
+        self.pos[live] += self.vel[live]
+        self.missed[live] += 1
+
+        # the detected tracks, the velocity is taken since the last detection
+        detected = newArr[matchedDetection]
+        self.vel[matchedTrack] = (detected - self.observed[matchedTrack]) / self.missed[matchedTrack, np.newaxis]
+        self.pos[matchedTrack] = detected
+        self.observed[matchedTrack] = detected
+        self.rad[matchedTrack] = radArr[matchedDetection]
+        self.missed[matchedTrack] = 0
+
+        # the tracks without detection for too long die
+        self.alive[live[self.missed[live] > self.maxCoast]] = False
+
+        # a new track for every detection without track
+        unmatched = np.ones(len(newArr), dtype=bool)
+        unmatched[matchedDetection] = False
+        born = np.flatnonzero(unmatched)
+        if len(born) > 0:
+            free = np.flatnonzero(~self.alive)
+            if len(free) < len(born):
+                self._allocate(max(2 * len(self.alive), len(self.alive) + len(born)))
+                free = np.flatnonzero(~self.alive)
+            slots = free[:len(born)]
+            self.ids[slots] = np.arange(self.nextId, self.nextId + len(born))
+            self.nextId += len(born)
+            self.pos[slots] = newArr[born]
+            self.observed[slots] = newArr[born]
+            self.vel[slots] = 0
+            self.rad[slots] = radArr[born]
+            self.missed[slots] = 0
+            self.alive[slots] = True
+
+        # every alive track sorted by identity
+        live = np.flatnonzero(self.alive)
+        live = live[np.argsort(self.ids[live])]
+
+        return self.ids[live], self.pos[live], self.rad[live], self.missed[live] > 0
+
+    def state(self):
+        """ a function to get the track arrays for a checkpoint
+
+        :return: dictionary of the alive tracks
+        :rtype: dict
+        """
+
+        live = np.flatnonzero(self.alive)
+        return {'nextId': self.nextId,
+                'tracks': {name: getattr(self, name)[live].tolist()
+                           for name in ('ids', 'pos', 'observed', 'vel', 'rad', 'missed')}}
+
+    def restore(self, state):
+        """ a function to set the track arrays from a checkpoint
+
+        :param state: dictionary from state()
+        :type state: dict
+        :return: None
+        """
+
+        tracks = state['tracks']
+        number = len(tracks['ids'])
+        self._allocate(max(len(self.alive), number))
+        self.alive[:] = False
+        for name, values in tracks.items():
+            if number > 0:
+                getattr(self, name)[:number] = values
+        self.alive[:number] = True
+        self.nextId = state['nextId']
+
+def openTrackManager():
+    """ a function to open the track manager if manageTracks flag is True
+
+    :return: track manager, otherwise None
+    :rtype: TrackManager
+    """
+
+    if manageTracks == True:
+        return TrackManager(trackGate, trackCoast)
+
+    return None
+
+def clean():
+    """ a function to clean a list
+
+    :return: an empty list
+    :rtype: list
+    """
+
+
+    A = []
+    return A
+
+def writingID(sortedPos, image, ids=None):
+    """ a function to write object ID at an image
+
+    :param sortedPos: list of sorted object position
+    :type sortedPos: list
+    :param image: Image where to draw or write the ID
+    :param ids: ID of every position, e.g. the track identity of
+        TrackManager. Default is None, the ID is the order in sortedPos.
+    :type ids: list
+    """
+
+    # Just an iterator variable
+    a = 0;
+
+    #  For every position in sortedPos list
+    for k, i in enumerate(sortedPos):
+        # increase the iterator value by 1, or take the given ID
+        a = a + 1 if ids is None else ids[k]
+        i = (int(round(i[0])), int(round(i[1])))
+
+        # draw a black filled circle with radius equal to 20 px
+        cv2.circle(image, (i[0],i[1]), 20, (0, 0, 0), -1)
+
+        # write the ID number at the center of object
+        cv2.putText(image,str(a),(i[0]-10,i[1]+10), cv2.FONT_HERSHEY_SIMPLEX,1,(255,255,255))
+
+def writePosToCSV(csvFile, frameNumber, posList) :
+    """ a function to write every position of object to a CSV file
+
+    :param csvFile: file name and directory of CSV file
+    :type csvFile: str
+    :param frameNumber: current frame number of the position
+    :type frameNumber: int
+    :param posList: list of object position at the current frame number
+    :type posList: list
+    :return: None
+    """
+
+    # initiation for row container list
+    row = []
+
+    # adding frame Number to the first element
+    row.append(frameNumber)
+
+    # for every position in the position list
+    for pos in posList:
+
+        #for every component in the position
+        for component in pos:
+
+            # adding that component in to next element
+            row.append(component)
+
+    # open the csv file with append mode
+    with open(csvFile, 'a') as writeFile:
+        writer = csv.writer(writeFile)
+
+        # insert the row list to next row in csv file
+        writer.writerow(row)
+
+    # close the csv file
+    writeFile.close()
+
+def InitPosToCSV(csvFile, ballNumber):
+    """ a function to initiate writing position object into CSV file
+
+    :param csvFile: file name and directory of CSV file
+    :type csvFile: str
+    :param ballNumber: total number of the object
+    :type ballNumber: int
+    :return: none
+    """
+
+
+    # Open the CSV file with write mode
+    with open(csvFile, 'w') as writeFile:
+
+        # Insert Frame in first column
+        writeFile.write("Frame,")
+
+        # For every object
+        for i in range(ballNumber):
+
+            # Write X + number Object in next column
+            writeFile.write("X" + str(i+1) + ",")
+
+            # Write Y + number Object in next column
+            writeFile.write("Y" + str(i+1) + ",")
+
+        # Change to the next row for further writing
+        writeFile.write("\n")
+
+    # Close the csv File
+    writeFile.close()
+
+def InitRadToCSV(csvFile, ballNumber):
+    """ a function initiate writing radius object into csv file
+
+    :param csvFile: file name and directory of the csv file
+    :type csvFile: str
+    :param ballNumber: total number of the object
+    :type ballNumber: int
+    :return: None
+    """
+
+    # Open the csv file with write mode
+    with open(csvFile, 'w') as writeFile:
+
+        # write Frame in the first column
+        writeFile.write("Frame,")
+
+        # for every object
+        for i in range(ballNumber):
+
+            # write redBall + object number in next column
+            writeFile.write("radBall" + str(i+1) + ",")
+
+        # change line for further writing
+        writeFile.write("\n")
+
+    # close the file
+    writeFile.close()
+
+def InitRangeToCSV(csvFile, ballNumber):
+    """ a function to initiate writing distance between object to CSV file
+
+
+    :param csvFile: file name and directory of csv file
+    :type csvFile: str
+    :param ballNumber: the total number of the object
+    :type ballNumber: int
+    :return: None
+    """
+
+    # initiate iterator variable
+    a = 1
+
+    # open the csv File in write mode
+    with open(csvFile, 'w') as writeFile:
+
+        # write Frame into first column
+        writeFile.write("Frame,")
+
+        # for every object
+        for i in range(ballNumber):
+
+            # also for every object but without itself
+            # and without object that has been counted
+            for j in range(a, ballNumber):
+
+                #write range + combination of two object into next column
+                writeFile.write("Range" + str(i+1) + str(j+1) + ",")
+
+            # adding the iterator
+            a += 1
+
+        # Change line for further writing
+        writeFile.write("\n")
+
+    # Close the csv file
+    writeFile.close()
+
+def writeRadToCSV(csvFile, frameNumber, radList):
+    """ a function to write object radius into csv file
+
+    :param csvFile: file name and directory of the csv file
+    :type csvFile: str
+    :param frameNumber: current frame number of the object
+    :type frameNumber: int
+    :param radList: list of object radius
+    :type: list
+    :return: None
+    """
+
+
+    # Initiate for row container list
+    row = []
+
+    # Adding current frame Number to the row list
+    row.append(frameNumber)
+
+    #for every object radius in radList
+    for rad in radList:
+
+        # add the radius to the row list
+        row.append(rad)
+
+    # open the csv file in append mode
+    with open(csvFile, 'a') as writeFile:
+        writer = csv.writer(writeFile)
+
+        # insert row list into next row on csv file
+        writer.writerow(row)
+
+    # close the csv file
+    writeFile.close()
+
+def writeRangeToCSV(csvFile, frameNumber, rangeBallList):
+    """ a function to write range distance between objects into csv File
+
+    :param csvFile: file name and directory of the csv file
+    :type csvFile: str
+    :param frameNumber: current frame number of the object
+    :type frameNumber: int
+    :param rangeBallList: list of range distance between every objects
+    :type rangeBallList: list
+    :return: None
+    """
+
+
+    # initiate row container list
+    row = []
+
+    # insert the current frame number to row list
+    row.append(frameNumber)
+
+    # for every range distance in rangeBallList
+    for dist in rangeBallList:
+
+        # insert the distance to row list
+        row.append(dist)
+
+    # open the csv file with append mode
+    with open(csvFile, 'a') as writeFile:
+        writer = csv.writer(writeFile)
+
+        # insert row list into the next row of csv file
+        writer.writerow(row)
+
+    # close the file
+    writeFile.close()
+
+def calcRangeBall(sortedPos, ballNumber):
+    """ a function to calculate range distance between objects
+
+    :param sortedPos: list of sorted object position list
+    :type sortedPos: list
+    :param ballNumber: the total number of the object
+    :type ballNumber: int
+    :return: list of range distance between objects
+    :rtype: list
+    """
+
+    # initiate a container list for range distance value
+    rangeBallList = []
+
+    # iterator variable
+    a = 1
+
+    # for every object position in sortedPos list
+    for posA in sortedPos:
+
+        # for every object position in sortedPos list
+        # except itself and others which have been calculated
+        for B in range(a, ballNumber):
+
+            # calculate x distance
+            xRange = int(posA[0] - sortedPos[B][0])
+
+            # calculate y distance
+            yRange = int(posA[1] - sortedPos[B][1])
+
+            # calculate the range distance using phytagorean theorem
+            Range = math.sqrt(math.pow(xRange, 2) + math.pow(yRange, 2))
+
+            # insert the range distance value to rangeBallList
+            rangeBallList.append(Range)
+
+        # increase the iterator value by one
+        a += 1
+
+    # return the rangeBallList which contain calculated range distance
+    return rangeBallList
+
+
+def pairwiseRange(sortedPos, ballNumber):
+    """ a function to calculate range distance between objects with NumPy
+
+    The result has the same order as calcRangeBall (1-2, 1-3, ..., 2-3, ...),
+    but the distance is calculated from the float position without int
+    truncation and without overflow of the unsigned position of the hough
+    transform.
+
+    :param sortedPos: list of sorted object position list
+    :type sortedPos: list
+    :param ballNumber: the total number of the object
+    :type ballNumber: int
+    :return: array of range distance between objects
+    :rtype: numpy.ndarray
+    """
+
+    pos = np.asarray(sortedPos, dtype=np.float64)[:ballNumber]
+
+    # every pair of object in the upper triangle
+    first, second = np.triu_indices(ballNumber, 1)
+    diff = pos[first] - pos[second]
+
+    return np.hypot(diff[:, 0], diff[:, 1])
+
+def calcRange(sortedPos, ballNumber):
+    """ a function to calculate range distance between objects with the
+    function selected by preciseRange flag
+
+    :param sortedPos: list of sorted object position list
+    :type sortedPos: list
+    :param ballNumber: the total number of the object
+    :type ballNumber: int
+    :return: list of range distance between objects
+    :rtype: list
+    """
+
+    # check precise range flag
+    if preciseRange == True:
+        return pairwiseRange(sortedPos, ballNumber).tolist()
+
+    return calcRangeBall(sortedPos, ballNumber)
+
+def neighborRange(sortedPos, cutoff):
+    """ a function to find the pairs of object within the cutoff distance with a uniform grid
+
+    Every object is put into a square cell with the cutoff as its size, so
+    a pair within the cutoff is always in the same or in adjacent cells.
+    The cells are found by sorting the cell keys and searching the 9
+    neighbor keys of every object (numpy.searchsorted), so only the
+    objects of the nearby cells are compared instead of every pair.
+
+    :param sortedPos: list of sorted object position list
+    :type sortedPos: list
+    :param cutoff: maximum range distance of a reported pair in pixel
+    :type cutoff: float
+    :return: identity of the first object, identity of the second object
+        (1 to the number of object, first below second) and range distance
+        of every pair, sorted by the identities
+    :rtype: tuple
+    """
+
+    pos = np.asarray(sortedPos, dtype=np.float64).reshape(-1, 2)
+    objectNumber = len(pos)
+    if objectNumber == 0:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0)
+
+    # cell of every object, shifted so every neighbor cell is not negative
+    cell = np.floor(pos / cutoff).astype(np.int64)
+    cell -= cell.min(axis=0) - 1
+    width = cell[:, 1].max() + 2
+    key = cell[:, 0] * width + cell[:, 1]
+
+    order = np.argsort(key, kind='stable')
+    sortedKey = key[order]
+
+    firstList = []
+    secondList = []
+
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+
+            # objects in the neighbor cell of every object
+            target = key + dx * width + dy
+            start = np.searchsorted(sortedKey, target, 'left')
+            counts = np.searchsorted(sortedKey, target, 'right') - start
+            total = counts.sum()
+            if total == 0:
+                continue
+
+            # every (object, object in the neighbor cell) pair
+            first = np.repeat(np.arange(objectNumber), counts)
+            inside = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            second = order[np.repeat(start, counts) + inside]
+
+            # every pair once
+            keep = first < second
+            firstList.append(first[keep])
+            secondList.append(second[keep])
+
+    if not firstList:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0)
+
+    first = np.concatenate(firstList)
+    second = np.concatenate(secondList)
+
+    # keep the pairs within the cutoff
+    diff = pos[first] - pos[second]
+    distance = np.hypot(diff[:, 0], diff[:, 1])
+    near = distance <= cutoff
+    first, second, distance = first[near], second[near], distance[near]
+
+    # sort by the identities like the dense range order
+    sortOrder = np.lexsort((second, first))
+
+    return first[sortOrder] + 1, second[sortOrder] + 1, distance[sortOrder]
+
+def InitNeighborToCSV(csvFile, ballNumber):
+    """ a function to initiate writing range distance of the near objects into CSV file
+
+    Every row is one pair of object within the cutoff (rangeMode 'neighbor').
+
+    :param csvFile: file name and directory of CSV file
+    :type csvFile: str
+    :param ballNumber: total number of the object, not used by this format
+    :type ballNumber: int
+    :return: None
+    """
+
+    # Open the CSV file with write mode
+    with open(csvFile, 'w') as writeFile:
+
+        # Insert Frame, the identity of both object and the range distance
+        writeFile.write("Frame,idA,idB,Distance\n")
+
+def InitTrackToCSV(csvFile, ballNumber):
+    """ a function to initiate writing the tracks of TrackManager into CSV file
+
+    Every row is one alive track of a frame, the coasting track has the
+    predicted position.
+
+    :param csvFile: file name and directory of CSV file
+    :type csvFile: str
+    :param ballNumber: total number of the object, not used by this format
+    :type ballNumber: int
+    :return: None
+    """
+
+    # Open the CSV file with write mode
+    with open(csvFile, 'w') as writeFile:
+
+        # Insert Frame, the track identity, position, radius and coasting flag
+        writeFile.write("Frame,ID,X,Y,Radius,Coasting\n")
+
+def InitKinematicsToCSV(csvFile, ballNumber):
+    """ a function to initiate writing velocity, speed and acceleration of object into CSV file
+
+    :param csvFile: file name and directory of CSV file
+    :type csvFile: str
+    :param ballNumber: total number of the object
+    :type ballNumber: int
+    :return: None
+    """
+
+    # Open the CSV file with write mode
+    with open(csvFile, 'w') as writeFile:
+
+        # Insert Frame in first column
+        writeFile.write("Frame,")
+
+        # For every object
+        for i in range(ballNumber):
+
+            # Write velocity, speed and acceleration + number Object in next columns
+            for name in ("VX", "VY", "Speed", "AX", "AY"):
+                writeFile.write(name + str(i+1) + ",")
+
+        # Change to the next row for further writing
+        writeFile.write("\n")
+
+class KinematicsWindow:
+    """ a class to calculate velocity, speed and acceleration of every object
+    from the last tracked frames
+
+    The sorted positions of the last windowSize tracked frames are kept in a
+    ring buffer. Every update fits a second degree polynomial over time to
+    every x and y column at once (numpy.polyfit with a 2D y), so there is no
+    loop over the objects. The velocity and acceleration are the first and
+    second derivative at the newest frame in pixel per second (and pixel
+    per second squared), time is frame number divided by fps. With two
+    frames only the velocity is known, with one frame nothing is known
+    (NaN).
+    """
+
+    def __init__(self, ballNumber, windowSize=5, frameRate=30):
+        """
+        :param ballNumber: total number of the object
+        :type ballNumber: int
+        :param windowSize: number of tracked frame in the window. Default is 5.
+        :type windowSize: int
+        :param frameRate: frame per second of the video. Default is 30.
+        :type frameRate: float
+        """
+
+        self.ballNumber = ballNumber
+        self.windowSize = max(2, windowSize)
+        self.frameRate = frameRate
+        self.times = np.zeros(self.windowSize)
+        self.positions = np.zeros((self.windowSize, ballNumber * 2))
+        self.size = 0
+        self.next = 0
+
+    def update(self, frameNumber, sortedPos):
+        """ a function to add the sorted position of a tracked frame
+
+        :param frameNumber: current frame number
+        :type frameNumber: int
+        :param sortedPos: list of sorted object position list
+        :type sortedPos: list
+        :return: velocity (ballNumber, 2), speed (ballNumber,) and
+            acceleration (ballNumber, 2) at the current frame
+        :rtype: tuple
+        """
+
+        # replace the oldest frame of the ring buffer
+        self.times[self.next] = frameNumber / self.frameRate
+        self.positions[self.next] = np.asarray(sortedPos, dtype=np.float64)[:self.ballNumber].ravel()
+        self.next = (self.next + 1) % self.windowSize
+        self.size = min(self.size + 1, self.windowSize)
+
+        velocity = np.full(self.ballNumber * 2, np.nan)
+        acceleration = np.full(self.ballNumber * 2, np.nan)
+
+        if self.size >= 2:
+
+            # time relative to the current frame, so the derivative is at zero
+            times = self.times[:self.size] - frameNumber / self.frameRate
+            degree = min(2, self.size - 1)
+            coefficient = np.polyfit(times, self.positions[:self.size], degree)
+
+            velocity = coefficient[-2]
+            if degree == 2:
+                acceleration = 2 * coefficient[0]
+
+        velocity = velocity.reshape(self.ballNumber, 2)
+        acceleration = acceleration.reshape(self.ballNumber, 2)
+
+        return velocity, np.hypot(velocity[:, 0], velocity[:, 1]), acceleration
+
+    def state(self):
+        """ a function to get the ring buffer for a checkpoint
+
+        :return: dictionary of the ring buffer
+        :rtype: dict
+        """
+
+        return {'times': self.times.tolist(), 'positions': self.positions.tolist(),
+                'size': self.size, 'next': self.next}
+
+    def restore(self, state):
+        """ a function to set the ring buffer from a checkpoint
+
+        :param state: dictionary from state()
+        :type state: dict
+        :return: None
+        """
+
+        if np.shape(state['positions']) != self.positions.shape:
+            return
+
+        self.times[:] = state['times']
+        self.positions[:] = state['positions']
+        self.size = state['size']
+        self.next = state['next']
+
+def openKinematics():
+    """ a function to open the kinematics window if getKinematicsBall flag is True
+
+    :return: kinematics window, otherwise None
+    :rtype: KinematicsWindow
+    """
+
+    if getKinematicsBall == True:
+        return KinematicsWindow(ballNumber, kinematicsWindow, fps)
+
+    return None
+
+
+class NullProfiler:
+    """ a class with the same functions as StageProfiler that does nothing,
+    used when profileRun flag is False so the instrumentation costs almost
+    nothing
+    """
+
+    def start(self):
+        return 0.0
+
+    def stop(self, name, start):
+        return
+
+    def count(self, name, number=1):
+        return
+
+    def addValue(self, name, value):
+        return
+
+class StageProfiler:
+    """ a class to record the latency of every stage of the detection
+
+    The latency of every stage is kept in a histogram with 8 bins per
+    octave from 1 microsecond, so the memory does not grow with the video
+    length. The percentiles are read from the histogram (about 9 percent
+    resolution), the total and maximum latency are exact.
+    """
+
+    binPerOctave = 8
+    binNumber = 240
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = collections.Counter()
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def start(self):
+        """ a function to get the start time of a stage
+
+        :return: start time in seconds
+        :rtype: float
+        """
+
+        return time.perf_counter()
+
+    def stop(self, name, start):
+        """ a function to add the latency of a stage since start
+
+        :param name: name of the stage
+        :type name: str
+        :param start: start time returned by start()
+        :type start: float
+        :return: None
+        """
+
+        duration = time.perf_counter() - start
+
+        # get the histogram bin of the latency
+        micro = duration * 1e6
+        if micro > 1:
+            index = min(self.binNumber - 1, int(math.log2(micro) * self.binPerOctave) + 1)
+        else:
+            index = 0
+
+        with self.lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                             'bins': [0] * self.binNumber}
+            stage['count'] += 1
+            stage['total'] += duration
+            stage['max'] = max(stage['max'], duration)
+            stage['bins'][index] += 1
+
+    def count(self, name, number=1):
+        """ a function to count an event, such as the hough transform
+
+        :param name: name of the event
+        :type name: str
+        :param number: number of event. Default is 1.
+        :type number: int
+        :return: None
+        """
+
+        with self.lock:
+            self.counters[name] += number
+
+    def addValue(self, name, value):
+        """ a function to add an integer value of one frame, such as the
+        number of contour
+
+        :param name: name of the value
+        :type name: str
+        :param value: value of the current frame
+        :type value: int
+        :return: None
+        """
+
+        with self.lock:
+            self.values.setdefault(name, collections.Counter())[value] += 1
+
+    def _percentile(self, bins, count, fraction):
+        """ a function to get a percentile latency from a histogram
+
+        :return: upper edge of the bin in milliseconds
+        :rtype: float
+        """
+
+        target = fraction * count
+        cumulative = 0
+        for index, number in enumerate(bins):
+            cumulative += number
+            if cumulative >= target:
+                return 2 ** (index / self.binPerOctave) / 1000
+        return 0.0
+
+    def summary(self):
+        """ a function to get the summary of every stage, counter and value
+
+        :return: dictionary that can be written as JSON
+        :rtype: dict
+        """
+
+        with self.lock:
+            stages = {}
+            for name, stage in self.stages.items():
+                count = stage['count']
+                maxMs = stage['max'] * 1000
+
+                # the bin edge can be above the exact maximum
+                stages[name] = {'count': count,
+                                'totalMs': round(stage['total'] * 1000, 3),
+                                'meanMs': round(stage['total'] * 1000 / count, 4),
+                                'p50Ms': round(min(maxMs, self._percentile(stage['bins'], count, 0.50)), 4),
+                                'p95Ms': round(min(maxMs, self._percentile(stage['bins'], count, 0.95)), 4),
+                                'p99Ms': round(min(maxMs, self._percentile(stage['bins'], count, 0.99)), 4),
+                                'maxMs': round(maxMs, 4)}
+
+            values = {}
+            for name, counter in self.values.items():
+                data = sorted(counter.elements())
+                values[name] = {'frames': len(data),
+                                'mean': round(sum(data) / len(data), 3),
+                                'p50': data[len(data) // 2],
+                                'p95': data[min(len(data) - 1, int(len(data) * 0.95))],
+                                'max': data[-1],
+                                'histogram': {str(value): number for value, number in sorted(counter.items())}}
+
+            return {'stages': stages, 'counters': dict(self.counters), 'values': values}
+
+    def save(self, reportFile):
+        """ a function to write the report as a JSON file and a CSV file
+
+        :param reportFile: file name of the report without extension
+        :type reportFile: str
+        :return: None
+        """
+
+        summary = self.summary()
+
+        # the whole report
+        with open(reportFile + '.json', 'w') as writeFile:
+            json.dump(summary, writeFile, indent=2)
+
+        # one row for every stage
+        with open(reportFile + '.csv', 'w', newline='') as writeFile:
+            writer = csv.writer(writeFile)
+            writer.writerow(['Stage', 'Count', 'TotalMs', 'MeanMs', 'P50Ms', 'P95Ms', 'P99Ms', 'MaxMs'])
+            for name, stage in summary['stages'].items():
+                writer.writerow([name, stage['count'], stage['totalMs'], stage['meanMs'],
+                                 stage['p50Ms'], stage['p95Ms'], stage['p99Ms'], stage['maxMs']])
+
+
+#Settings path file and file name (Change the Green one)
+
+pathFile = 'D:\\Github\\multiballDetc\\'                   # Directory of the program file
+openFile = pathFile +'video1.mp4'                           # Name of the input video, put video next to program file
+csvPosFile = pathFile + 'dataPosBola.csv'                   # name of the csv file that contain object position
+                                                            # over time
+csvRadFile = pathFile + 'dataRadBola.csv'                   # name of the csv file that contain object radius over time
+csvRangeBallFile = pathFile + 'dataRangeBola.csv'           # name of the csv file that contain object range distance
+                                                            # over time
+csvKinematicsFile = pathFile + 'dataKinematicsBola.csv'     # name of the csv file that contain object velocity, speed
+                                                            # and acceleration over time
+csvTrackFile = pathFile + 'dataTrackBola.csv'               # name of the csv file that contain every track of
+                                                            # TrackManager over time
+checkpointFile = pathFile + 'checkpoint.json'               # name of the checkpoint file of the serial loop
+folderNameRaw = pathFile + 'output\\raw\\'                  # folder directory for saving raw image screenshot
+folderNameHSV = pathFile + 'output\\hsv\\'                  # folder directory for saving HSV image screenshot
+folderNameFiltered = pathFile + 'output\\filtered\\'        # folder directory for saving filtered image screenshot
+folderNameResult = pathFile + 'output\\result\\'            # folder directory for saving result image screenshot
+videoResultFile = pathFile + 'output\\video\\result.avi'    # folder directory for saving video result
+columnFile = pathFile + 'dataBola'                          # name of the columnar file (outputFormat 'npz' or 'npy')
+profileReportFile = pathFile + 'profile'                    # name of the profiling report (.json and .csv)
+latencyReportFile = pathFile + 'latency'                    # name of the latency report of live mode (.json and .csv)
+detectionCacheFolder = pathFile + 'cache\\'                  # folder of the stored detection of every video
+
+#Settings System (change the value if system make false detection)
+minBallRadius = 60      # minimum radius object that can be detected
+maxBallRadius = 65      # maximum radius object that can be detected
+minDistance = 125       # minimum distance between object that allowed
+ballNumber = 2          # number object that need to be detected
+Interval = 30           # use to capture screenshot per some frame
+frameWidth = 1280       # frame width of the image
+frameHeigth = 720       # frame height of the image
+fps = 30                # frame per seconds of the video
+trackerEngine = 'optimal'   # 'optimal' use Hungarian assignment, 'greedy' use the old TrackingObject
+manageTracks = False    # if True then every frame, also with missed or extra object, is tracked by TrackManager (not in segment mode)
+trackGate = 100         # maximum distance in pixel between the predicted and the detected position of a track
+trackCoast = 5          # number of frame a track is kept on its predicted position without detection
+roiTracking = False     # if True then only windows around the predicted position are searched (serial loop)
+roiPadding = 40         # extra size in pixel of the search window around the predicted position
+frameStride = 1         # detect every frameStride-th frame, the frames between are skipped with grab() and interpolated (serial loop)
+strideMaxMotion = 20    # maximum motion in pixel of an object over frameStride frames, above it or with a missed object every frame is detected
+coarseScale = 1         # 1 search the whole frame, 2 or 4 find the object on a downscaled frame first
+reuseBuffers = False    # if True then frame, HSV, mask and ROI images are written into preallocated buffers
+contourPrefilter = False    # if True then contours are filtered by hierarchy, size and area before measuring
+minContourAreaFactor = 0.5  # prefilter: minimum contour area, relative to the area of the smallest object
+houghAreaFactor = 1.5       # prefilter: minimum contour area for hough transform, relative to the smallest object (houghAreaCircle)
+houghAreaCircle = False     # prefilter: if True then a contour below houghAreaFactor is measured from its area instead of hough transform, faster but the position can move a few pixel
+houghCaching = False        # if True then hough transform result is used again while the merged contour barely changes
+houghCacheSize = 16         # maximum number of contour kept in the hough cache
+houghCacheAge = 30          # number of frame before the hough transform of a cached contour runs again
+houghCacheShift = 2         # maximum change in pixel of the contour rectangle to use the cached circles
+houghCacheTolerance = 8     # maximum mean gray level difference of the 8x8 signature to use the cached circles
+
+# Setting flag (change based on fiture that wanted to use)
+# Remember : more fitures make system slower
+printRaw = True            # if True then system will print raw image per interval
+printHSV = True            # if True then system will print HSV image per interval
+printFiltered = True       # if True then system will print filtered image per interval
+printResult = True         # if True then system will print result image per interval
+renderVideoResult = True   # if True then system will render result video
+asyncRender = False        # if True then result video is encoded in a separate process, only faster with a spare CPU core
+renderQueueSize = 8        # number of frame waiting in the shared memory of the encoder process
+videoCodec = 'MJPG'        # four character code of the result video codec, e.g. 'MJPG', 'XVID', 'mp4v'
+headless = False           # if True then system will not show any window (also --headless)
+showProgress = False       # if True then system will print frames done, fps and ETA (also --progress)
+profileRun = False         # if True then system will write latency report of every stage (also --profile)
+checkpointInterval = 0     # number of frame between two checkpoints of the serial loop, 0 is no checkpoint (also --checkpoint)
+resumeRun = False          # if True then the serial loop continues from the checkpoint file (also --resume)
+detectionCache = False     # if True then the serial loop stores the detection and uses it again while the video and detection settings are same
+asyncSnapshot = True       # if True then system will write JPEG images in separate threads
+snapshotWorkers = 2        # number of threads that write JPEG images
+snapshotQueueSize = 16     # maximum number of JPEG images waiting to be written
+snapshotPolicy = 'block'   # 'block' wait or 'drop-oldest' drop the oldest image when the queue is full
+getPositionBall = True      # if True then system will generate CSV file contained object position per frame
+getRadiusBall = True        # if True then system will generate CSV file contained object radius per frame
+getRangeBall = True         # if True then system will generate CSV file contained distance between objects per frame
+getKinematicsBall = False   # if True then system will generate CSV file contained velocity, speed and acceleration per frame (not in segment mode)
+preciseRange = False        # if True then distance between objects is calculated with NumPy from the float position
+rangeMode = 'dense'         # 'dense' one column for every pair, 'neighbor' one row for every pair within rangeCutoff
+rangeCutoff = 150           # maximum distance in pixel of a pair in rangeMode 'neighbor'
+kinematicsWindow = 5        # number of tracked frame used to calculate velocity and acceleration
+csvFlushSize = 100          # number of CSV row kept in memory before written to the CSV files
+outputFormat = 'csv'        # 'csv', 'npz' (one compressed columnar file) or 'npy' (folder of memory mappable column files)
+liveMode = False            # if True then system will detect the newest frame of liveSource and drop stale frames (also --live)
+liveSource = 0              # camera index, stream URL or video file of live mode
+livePacing = True           # if True then a video file in live mode is read at its frame rate like a camera
+pipelineMode = False        # if True then system will read, detect and write in separate threads
+detectorWorkers = 4         # number of detector threads in pipeline mode
+pipelineQueueSize = 8       # maximum number of frame waiting in the pipeline
+segmentMode = False         # if True then system will split the video into frame ranges detected in separate processes
+segmentWorkers = 4          # number of worker process in segment mode
+batchMode = False           # if True then system will process every video in batchSource
+batchSource = pathFile + 'videos\\'            # directory or glob pattern (e.g. '*.mp4') of the videos in batch mode
+batchOutput = pathFile + 'output\\batch\\'     # directory of the output folder of every video in batch mode
+batchWorkers = 4            # number of worker process in batch mode
+videoExtensions = ('.mp4', '.avi', '.mov', '.mkv')  # video file extension that is taken from a directory
+
+#Settings for HSV treshold (change to detect object color)
+h_Min = 0           # minimum hue, related to basic color
+h_Max = 255         # maximum hue, related to basic color
+s_Min = 0           # minimum saturated, related to shade
+s_Max = 255         # maximum saturated, related to shade
+v_Min = 10          # minimum value, related to brightness
+v_Max = 255         # maximum value, related to brightness
+
+# lower treshold is combined from minimum arguments
+lowerTreshold = (h_Min, s_Min, v_Min)
+
+# upper treshold is combined from maximum arguments
+upperTreshold = (h_Max, s_Max, v_Max)
+
+#Settings for boundary color (change to make boundary color better)
+red = 0             # red value in RGB
+green = 255         # green value in RGB
+blue = 0            # blue value in RGB
+
+# bounColor is RGB color format contain 3 variable above
+boundColor = (blue, green, red)
+
+# name of every setting above, the settings that DetectorConfig can change
+settingNames = ('pathFile', 'openFile', 'csvPosFile', 'csvRadFile', 'csvRangeBallFile', 'csvKinematicsFile',
+                'csvTrackFile', 'checkpointFile', 'folderNameRaw', 'folderNameHSV', 'folderNameFiltered',
+                'folderNameResult', 'videoResultFile', 'columnFile', 'profileReportFile', 'latencyReportFile',
+                'detectionCacheFolder',
+                'minBallRadius', 'maxBallRadius', 'minDistance', 'ballNumber', 'Interval', 'frameWidth',
+                'frameHeigth', 'fps', 'trackerEngine', 'manageTracks', 'trackGate', 'trackCoast',
+                'roiTracking', 'roiPadding', 'frameStride', 'strideMaxMotion', 'coarseScale', 'reuseBuffers',
+                'contourPrefilter', 'minContourAreaFactor', 'houghAreaFactor', 'houghAreaCircle',
+                'houghCaching', 'houghCacheSize', 'houghCacheAge', 'houghCacheShift', 'houghCacheTolerance',
+                'printRaw', 'printHSV', 'printFiltered', 'printResult', 'renderVideoResult', 'asyncRender',
+                'renderQueueSize', 'videoCodec', 'headless', 'showProgress', 'profileRun',
+                'checkpointInterval', 'resumeRun', 'detectionCache', 'asyncSnapshot', 'snapshotWorkers',
+                'snapshotQueueSize', 'snapshotPolicy', 'getPositionBall', 'getRadiusBall', 'getRangeBall',
+                'getKinematicsBall', 'preciseRange', 'rangeMode', 'rangeCutoff', 'kinematicsWindow',
+                'csvFlushSize', 'outputFormat', 'liveMode', 'liveSource', 'livePacing', 'pipelineMode',
+                'detectorWorkers', 'pipelineQueueSize', 'segmentMode', 'segmentWorkers', 'batchMode',
+                'batchSource', 'batchOutput', 'batchWorkers', 'videoExtensions',
+                'h_Min', 'h_Max', 's_Min', 's_Max', 'v_Min', 'v_Max', 'red', 'green', 'blue')
+
+# name of every file and folder setting that is below pathFile
+pathSettingNames = ('openFile', 'csvPosFile', 'csvRadFile', 'csvRangeBallFile', 'csvKinematicsFile',
+                    'csvTrackFile', 'checkpointFile', 'folderNameRaw', 'folderNameHSV', 'folderNameFiltered',
+                    'folderNameResult', 'videoResultFile', 'columnFile', 'profileReportFile',
+                    'latencyReportFile', 'detectionCacheFolder', 'batchSource', 'batchOutput')
+
+snapshotWriter = None   # running SnapshotWriter, started by startSnapshotWriter
+savedWork = collections.Counter()   # counter of the work skipped because no output uses it
+savedWorkLock = threading.Lock()    # lock of savedWork because detectBall can run in several threads
+stopRequested = threading.Event()   # set by SIGINT or SIGTERM to stop the detection loop gracefully
+profiler = NullProfiler()           # stage profiler, started by startProfiler
+houghCache = None                   # running HoughCache, started by startHoughCache
+threadBuffers = threading.local()   # FrameBuffers of every thread, used if reuseBuffers is True
+
+class ResultSink:
+    """ a class to write position, radius and range of the object into CSV files
+
+    The CSV files are initialized with InitPosToCSV, InitRadToCSV and
+    InitRangeToCSV and opened only once. The rows are kept in memory and
+    written to the files every flushSize rows, so the files are not opened
+    and closed for every frame. The row format is same as writePosToCSV,
+    writeRadToCSV and writeRangeToCSV.
+    """
+
+    def __init__(self, csvPos, csvRad, csvRange, ballNumber, flushSize=100, csvKinematics=None,
+                 offsets=None, neighborRange=False, csvTracks=None):
+        """
+        :param csvPos: file name of the position CSV file, None if not used
+        :type csvPos: str
+        :param csvRad: file name of the radius CSV file, None if not used
+        :type csvRad: str
+        :param csvRange: file name of the range CSV file, None if not used
+        :type csvRange: str
+        :param ballNumber: total number of the object
+        :type ballNumber: int
+        :param flushSize: number of row kept in memory before it is written.
+            Default is 100.
+        :type flushSize: int
+        :param csvKinematics: file name of the velocity, speed and
+            acceleration CSV file. Default is None, not used.
+        :type csvKinematics: str
+        :param offsets: offset of every CSV file from offsets() of a stopped
+            run. The files are cut at the offset and continued instead of
+            initialized. Default is None.
+        :type offsets: dict
+        :param neighborRange: if True then the range CSV file has one row for
+            every near pair (writeNeighbors) instead of one column for every
+            pair. Default is False.
+        :type neighborRange: bool
+        :param csvTracks: file name of the TrackManager CSV file. Default is
+            None, not used.
+        :type csvTracks: str
+        """
+
+        self.flushSize = max(1, flushSize)
+        self.files = {}
+        self.writers = {}
+        self.rows = {}
+
+        # initialize and open every used CSV file
+        for name, csvFile, initFunction in (('pos', csvPos, InitPosToCSV),
+                                            ('rad', csvRad, InitRadToCSV),
+                                            ('range', csvRange,
+                                             InitNeighborToCSV if neighborRange else InitRangeToCSV),
+                                            ('kinematics', csvKinematics, InitKinematicsToCSV),
+                                            ('tracks', csvTracks, InitTrackToCSV)):
+            if csvFile is None:
+                continue
+
+            # continue the file of a stopped run, the rows after the offset are written again
+            if offsets is not None and name in offsets and os.path.exists(csvFile):
+                with open(csvFile, 'rb+') as cutFile:
+                    cutFile.truncate(offsets[name])
+            else:
+                initFunction(csvFile, ballNumber)
+
+            # open the csv file with append mode, same as the write functions
+            self.files[name] = open(csvFile, 'a')
+            self.writers[name] = csv.writer(self.files[name])
+            self.rows[name] = []
+
+    def _add(self, name, row):
+        """ a function to add one row to the buffer of a CSV file
+
+        :param name: name of the CSV file ('pos', 'rad' or 'range')
+        :type name: str
+        :param row: row list
+        :type row: list
+        :return: None
+        """
+
+        # the CSV file is not used
+        if name not in self.rows:
+            return
+
+        self.rows[name].append(row)
+
+        # write the rows if the buffer is full
+        if len(self.rows[name]) >= self.flushSize:
+            self.writers[name].writerows(self.rows[name])
+            self.rows[name] = []
+
+    def writePos(self, frameNumber, posList):
+        """ a function to write every position of object
+
+        :param frameNumber: current frame number of the position
+        :type frameNumber: int
+        :param posList: list of object position at the current frame number
+        :type posList: list
+        :return: None
+        """
+
+        self._add('pos', [frameNumber] + [component for pos in posList for component in pos])
+
+    def writeRad(self, frameNumber, radList):
+        """ a function to write object radius
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param radList: list of object radius
+        :type radList: list
+        :return: None
+        """
+
+        self._add('rad', [frameNumber] + list(radList))
+
+    def writeRange(self, frameNumber, rangeBallList):
+        """ a function to write range distance between objects
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param rangeBallList: list of range distance between every objects
+        :type rangeBallList: list
+        :return: None
+        """
+
+        self._add('range', [frameNumber] + list(rangeBallList))
+
+    def writeNeighbors(self, frameNumber, idA, idB, distance):
+        """ a function to write range distance of the near objects, one row for every pair
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param idA: identity of the first object of every pair
+        :type idA: numpy.ndarray
+        :param idB: identity of the second object of every pair
+        :type idB: numpy.ndarray
+        :param distance: range distance of every pair
+        :type distance: numpy.ndarray
+        :return: None
+        """
+
+        for row in zip(idA.tolist(), idB.tolist(), distance.tolist()):
+            self._add('range', [frameNumber] + list(row))
+
+    def writeKinematics(self, frameNumber, velocity, speed, acceleration):
+        """ a function to write velocity, speed and acceleration of every object
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param velocity: velocity with shape (ballNumber, 2)
+        :type velocity: numpy.ndarray
+        :param speed: speed with shape (ballNumber,)
+        :type speed: numpy.ndarray
+        :param acceleration: acceleration with shape (ballNumber, 2)
+        :type acceleration: numpy.ndarray
+        :return: None
+        """
+
+        # VX, VY, Speed, AX, AY of every object in one row
+        row = np.column_stack((velocity, speed, acceleration)).ravel()
+        self._add('kinematics', [frameNumber] + row.tolist())
+
+    def writeTracks(self, frameNumber, ids, positions, radii, coasting):
+        """ a function to write every alive track of TrackManager, one row for every track
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param ids: identity of every track
+        :type ids: numpy.ndarray
+        :param positions: position of every track with shape (N, 2)
+        :type positions: numpy.ndarray
+        :param radii: radius of every track
+        :type radii: numpy.ndarray
+        :param coasting: True if the track is not detected in this frame
+        :type coasting: numpy.ndarray
+        :return: None
+        """
+
+        # the position in pixel like the position CSV file
+        positions = np.rint(positions).astype(int).tolist()
+        for trackId, (x, y), radius, coast in zip(ids.tolist(), positions, np.rint(radii).astype(int).tolist(),
+                                                  coasting.astype(int).tolist()):
+            self._add('tracks', [frameNumber, trackId, x, y, radius, coast])
+
+    def flush(self):
+        """ a function to write every buffered row into the CSV files
+
+        :return: None
+        """
+
+        for name in self.rows:
+            self.writers[name].writerows(self.rows[name])
+            self.rows[name] = []
+            self.files[name].flush()
+
+    def offsets(self):
+        """ a function to write every buffered row and get the end offset of every CSV file
+
+        :return: dictionary of CSV file name ('pos', 'rad', ...) and offset
+        :rtype: dict
+        """
+
+        self.flush()
+
+        return {name: writeFile.tell() for name, writeFile in self.files.items()}
+
+    def close(self):
+        """ a function to write every buffered row and close the CSV files
+
+        :return: None
+        """
+
+        self.flush()
+
+        for writeFile in self.files.values():
+            writeFile.close()
+
+        self.files = {}
+        self.writers = {}
+        self.rows = {}
+
+class ChunkBuffer:
+    """ a class to collect rows into a preallocated NumPy array
+
+    The array grows by chunkSize rows when it is full, so appending a row
+    does not allocate a new array every frame.
+    """
+
+    def __init__(self, rowShape, dtype, chunkSize=None):
+        """
+        :param rowShape: shape of one row
+        :type rowShape: tuple
+        :param dtype: NumPy data type of the array
+        :type dtype: numpy.dtype
+        :param chunkSize: number of row added when the array is full. Default
+            is None, the number of row that fits in about 4 MB.
+        :type chunkSize: int
+        """
+
+        # get the chunk size from the size of one row
+        if chunkSize is None:
+            rowBytes = np.dtype(dtype).itemsize * int(np.prod(rowShape))
+            chunkSize = max(64, (4 << 20) // max(1, rowBytes))
+
+        self.chunkSize = chunkSize
+        self.data = np.empty((chunkSize,) + tuple(rowShape), dtype=dtype)
+        self.size = 0
+
+    def append(self, row):
+        """ a function to add one row at the end of the array
+
+        :param row: row value with shape rowShape
+        :type row: list
+        :return: None
+        """
+
+        # grow the array if it is full, at least by one chunk and by half of
+        # the current size so the copy does not happen too often
+        if self.size == len(self.data):
+            growth = max(self.chunkSize, len(self.data) // 2)
+            grown = np.empty((len(self.data) + growth,) + self.data.shape[1:],
+                             dtype=self.data.dtype)
+            grown[:self.size] = self.data
+            self.data = grown
+
+        self.data[self.size] = row
+        self.size += 1
+
+    def extend(self, rows):
+        """ a function to add several rows at the end of the array
+
+        :param rows: row values with shape (number of row,) + rowShape
+        :type rows: numpy.ndarray
+        :return: None
+        """
+
+        # grow the array like append
+        if self.size + len(rows) > len(self.data):
+            growth = max(self.chunkSize, len(self.data) // 2, self.size + len(rows) - len(self.data))
+            grown = np.empty((len(self.data) + growth,) + self.data.shape[1:],
+                             dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+
+        self.data[self.size:self.size + len(rows)] = rows
+        self.size += len(rows)
+
+    def array(self):
+        """ a function to get the filled part of the array
+
+        :return: array with the collected rows
+        :rtype: numpy.ndarray
+        """
+
+        return self.data[:self.size]
+
+class ColumnSink:
+    """ a class to write position, radius and range of the object into a
+    columnar binary file
+
+    It has the same write functions as ResultSink. Every column is kept in a
+    ChunkBuffer and saved when the sink is closed, either as one compressed
+    NPZ file (fileFormat 'npz') or as a folder of NPY files (fileFormat 'npy')
+    that can be opened with memory mapping by loadColumns.
+
+    The saved columns are 'frame' (frame number of the pos, rad, range and
+    kinematics rows), 'pos' (x and y of every
+    identity), 'rad' (radius of every identity), 'range' (range distance in
+    calcRangeBall order), 'velocity', 'speed' and 'acceleration' (if
+    useKinematics is True) and 'ballNumber'. If neighborRange is True, the
+    range is saved as one row for every near pair in 'neighborFrame',
+    'idA', 'idB' and 'distance' instead of 'range'. If useTracks is True,
+    every alive track of TrackManager is saved as one row in 'trackFrame',
+    'trackId', 'trackPos', 'trackRad' and 'trackCoasting'.
+    """
+
+    def __init__(self, columnFile, ballNumber, usePos=True, useRad=True,
+                 useRange=True, fileFormat='npz', chunkSize=None, useKinematics=False,
+                 neighborRange=False, useTracks=False):
+        """
+        :param columnFile: file name of the NPZ file or folder of the NPY files
+        :type columnFile: str
+        :param ballNumber: total number of the object
+        :type ballNumber: int
+        :param usePos: if True then the position is saved. Default is True.
+        :type usePos: bool
+        :param useRad: if True then the radius is saved. Default is True.
+        :type useRad: bool
+        :param useRange: if True then the range distance is saved. Default is True.
+        :type useRange: bool
+        :param fileFormat: 'npz' or 'npy'. Default is 'npz'.
+        :type fileFormat: str
+        :param chunkSize: number of row added when a buffer is full.
+            Default is None, see ChunkBuffer.
+        :type chunkSize: int
+        :param useKinematics: if True then the velocity, speed and
+            acceleration are saved. Default is False.
+        :type useKinematics: bool
+        :param neighborRange: if True then the range of the near pairs is
+            saved (writeNeighbors). Default is False.
+        :type neighborRange: bool
+        :param useTracks: if True then the tracks of TrackManager are saved
+            (writeTracks). Default is False.
+        :type useTracks: bool
+        """
+
+        if fileFormat not in ('npz', 'npy'):
+            raise ValueError("fileFormat must be 'npz' or 'npy'")
+
+        # numpy adds the extension to the NPZ file name
+        if fileFormat == 'npz' and not columnFile.endswith('.npz'):
+            columnFile += '.npz'
+
+        self.columnFile = columnFile
+        self.ballNumber = ballNumber
+        self.fileFormat = fileFormat
+        self.lastFrame = None
+
+        # buffer of every used column
+        pairNumber = ballNumber * (ballNumber - 1) // 2
+        self.buffers = {'frame': ChunkBuffer((), np.int64, chunkSize)}
+        if usePos:
+            self.buffers['pos'] = ChunkBuffer((ballNumber, 2), np.int32, chunkSize)
+        if useRad:
+            self.buffers['rad'] = ChunkBuffer((ballNumber,), np.int32, chunkSize)
+        if useRange and neighborRange:
+            self.buffers['neighborFrame'] = ChunkBuffer((), np.int64, chunkSize)
+            self.buffers['idA'] = ChunkBuffer((), np.int32, chunkSize)
+            self.buffers['idB'] = ChunkBuffer((), np.int32, chunkSize)
+            self.buffers['distance'] = ChunkBuffer((), np.float64, chunkSize)
+        elif useRange:
+            self.buffers['range'] = ChunkBuffer((pairNumber,), np.float64, chunkSize)
+        if useKinematics:
+            self.buffers['velocity'] = ChunkBuffer((ballNumber, 2), np.float64, chunkSize)
+            self.buffers['speed'] = ChunkBuffer((ballNumber,), np.float64, chunkSize)
+            self.buffers['acceleration'] = ChunkBuffer((ballNumber, 2), np.float64, chunkSize)
+        if useTracks:
+            self.buffers['trackFrame'] = ChunkBuffer((), np.int64, chunkSize)
+            self.buffers['trackId'] = ChunkBuffer((), np.int64, chunkSize)
+            self.buffers['trackPos'] = ChunkBuffer((2,), np.float64, chunkSize)
+            self.buffers['trackRad'] = ChunkBuffer((), np.float64, chunkSize)
+            self.buffers['trackCoasting'] = ChunkBuffer((), bool, chunkSize)
+
+    def _add(self, name, frameNumber, row):
+        """ a function to add one row to a column
+
+        :param name: name of the column ('pos', 'rad' or 'range')
+        :type name: str
+        :param frameNumber: current frame number
+        :type frameNumber: int
+        :param row: row value
+        :type row: list
+        :return: None
+        """
+
+        # the column is not used
+        if name not in self.buffers:
+            return
+
+        # add the frame number once for every frame
+        if frameNumber != self.lastFrame:
+            self.buffers['frame'].append(frameNumber)
+            self.lastFrame = frameNumber
+
+        self.buffers[name].append(row)
+
+    def writePos(self, frameNumber, posList):
+        """ a function to write every position of object
+
+        :param frameNumber: current frame number of the position
+        :type frameNumber: int
+        :param posList: list of object position at the current frame number
+        :type posList: list
+        :return: None
+        """
+
+        self._add('pos', frameNumber, posList)
+
+    def writeRad(self, frameNumber, radList):
+        """ a function to write object radius
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param radList: list of object radius
+        :type radList: list
+        :return: None
+        """
+
+        self._add('rad', frameNumber, radList)
+
+    def writeRange(self, frameNumber, rangeBallList):
+        """ a function to write range distance between objects
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param rangeBallList: list of range distance between every objects
+        :type rangeBallList: list
+        :return: None
+        """
+
+        self._add('range', frameNumber, rangeBallList)
+
+    def writeNeighbors(self, frameNumber, idA, idB, distance):
+        """ a function to write range distance of the near objects, one row for every pair
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param idA: identity of the first object of every pair
+        :type idA: numpy.ndarray
+        :param idB: identity of the second object of every pair
+        :type idB: numpy.ndarray
+        :param distance: range distance of every pair
+        :type distance: numpy.ndarray
+        :return: None
+        """
+
+        if 'distance' not in self.buffers:
+            return
+
+        # the pairs have their own frame column, 'frame' belongs to the pos, rad and range rows
+        self.buffers['neighborFrame'].extend(np.full(len(distance), frameNumber))
+        self.buffers['idA'].extend(idA)
+        self.buffers['idB'].extend(idB)
+        self.buffers['distance'].extend(distance)
+
+    def writeKinematics(self, frameNumber, velocity, speed, acceleration):
+        """ a function to write velocity, speed and acceleration of every object
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param velocity: velocity with shape (ballNumber, 2)
+        :type velocity: numpy.ndarray
+        :param speed: speed with shape (ballNumber,)
+        :type speed: numpy.ndarray
+        :param acceleration: acceleration with shape (ballNumber, 2)
+        :type acceleration: numpy.ndarray
+        :return: None
+        """
+
+        self._add('velocity', frameNumber, velocity)
+        self._add('speed', frameNumber, speed)
+        self._add('acceleration', frameNumber, acceleration)
+
+    def writeTracks(self, frameNumber, ids, positions, radii, coasting):
+        """ a function to write every alive track of TrackManager, one row for every track
+
+        :param frameNumber: current frame number of the object
+        :type frameNumber: int
+        :param ids: identity of every track
+        :type ids: numpy.ndarray
+        :param positions: position of every track with shape (N, 2)
+        :type positions: numpy.ndarray
+        :param radii: radius of every track
+        :type radii: numpy.ndarray
+        :param coasting: True if the track is not detected in this frame
+        :type coasting: numpy.ndarray
+        :return: None
+        """
+
+        if 'trackId' not in self.buffers:
+            return
+
+        # the tracks have their own frame column, 'frame' belongs to the pos, rad and range rows
+        self.buffers['trackFrame'].extend(np.full(len(ids), frameNumber))
+        self.buffers['trackId'].extend(ids)
+        self.buffers['trackPos'].extend(positions)
+        self.buffers['trackRad'].extend(radii)
+        self.buffers['trackCoasting'].extend(coasting)
+
+    def flush(self):
+        """ a function to keep the same interface as ResultSink, the columns
+        are only saved when the sink is closed
+
+        :return: None
+        """
+
+        return
+
+    def close(self):
+        """ a function to save every column into the file
+
+        :return: None
+        """
+
+        columns = {name: buffer.array() for name, buffer in self.buffers.items()}
+        columns['ballNumber'] = np.array(self.ballNumber)
+
+        if self.fileFormat == 'npz':
+
+            # one compressed file
+            np.savez_compressed(self.columnFile, **columns)
+
+        else:
+
+            # one NPY file for every column so it can be memory mapped
+            os.makedirs(self.columnFile, exist_ok=True)
+            for name, column in columns.items():
+                np.save(os.path.join(self.columnFile, name + '.npy'), column)
+
+def loadColumns(columnFile, mmap=True):
+    """ a function to load the columns saved by ColumnSink
+
+    :param columnFile: file name of the NPZ file or folder of the NPY files
+    :type columnFile: str
+    :param mmap: if True then the NPY files are opened with memory mapping.
+        Default is True.
+    :type mmap: bool
+    :return: dictionary of column name and array
+    :rtype: dict
+    """
+
+    # folder of NPY files
+    if os.path.isdir(columnFile):
+        mmapMode = 'r' if mmap else None
+        columns = {}
+        for fileName in os.listdir(columnFile):
+            if fileName.endswith('.npy'):
+                columns[fileName[:-4]] = np.load(os.path.join(columnFile, fileName), mmap_mode=mmapMode)
+        return columns
+
+    # compressed NPZ file, the extension may be omitted like in ColumnSink
+    if not os.path.exists(columnFile) and os.path.exists(columnFile + '.npz'):
+        columnFile += '.npz'
+
+    with np.load(columnFile) as data:
+        return {name: data[name] for name in data.files}
+
+def columnsToCSV(columnFile, csvPos=None, csvRad=None, csvRange=None, csvKinematics=None, csvTracks=None):
+    """ a function to convert the columns saved by ColumnSink into the CSV
+    files written by ResultSink
+
+    :param columnFile: file name of the NPZ file or folder of the NPY files
+    :type columnFile: str
+    :param csvPos: file name of the position CSV file, None if not written
+    :type csvPos: str
+    :param csvRad: file name of the radius CSV file, None if not written
+    :type csvRad: str
+    :param csvRange: file name of the range CSV file, None if not written
+    :type csvRange: str
+    :param csvKinematics: file name of the velocity, speed and acceleration
+        CSV file, None if not written
+    :type csvKinematics: str
+    :param csvTracks: file name of the TrackManager CSV file, None if not written
+    :type csvTracks: str
+    :return: None
+    """
+
+    columns = loadColumns(columnFile)
+    ballNumber = int(columns['ballNumber'])
+    sink = ResultSink(csvPos if 'pos' in columns else None,
+                      csvRad if 'rad' in columns else None,
+                      csvRange if 'range' in columns or 'distance' in columns else None,
+                      ballNumber,
+                      csvKinematics=csvKinematics if 'velocity' in columns else None,
+                      neighborRange='distance' in columns,
+                      csvTracks=csvTracks if 'trackId' in columns else None)
+
+    frames = columns['frame'].tolist()
+
+    # write the column in chunks so the memory mapped file is not loaded at once
+    for first in range(0, len(frames), sink.flushSize):
+        last = first + sink.flushSize
+        if 'pos' in columns:
+            for frameNumber, posList in zip(frames[first:last], columns['pos'][first:last].tolist()):
+                sink.writePos(frameNumber, posList)
+        if 'rad' in columns:
+            for frameNumber, radList in zip(frames[first:last], columns['rad'][first:last].tolist()):
+                sink.writeRad(frameNumber, radList)
+        if 'range' in columns:
+            for frameNumber, rangeBallList in zip(frames[first:last], columns['range'][first:last].tolist()):
+                sink.writeRange(frameNumber, rangeBallList)
+        if 'velocity' in columns:
+            for k, frameNumber in enumerate(frames[first:last], first):
+                sink.writeKinematics(frameNumber, columns['velocity'][k], columns['speed'][k],
+                                     columns['acceleration'][k])
+
+    # the near pairs of every frame
+    if 'distance' in columns and len(columns['distance']) > 0:
+        neighborFrame = np.asarray(columns['neighborFrame'])
+        bounds = np.flatnonzero(np.diff(neighborFrame)) + 1
+        for first, last in zip(np.r_[0, bounds], np.r_[bounds, len(neighborFrame)]):
+            sink.writeNeighbors(int(neighborFrame[first]), columns['idA'][first:last],
+                                columns['idB'][first:last], columns['distance'][first:last])
+
+    # the alive tracks of every frame
+    if 'trackId' in columns and len(columns['trackId']) > 0:
+        trackFrame = np.asarray(columns['trackFrame'])
+        bounds = np.flatnonzero(np.diff(trackFrame)) + 1
+        for first, last in zip(np.r_[0, bounds], np.r_[bounds, len(trackFrame)]):
+            sink.writeTracks(int(trackFrame[first]), columns['trackId'][first:last],
+                             columns['trackPos'][first:last], columns['trackRad'][first:last],
+                             columns['trackCoasting'][first:last])
+
+    sink.close()
+
+def openResultSink(offsets=None):
+    """ a function to open the result sink of the CSV files or the columnar
+    file based on the flags
+
+    :param offsets: offset of every CSV file of a stopped run. Default is
+        None, the files are initialized.
+    :type offsets: dict
+    :return: result sink of the used output
+    :rtype: ResultSink or ColumnSink
+    """
+
+    # check output format setting
+    if outputFormat != 'csv':
+        return ColumnSink(columnFile, ballNumber, getPositionBall == True,
+                          getRadiusBall == True, getRangeBall == True, outputFormat,
+                          useKinematics=getKinematicsBall == True, neighborRange=rangeMode == 'neighbor',
+                          useTracks=manageTracks == True)
+
+    return ResultSink(csvPosFile if getPositionBall == True else None,
+                      csvRadFile if getRadiusBall == True else None,
+                      csvRangeBallFile if getRangeBall == True else None,
+                      ballNumber, csvFlushSize,
+                      csvKinematicsFile if getKinematicsBall == True else None, offsets,
+                      rangeMode == 'neighbor', csvTrackFile if manageTracks == True else None)
+
+class SnapshotWriter:
+    """ a class to write JPEG images in a pool of threads
+
+    The image is copied and put into a bounded queue, the threads encode and
+    write it, so cv2.imwrite does not stop the detection loop. If the queue
+    is full, policy 'block' waits for a free place and policy 'drop-oldest'
+    removes the oldest image that is waiting in the queue.
+    """
+
+    def __init__(self, workerNumber=2, queueSize=16, policy='block'):
+        """
+        :param workerNumber: number of writer threads. Default is 2.
+        :type workerNumber: int
+        :param queueSize: maximum number of image waiting in the queue.
+            Default is 16.
+        :type queueSize: int
+        :param policy: 'block' or 'drop-oldest'. Default is 'block'.
+        :type policy: str
+        """
+
+        if policy not in ('block', 'drop-oldest'):
+            raise ValueError("policy must be 'block' or 'drop-oldest'")
+
+        self.queueSize = max(1, queueSize)
+        self.policy = policy
+        self.jobs = collections.deque()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.written = 0
+        self.dropped = 0
+
+        # start the writer threads
+        self.threads = [threading.Thread(target=self._work, daemon=True)
+                        for i in range(max(1, workerNumber))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, image, filename):
+        """ a function to put an image into the queue
+
+        :param image: OpenCV variable that contain image matrix
+        :type image: img
+        :param filename: file name of the JPEG image
+        :type filename: str
+        :return: None
+        """
+
+        # copy the image because the frame is still changed by the loop
+        image = image.copy()
+
+        with self.condition:
+
+            # the queue is full
+            while len(self.jobs) >= self.queueSize:
+                if self.policy == 'drop-oldest':
+                    self.jobs.popleft()
+                    self.dropped += 1
+                else:
+                    self.condition.wait()
+
+            self.jobs.append((filename, image))
+            self.condition.notify_all()
+
+    def _work(self):
+        """ a function that run in every writer thread
+
+        :return: None
+        """
+
+        while True:
+            with self.condition:
+
+                # wait for an image or until the writer is closed
+                while not self.jobs and not self.closed:
+                    self.condition.wait()
+
+                # stop only after the queue is drained
+                if not self.jobs:
+                    return
+
+                filename, image = self.jobs.popleft()
+                self.condition.notify_all()
+
+            tick = profiler.start()
+            cv2.imwrite(filename, image)
+            profiler.stop('jpeg', tick)
+
+            with self.condition:
+                self.written += 1
+
+    def close(self):
+        """ a function to write every image in the queue and stop the threads
+
+        :return: None
+        """
+
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+        for thread in self.threads:
+            thread.join()
+
+def startSnapshotWriter():
+    """ a function to start the snapshot writer if asyncSnapshot flag is True
+
+    :return: None
+    """
+
+    global snapshotWriter
+
+    if asyncSnapshot == True and snapshotWriter is None:
+        snapshotWriter = SnapshotWriter(snapshotWorkers, snapshotQueueSize, snapshotPolicy)
+
+def stopSnapshotWriter():
+    """ a function to write every waiting image and stop the snapshot writer
+
+    :return: None
+    """
+
+    global snapshotWriter
+
+    if snapshotWriter is not None:
+        snapshotWriter.close()
+
+        # report the dropped image
+        if snapshotWriter.dropped > 0:
+            print("snapshot: %d written, %d dropped" % (snapshotWriter.written, snapshotWriter.dropped))
+
+        snapshotWriter = None
+
+def startProfiler():
+    """ a function to start recording the stage latency if profileRun flag is True
+
+    :return: None
+    """
+
+    global profiler
+
+    if profileRun == True:
+        profiler = StageProfiler()
+
+def stopProfiler():
+    """ a function to write the profiling report and stop recording
+
+    :return: None
+    """
+
+    global profiler
+
+    if isinstance(profiler, StageProfiler):
+        profiler.save(profileReportFile)
+        print("profile report: " + profileReportFile + ".json")
+
+    profiler = NullProfiler()
+
+def isSnapshotFrame(printFlag, frameNumber):
+    """ a function to check whether an image is printed at the current frame
+
+    :param printFlag: print flag of the image (printRaw, printHSV, ...)
+    :type printFlag: bool
+    :param frameNumber: current frame number
+    :type frameNumber: int
+    :return: True if the image is printed at the current frame
+    :rtype: bool
+    """
+
+    return printFlag == True and frameNumber % Interval == 0
+
+def needAnnotation(frameNumber, showFrame, render=None):
+    """ a function to check whether the result image of the current frame is
+    used by some output, so the circle and ID must be drawn
+
+    :param frameNumber: current frame number
+    :type frameNumber: int
+    :param showFrame: if True then the frame is shown in a window
+    :type showFrame: bool
+    :param render: video writer of the result video. Default is None.
+    :type render: cv2.VideoWriter
+    :return: True if the frame must be annotated
+    :rtype: bool
+    """
+
+    return showFrame == True or render is not None or isSnapshotFrame(printResult, frameNumber)
+
+def countSavedWork(name, number=1):
+    """ a function to count the work that is skipped because no output uses it
+
+    The name says what is counted: a call, a file name string, a contour,
+    a decoded or detected frame. The images are drawn in place and the JPEG
+    files are only written at the interval, so no image copy or JPEG encode
+    is counted.
+
+    :param name: name of the skipped work
+    :type name: str
+    :param number: number of skipped work. Default is 1.
+    :type number: int
+    :return: None
+    """
+
+    if number == 0:
+        return
+
+    with savedWorkLock:
+        savedWork[name] += number
+
+def reportSavedWork():
+    """ a function to print and reset the counter of the skipped work
+
+    :return: None
+    """
+
+    with savedWorkLock:
+        if savedWork:
+            print("skipped work: " + ", ".join(
+                "%s %d" % (name, number) for name, number in sorted(savedWork.items())))
+        savedWork.clear()
+
+class HoughCache:
+    """ a class to keep the hough transform result of the merged contours
+
+    The circles of a contour above the radius treshold are kept with its
+    bounding rectangle and a signature (8x8 average of the grayscale ROI).
+    When a contour in a later frame has almost the same rectangle and
+    signature, the circles are used again relative to the new rectangle
+    after their centers are checked to be inside the contour, so the hough
+    transform only runs when the merged objects change. The cache keeps at
+    most cacheSize entries and an entry is removed after maxAge frames, so
+    the circles are refreshed regularly.
+    """
+
+    def __init__(self, cacheSize=16, maxAge=30, shift=4, tolerance=8):
+        """
+        :param cacheSize: maximum number of entry. Default is 16.
+        :type cacheSize: int
+        :param maxAge: number of frame before an entry is removed.
+            Default is 30.
+        :type maxAge: int
+        :param shift: maximum change in pixel of the rectangle position and
+            size. Default is 4.
+        :type shift: int
+        :param tolerance: maximum mean absolute difference of the
+            signature. Default is 8.
+        :type tolerance: float
+        """
+
+        self.cacheSize = max(1, cacheSize)
+        self.maxAge = maxAge
+        self.shift = shift
+        self.tolerance = tolerance
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.nextKey = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def signature(roiGray):
+        """ a function to get the appearance signature of a grayscale ROI image
+
+        :param roiGray: grayscale ROI image
+        :type roiGray: img
+        :return: 8x8 average of the image
+        :rtype: numpy.ndarray
+        """
+
+        # crop to a multiple of 8 pixel, the integer scale resize is much faster
+        h, w = roiGray.shape
+        return cv2.resize(roiGray[:h - h % 8, :w - w % 8], (8, 8), interpolation=cv2.INTER_AREA)
+
+    def lookup(self, box, signature, frameNumber, contour):
+        """ a function to get the circles of a similar contour
+
+        :param box: bounding rectangle (x, y, w, h) of the contour
+        :type box: tuple
+        :param signature: signature of the grayscale ROI image
+        :type signature: numpy.ndarray
+        :param frameNumber: current frame number
+        :type frameNumber: int
+        :param contour: the contour, to check the circle centers
+        :type contour: numpy.ndarray
+        :return: True and the circles (None if no circle) relative to the
+            rectangle, or False and None if there is no similar contour
+        :rtype: tuple
+        """
+
+        x, y, w, h = box
+
+        with self.lock:
+
+            # remove the old entries
+            for key in [key for key, entry in self.entries.items()
+                        if abs(frameNumber - entry[3]) > self.maxAge]:
+                del self.entries[key]
+
+            for key, (oldBox, oldSignature, circles, bornFrame) in self.entries.items():
+
+                # the rectangle must barely move and change its size
+                if (abs(x - oldBox[0]) > self.shift or abs(y - oldBox[1]) > self.shift
+                        or abs(w - oldBox[2]) > self.shift or abs(h - oldBox[3]) > self.shift):
+                    continue
+
+                # the appearance must be almost the same
+                if cv2.norm(signature, oldSignature, cv2.NORM_L1) > self.tolerance * 64:
+                    continue
+
+                # every circle center must still be inside the contour
+                if circles is not None and any(
+                        cv2.pointPolygonTest(contour, (float(i[0]) + x, float(i[1]) + y), False) < 0
+                        for i in circles[0, :]):
+                    continue
+
+                # move the entry to the end, it is used recently
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, circles
+
+            self.misses += 1
+            return False, None
+
+    def store(self, box, signature, circles, frameNumber):
+        """ a function to keep the circles of a contour
+
+        :param box: bounding rectangle (x, y, w, h) of the contour
+        :type box: tuple
+        :param signature: signature of the grayscale ROI image
+        :type signature: numpy.ndarray
+        :param circles: result of the hough transform relative to the rectangle
+        :type circles: numpy.ndarray
+        :param frameNumber: current frame number
+        :type frameNumber: int
+        :return: None
+        """
+
+        with self.lock:
+            self.entries[self.nextKey] = (box, signature, circles, frameNumber)
+            self.nextKey += 1
+
+            # remove the least recently used entry
+            while len(self.entries) > self.cacheSize:
+                self.entries.popitem(last=False)
+
+def startHoughCache():
+    """ a function to start keeping the hough transform result if houghCaching flag is True
+
+    :return: None
+    """
+
+    global houghCache
+
+    if houghCaching == True:
+        houghCache = HoughCache(houghCacheSize, houghCacheAge, houghCacheShift, houghCacheTolerance)
+
+def stopHoughCache():
+    """ a function to count the reused hough transform result and stop the cache
+
+    :return: None
+    """
+
+    global houghCache
+
+    if houghCache is not None:
+        countSavedWork('hough cached', houghCache.hits)
+        profiler.count('houghCacheHit', houghCache.hits)
+        profiler.count('houghCacheMiss', houghCache.misses)
+
+    houghCache = None
+
+class FrameBuffers:
+    """ a class to keep the image buffers of one thread
+
+    Every buffer has a name and grows to the largest shape that is asked,
+    a smaller shape is a view of its top-left corner. The views are passed
+    as dst to OpenCV, so the images of every frame are written into the same
+    memory instead of new arrays.
+    """
+
+    def __init__(self):
+        self.buffers = {}
+
+    def take(self, name, shape, dtype=np.uint8):
+        """ a function to get a buffer with the shape
+
+        :param name: name of the buffer, for example 'hsv' or 'mask'
+        :type name: str
+        :param shape: shape of the image (height, width) or (height, width, channel)
+        :type shape: tuple
+        :param dtype: data type of the buffer. Default is numpy.uint8.
+        :type dtype: numpy.dtype
+        :return: view of the buffer with the shape
+        :rtype: numpy.ndarray
+        """
+
+        buffer = self.buffers.get(name)
+
+        # allocate a larger buffer if the shape does not fit
+        if (buffer is None or buffer.ndim != len(shape) or buffer.dtype != dtype
+                or any(a < b for a, b in zip(buffer.shape, shape))):
+            if buffer is not None and buffer.ndim == len(shape):
+                shape = tuple(max(a, b) for a, b in zip(buffer.shape, shape))
+            buffer = np.empty(shape, dtype)
+            self.buffers[name] = buffer
+
+        return buffer[tuple(slice(0, n) for n in shape)]
+
+def frameBuffers():
+    """ a function to get the image buffers of the current thread
+
+    :return: buffers of the current thread
+    :rtype: FrameBuffers
+    """
+
+    buffers = getattr(threadBuffers, 'buffers', None)
+    if buffers is None:
+        buffers = threadBuffers.buffers = FrameBuffers()
+    return buffers
+
+def scratchBuffer(name, shape):
+    """ a function to get a preallocated destination image if reuseBuffers flag is True
+
+    :param name: name of the buffer
+    :type name: str
+    :param shape: shape of the image
+    :type shape: tuple
+    :return: view of the buffer, or None so OpenCV allocates a new image
+    :rtype: numpy.ndarray
+    """
+
+    if reuseBuffers == False:
+        return None
+    return frameBuffers().take(name, shape)
+
+def readFrame(capture):
+    """ a function to read the next frame, into the same buffer if reuseBuffers flag is True
+
+    The frame is only valid until the next call in the same thread.
+
+    :param capture: opened video
+    :type capture: cv2.VideoCapture
+    :return: ret and frame like capture.read()
+    :rtype: tuple
+    """
+
+    if reuseBuffers == False:
+        return capture.read()
+
+    # read into the frame of the last call, OpenCV allocates it if the size changes
+    buffers = frameBuffers()
+    ret, frame = capture.read(buffers.buffers.get('read'))
+    if ret == True:
+        buffers.buffers['read'] = frame
+    return ret, frame
+
+def resizeFrame(frame, reuse=True):
+    """ a function to resize the frame to frameWidth x frameHeigth
+
+    The frame is returned as it is if it has the size already, otherwise it
+    is resized into a preallocated buffer if reuseBuffers flag is True.
+
+    :param frame: image read from the video
+    :type frame: img
+    :param reuse: False if the resized frame is kept after the next call,
+        for example by another thread. Default is True.
+    :type reuse: bool
+    :return: resized image
+    :rtype: img
+    """
+
+    if frame.shape[1] == frameWidth and frame.shape[0] == frameHeigth:
+        return frame
+
+    dst = None
+    if reuse == True:
+        dst = scratchBuffer('frame', (frameHeigth, frameWidth) + frame.shape[2:])
+    return cv2.resize(frame, (frameWidth,frameHeigth), dst)
+
+def findBallContours(frame, frameNumber, windows=None):
+    """ a function to find the contours of the object color in a frame
+
+    If windows is None, the whole frame is converted to HSV, filtered and
+    searched, and the HSV and filtered image are printed per interval.
+    Otherwise only the inside of every window is searched and the contours
+    are returned in frame coordinate.
+
+    :param frame: resized image of the current frame
+    :type frame: img
+    :param frameNumber: current frame number
+    :type frameNumber: int
+    :param windows: list of search window (x1, y1, x2, y2). Default is None.
+    :type windows: list
+    :return: list of contour and hierarchy array with shape (N, 4)
+    :rtype: tuple
+    """
+
+    # search only inside the windows
+    if windows is not None:
+        contours = []
+        hierarchies = []
+        for x1, y1, x2, y2 in windows:
+
+            # convert color space, filter and find contours inside the window
+            tick = profiler.start()
+            HSV = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2HSV,
+                               scratchBuffer('hsv', (y2 - y1, x2 - x1, 3)))
+            profiler.stop('cvtColor', tick)
+            tick = profiler.start()
+            filtered = cv2.inRange(HSV,lowerTreshold,upperTreshold, scratchBuffer('mask', (y2 - y1, x2 - x1)))
+            profiler.stop('inRange', tick)
+            tick = profiler.start()
+            found, hierrarchy = cv2.findContours(filtered, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE,
+                                                 offset=(x1, y1))
+            profiler.stop('findContours', tick)
+
+            # shift the hierarchy index after the contours of the previous windows
+            if hierrarchy is not None:
+                hierrarchy = hierrarchy[0].copy()
+                hierrarchy[hierrarchy >= 0] += len(contours)
+                hierarchies.append(hierrarchy)
+            contours += found
+
+        profiler.addValue('contours', len(contours))
+        if hierarchies:
+            return contours, np.concatenate(hierarchies)
+        return contours, None
+
+    # convert color space from RGB to HSV
+    tick = profiler.start()
+    HSV = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, scratchBuffer('hsv', frame.shape))
+    profiler.stop('cvtColor', tick)
+
+    # check if HSV image is printed at this frame
+    if isSnapshotFrame(printHSV, frameNumber):
+
+        # printing HSV image
+        printImage2JPG(HSV, folderNameHSV, frameNumber, Interval)
+
+    # the old loop built the file name in every frame while the flag is on
+    elif printHSV == True:
+        countSavedWork('hsv file name string')
+
+    # filter image based on color treshold
+    tick = profiler.start()
+    filtered = cv2.inRange(HSV,lowerTreshold,upperTreshold, scratchBuffer('mask', frame.shape[:2]))
+    profiler.stop('inRange', tick)
+
+    # check if filtered image is printed at this frame
+    if isSnapshotFrame(printFiltered, frameNumber):
+
+        # Printing filtered image
+        printImage2JPG(filtered, folderNameFiltered, frameNumber, Interval)
+
+    # the old loop built the file name in every frame while the flag is on
+    elif printFiltered == True:
+        countSavedWork('filtered file name string')
+
+    # find contours in filtered image
+    tick = profiler.start()
+    contours, hierrarchy = cv2.findContours(filtered, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    profiler.stop('findContours', tick)
+    profiler.addValue('contours', len(contours))
+
+    if hierrarchy is not None:
+        return contours, hierrarchy[0]
+    return contours, None
+
+def prefilterContours(contours, hierarchy):
+    """ a function to remove the contours that can not be an object before
+    any per contour geometry is calculated
+
+    The bounding rectangle, area and centroid of every contour are
+    calculated at once with NumPy from the contour points (shoelace
+    formula). A contour is removed if it is a hole (odd level in the
+    RETR_TREE hierarchy), if its bounding rectangle is too small to hold a
+    circle with radius above minBallRadius, or if its area is below
+    minContourAreaFactor times the area of the smallest object. The number
+    of removed contour of every step is counted in savedWork.
+
+    :param contours: list of contour from findBallContours
+    :type contours: list
+    :param hierarchy: hierarchy array with shape (N, 4), None if not known
+    :type hierarchy: numpy.ndarray
+    :return: list of kept contour, array of their area and array of their
+        centroid (x, y)
+    :rtype: tuple
+    """
+
+    if len(contours) == 0:
+        return [], np.zeros(0), np.zeros((0, 2))
+
+    keep = np.ones(len(contours), dtype=bool)
+
+    # level of every contour in the hierarchy, the odd level is a hole
+    if hierarchy is not None:
+        parent = hierarchy[:, 3]
+        level = np.zeros(len(contours), dtype=np.int64)
+        current = parent.copy()
+        while np.any(current >= 0):
+            inside = current >= 0
+            level[inside] += 1
+            current[inside] = parent[current[inside]]
+        hole = (level % 2) == 1
+        countSavedWork('contour pruned by hierarchy', int(np.sum(hole & keep)))
+        keep &= ~hole
+
+    # every point of every contour in one array
+    lengths = np.array([len(cnt) for cnt in contours])
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    points = np.concatenate([cnt.reshape(-1, 2) for cnt in contours]).astype(np.float64)
+
+    # bounding rectangle of every contour
+    low = np.minimum.reduceat(points, starts, axis=0)
+    high = np.maximum.reduceat(points, starts, axis=0)
+    size = high - low + 1
+
+    # the enclosing circle radius is at most half of the rectangle diagonal
+    small = np.hypot(size[:, 0], size[:, 1]) / 2 < minBallRadius + 1
+    countSavedWork('contour pruned by size', int(np.sum(small & keep)))
+    keep &= ~small
+
+    # area and centroid of the contour polygon (shoelace formula)
+    nextIndex = np.arange(len(points)) + 1
+    nextIndex[starts + lengths - 1] = starts
+    x, y = points[:, 0], points[:, 1]
+    nextX, nextY = x[nextIndex], y[nextIndex]
+    cross = x * nextY - nextX * y
+    signedArea = np.add.reduceat(cross, starts) / 2
+    area = np.abs(signedArea)
+
+    thin = area < minContourAreaFactor * math.pi * minBallRadius ** 2
+    countSavedWork('contour pruned by area', int(np.sum(thin & keep)))
+    keep &= ~thin
+
+    # centroid of the kept contours
+    index = np.nonzero(keep)[0]
+    centroidX = np.add.reduceat((x + nextX) * cross, starts)[index] / (6 * signedArea[index])
+    centroidY = np.add.reduceat((y + nextY) * cross, starts)[index] / (6 * signedArea[index])
+
+    return [contours[k] for k in index], area[index], np.stack([centroidX, centroidY], axis=1)
+
+def measureContours(frame, contours, hierarchy=None, frameNumber=0):
+    """ a function to get the center and radius of every object from the contours
+
+    A contour with radius inside the radius treshold is one object. A
+    contour above the radius treshold can contain several touching objects,
+    so the circles are searched with hough transform inside its bounding
+    rectangle.
+
+    If contourPrefilter flag is True, the contours are filtered first by
+    prefilterContours. If houghAreaCircle flag is also True, the hough
+    transform only runs on a contour with area of at least houghAreaFactor
+    objects. A smaller contour above the radius treshold (an object with
+    some noise attached) is measured from its area and centroid instead,
+    which is faster but moves the position by a few pixel.
+
+    If houghCaching flag is True, the hough transform result of a merged
+    contour is used again while the contour barely changes (HoughCache).
+
+    :param frame: resized image of the current frame
+    :type frame: img
+    :param contours: list of contour in frame coordinate
+    :type contours: list
+    :param hierarchy: hierarchy array with shape (N, 4). Default is None.
+    :type hierarchy: numpy.ndarray
+    :param frameNumber: current frame number, the age of the hough cache.
+        Default is 0.
+    :type frameNumber: int
+    :return: list of object position, list of object radius, number of
+        detected object and list of circle (center, radius) to draw
+    :rtype: tuple
+    """
+
+    # variable that count number object detected
+    ballCount = 0
+    newPos = []             # Initialize new object position list
+    radList = []            # Initialize object radius list
+    circleList = []         # Initialize list of circle that will be drawn
+    loopTick = profiler.start()
+
+    # check contour prefilter flag
+    areaList = None
+    houghMinArea = None
+    if contourPrefilter == True:
+
+        # remove the contours that can not be an object
+        tick = profiler.start()
+        contours, areaList, centroidList = prefilterContours(contours, hierarchy)
+        profiler.stop('prefilter', tick)
+
+        # minimum area of a contour that can contain several objects
+        if houghAreaCircle == True:
+            houghMinArea = houghAreaFactor * math.pi * minBallRadius ** 2
+
+    # for every contour detected
+    for k, cnt in enumerate(contours):
+
+        # find minimum enclosing circle
+        (x,y) , radius = cv2.minEnclosingCircle(cnt)
+
+        # get the center value
+        center = (int(x), int(y))
+
+        # get the radius value
+        radius = int(radius)
+
+        # if radius is inside of radius treshold
+        if radius < maxBallRadius and radius > minBallRadius :
+
+            # keep the circle surrounding the object for drawing
+            circleList.append((center, radius))
+
+            # insert center position to newPos list
+            newPos.append([int(x),int(y)])
+
+            # insert object radius to radList list
+            radList.append(radius)
+
+            # increase the ballCount by 1
+            ballCount += 1
+
+        # if contour radius above the radius treshold
+        elif radius >= 65 :
+
+            # a contour too small for several objects is measured from its area
+            if houghMinArea is not None and areaList[k] < houghMinArea:
+                countSavedWork('hough skipped')
+
+                # radius of the circle with the same area
+                radius = int(math.sqrt(areaList[k] / math.pi))
+                if radius < maxBallRadius and radius > minBallRadius :
+                    center = (int(centroidList[k][0]), int(centroidList[k][1]))
+                    circleList.append((center, radius))
+                    newPos.append(list(center))
+                    radList.append(radius)
+                    ballCount += 1
+                continue
+
+            # count the hough transform
+            profiler.count('hough')
+            tick = profiler.start()
+
+            # find a bounding rectangle
+            x, y, w, h = cv2.boundingRect(cnt)      # (x,y) equal to bottom-left point, w = width, h = height
+
+            # get Region of Interest (ROI) image within the bounding rectangle
+            roiFrame = frame[y:y+h,x:x+w]
+
+            # convert the color space of ROI image from RGB to Grayscale
+            roiGray = cv2.cvtColor(roiFrame, cv2.COLOR_BGR2GRAY, scratchBuffer('gray', (h, w)))
+
+            # use the circles of a similar contour in the previous frames
+            cached = False
+            if houghCache is not None:
+                box = (x, y, w, h)
+                signature = HoughCache.signature(roiGray)
+                cached, circles = houghCache.lookup(box, signature, frameNumber, cnt)
+
+            if cached == False:
+
+                # apply median blur to Grayscale ROI image
+                roiGray = cv2.medianBlur(roiGray, 5, scratchBuffer('blur', (h, w)))
+
+                # find circle shape in Grayscale ROI image using hough transform
+                circles = cv2.HoughCircles(roiGray, cv2.HOUGH_GRADIENT, 1,
+                                           minDistance, None, 50, 30,
+                                           minBallRadius, maxBallRadius)
+
+                # keep the circles for the next frames
+                if houghCache is not None:
+                    houghCache.store(box, signature, circles, frameNumber)
+            profiler.stop('hough', tick)
+
+            # if there is circle found
+            if circles is not None :
+
+                # change the type value to UINT16 and round it up, the circles of
+                # the hough cache are shared so they are not rounded in place
+                circles = np.around(circles).astype(np.uint16)
+
+                # for every circle detected
+                for i in circles[0,:] :
+
+                    # keep the circle surrounding the object for drawing
+                    circleList.append(((int(i[0])+x, int(i[1])+y), int(i[2])))
+
+                    # insert center position to newPos list
+                    newPos.append([i[0]+x, i[1]+y])
+
+                    # insert object radius to radList list
+                    radList.append(i[2])
+
+                    # increase ballCount value by 1
+                    ballCount += 1
+
+    # the contour loop including the hough transform
+    profiler.stop('contourLoop', loopTick)
+
+    return newPos, radList, ballCount, circleList
+
+def predictWindows(oldPos, prevPos, padding):
+    """ a function to get the search window of every object in the next frame
+
+    The next position of every object is predicted with constant velocity
+    from the sorted position of the last two frames. The window is the
+    predicted position plus the maximum radius, the padding and the
+    distance moved in the last frame. Overlapping windows are merged so an
+    object is not found twice.
+
+    :param oldPos: list of sorted object position in the last frame
+    :type oldPos: list
+    :param prevPos: list of sorted object position in the frame before the
+        last frame, empty if it is not known
+    :type prevPos: list
+    :param padding: extra size of the window in pixel
+    :type padding: int
+    :return: list of search window (x1, y1, x2, y2), None if there is no
+        position to predict from
+    :rtype: list
+    """
+
+    if not oldPos:
+        return None
+
+    last = np.asarray(oldPos, dtype=np.float64).reshape(-1, 2)
+
+    # constant velocity prediction, no velocity if the previous frame is not known
+    if len(prevPos) == len(oldPos):
+        velocity = last - np.asarray(prevPos, dtype=np.float64).reshape(-1, 2)
+    else:
+        velocity = np.zeros_like(last)
+
+    predicted = last + velocity
+    size = maxBallRadius + padding + np.hypot(velocity[:, 0], velocity[:, 1])
+
+    # window of every object, clipped to the frame
+    x1 = np.clip(predicted[:, 0] - size, 0, frameWidth).astype(int)
+    y1 = np.clip(predicted[:, 1] - size, 0, frameHeigth).astype(int)
+    x2 = np.clip(predicted[:, 0] + size + 1, 0, frameWidth).astype(int)
+    y2 = np.clip(predicted[:, 1] + size + 1, 0, frameHeigth).astype(int)
+
+    return mergeWindows(zip(x1, y1, x2, y2))
+
+def mergeWindows(windows):
+    """ a function to merge the overlapping search windows
+
+    :param windows: list of search window (x1, y1, x2, y2)
+    :type windows: list
+    :return: list of search window where no window overlaps another, empty
+        windows are removed
+    :rtype: list
+    """
+
+    windows = [list(window) for window in windows]
+
+    # merge the overlapping windows until no window overlaps
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(windows)):
+            for j in range(i + 1, len(windows)):
+                a, b = windows[i], windows[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    windows[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del windows[j]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    return [tuple(int(v) for v in window) for window in windows if window[2] > window[0] and window[3] > window[1]]
+
+def findCoarseWindows(frame, scale):
+    """ a function to find the search windows of the object on a downscaled frame
+
+    The frame is downscaled by scale, converted to HSV, filtered and its
+    outer contours are searched. Every contour whose radius in full
+    resolution can still be an object (radius times scale above the minimum
+    radius minus the rounding of the downscale) becomes a full resolution
+    window around its bounding rectangle, so the center and radius can be
+    measured again at full resolution.
+
+    :param frame: resized image of the current frame
+    :type frame: img
+    :param scale: downscale factor, for example 2 or 4
+    :type scale: int
+    :return: list of search window (x1, y1, x2, y2) in full resolution
+    :rtype: list
+    """
+
+    height, width = frame.shape[:2]
+
+    # downscale, convert color space and filter the small frame
+    tick = profiler.start()
+    smallShape = (height // scale, width // scale)
+    small = cv2.resize(frame, smallShape[::-1], scratchBuffer('small', smallShape + (3,)),
+                       interpolation=cv2.INTER_AREA)
+    HSV = cv2.cvtColor(small, cv2.COLOR_BGR2HSV, scratchBuffer('smallHSV', smallShape + (3,)))
+    filtered = cv2.inRange(HSV,lowerTreshold,upperTreshold, scratchBuffer('smallMask', smallShape))
+    contours, hierrarchy = cv2.findContours(filtered, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    profiler.stop('coarse', tick)
+
+    # padding for the rounding of the downscale
+    padding = 2 * scale
+    windows = []
+
+    for cnt in contours:
+
+        # skip the contour that is too small to be an object at full resolution
+        (x, y), radius = cv2.minEnclosingCircle(cnt)
+        if radius * scale <= minBallRadius - scale:
+            continue
+
+        # window around the bounding rectangle in full resolution
+        x, y, w, h = cv2.boundingRect(cnt)
+        windows.append((max(0, x * scale - padding), max(0, y * scale - padding),
+                        min(width, (x + w) * scale + padding), min(height, (y + h) * scale + padding)))
+
+    return mergeWindows(windows)
+
+def detectBall(frame, frameNumber, annotate=True, windows=None):
+    """ a function to detect every object in one frame
+
+    This function prints the raw, HSV and filtered image per interval and
+    draws a circle surrounding every detected object in the frame. It does
+    not depend on the previous frame, so it can be called for several frames
+    at the same time. The circles are drawn after every object is detected,
+    so the drawing does not change the image used by the hough transform.
+
+    If search windows are given, only the inside of the windows is searched.
+    If coarseScale is above 1, the windows are found on a downscaled frame
+    (findCoarseWindows). When the number of detected object is not
+    ballNumber, the next search is tried (windows, coarse, whole frame).
+    When the HSV or filtered image is printed at this frame, the whole frame
+    is searched.
+
+    :param frame: resized image of the current frame
+    :type frame: img
+    :param frameNumber: current frame number
+    :type frameNumber: int
+    :param annotate: if True then the circles are drawn in the frame.
+        Default is True.
+    :type annotate: bool
+    :param windows: list of search window (x1, y1, x2, y2) from
+        predictWindows. Default is None.
+    :type windows: list
+    :return: list of object position, list of object radius and number of
+        detected object
+    :rtype: tuple
+    """
+
+    # check if raw image is printed at this frame
+    if isSnapshotFrame(printRaw, frameNumber):
+
+        # printing raw image
+        printImage2JPG(frame, folderNameRaw, frameNumber, Interval)
+
+    # the old loop built the file name in every frame while the flag is on
+    elif printRaw == True:
+        countSavedWork('raw file name string')
+
+    # list of search that is tried before the whole frame
+    searches = []
+
+    # the printed HSV and filtered image need the whole frame
+    if not (isSnapshotFrame(printHSV, frameNumber) or isSnapshotFrame(printFiltered, frameNumber)):
+        if windows is not None:
+            searches.append('roi')
+        if coarseScale > 1:
+            searches.append('coarse')
+
+    found = False
+    for search in searches:
+
+        # find the object inside the search windows
+        if search == 'coarse':
+            windows = findCoarseWindows(frame, coarseScale)
+        contours, hierarchy = findBallContours(frame, frameNumber, windows)
+        newPos, radList, ballCount, circleList = measureContours(frame, contours, hierarchy, frameNumber)
+
+        # stop if every object is found, otherwise try the next search
+        if ballCount == ballNumber:
+            profiler.count(search + 'Frame')
+            found = True
+            break
+        profiler.count(search + 'Fallback')
+
+    # find the object in the whole frame
+    if not found:
+        contours, hierarchy = findBallContours(frame, frameNumber)
+        newPos, radList, ballCount, circleList = measureContours(frame, contours, hierarchy, frameNumber)
+
+    # check if the result image is used
+    if annotate == True:
+
+        # draw circle surrounding every object
+        for center, radius in circleList:
+            cv2.circle(frame, center, radius, boundColor, 2)
+
+    else:
+        countSavedWork('circle drawing call')
+
+    return newPos, radList, ballCount
+
+def saveFrameResult(frame, frameNumber, oldPos, newPos, radList, ballCount, render=None, sink=None,
+                    annotate=True, kinematics=None, tracks=None, tracked=False):
+    """ a function to track the detected object and save the result of one frame
+
+    This function must be called in frame order because the identity of the
+    object depends on the previous frame. It writes the ID to the frame,
+    writes the CSV files, prints the result image and writes the frame to
+    the result video.
+
+    :param frame: image of the current frame that has been processed by detectBall
+    :type frame: img
+    :param frameNumber: current frame number
+    :type frameNumber: int
+    :param oldPos: list of sorted object position in the previous frame
+    :type oldPos: list
+    :param newPos: list of object position in the current frame
+    :type newPos: list
+    :param radList: list of object radius in the current frame
+    :type radList: list
+    :param ballCount: number of detected object in the current frame
+    :type ballCount: int
+    :param render: video writer of the result video. Default is None.
+    :type render: cv2.VideoWriter
+    :param sink: result sink of the CSV files. If None, the CSV files are
+        written with writePosToCSV, writeRadToCSV and writeRangeToCSV.
+        Default is None.
+    :type sink: ResultSink
+    :param annotate: if True then the ID is written to the frame. Default is True.
+    :type annotate: bool
+    :param kinematics: kinematics window of the velocity, speed and
+        acceleration that are written to the sink. Default is None.
+    :type kinematics: KinematicsWindow
+    :param tracks: track manager of every frame, also the frame with missed
+        or extra object. Its tracks are written to the sink and their ID to
+        the frame. Default is None.
+    :type tracks: TrackManager
+    :param tracked: if True then newPos and radList are already sorted by
+        the identity (frameStride mode) and the tracker is not used.
+        Default is False.
+    :type tracked: bool
+    :return: list of sorted object position that is used as oldPos in the next frame
+    :rtype: list
+    """
+
+    # check the track manager
+    if tracks is not None:
+
+        # keep, coast, start and end the tracks with the objects of this frame
+        tick = profiler.start()
+        trackResult = tracks.update(newPos, radList)
+        profiler.stop('trackManager', tick)
+
+        # save every alive track
+        if sink is not None:
+            sink.writeTracks(frameNumber, *trackResult)
+
+        # write the track ID of the detected tracks to result image
+        if annotate == True:
+            detected = ~trackResult[3]
+            writingID(trackResult[1][detected], frame, trackResult[0][detected].tolist())
+
+    # if object detected is same with the number object that should be detected
+    if ballCount == ballNumber:
+
+        # track the object so it get sorted Position and Radius based by the identity
+        if tracked == True:
+            oldPos = newPos
+        else:
+            tick = profiler.start()
+            oldPos, radList = trackBall(oldPos, newPos, radList)
+            profiler.stop('tracking', tick)
+
+        # calculate the range distance between every objects, or between the near objects
+        if rangeMode == 'neighbor':
+            neighbors = neighborRange(oldPos, rangeCutoff)
+        else:
+            rangeBallList = calcRange(oldPos, ballNumber)
+
+        # check if the result image is used, the track manager writes its own ID
+        if annotate == True:
+
+            # write ID object to result image
+            if tracks is None:
+                writingID(oldPos, frame)
+
+        else:
+            countSavedWork('writingID call')
+
+        tick = profiler.start()
+
+        # check result sink
+        if sink is not None:
+
+            # save object position, radius and range distance to the buffered csv files
+            sink.writePos(frameNumber, oldPos)
+            sink.writeRad(frameNumber, radList)
+            if rangeMode == 'neighbor':
+                sink.writeNeighbors(frameNumber, *neighbors)
+            else:
+                sink.writeRange(frameNumber, rangeBallList)
+
+            # save velocity, speed and acceleration from the last tracked frames
+            if kinematics is not None:
+                sink.writeKinematics(frameNumber, *kinematics.update(frameNumber, oldPos))
+
+        else:
+
+            # check get position objec flag
+            if getPositionBall == True:
+
+                # check frame Number
+                if frameNumber == 1:
+
+                    # initialize CSV file if it is first frame
+                    InitPosToCSV(csvPosFile, ballNumber)
+
+                # save object position to csv file
+                writePosToCSV(csvPosFile, frameNumber, oldPos)
+
+            # check get object radius flag
+            if getRadiusBall == True:
+
+                # check frame Number
+                if frameNumber == 1:
+
+                    # initialize CSV file if it is first frame
+                    InitRadToCSV(csvRadFile, ballNumber)
+
+                # save object radius to csv file
+                writeRadToCSV(csvRadFile, frameNumber, radList)
+
+            # check get range distance between object flag, the near pairs are only written by a sink
+            if getRangeBall == True and rangeMode != 'neighbor':
+
+                # check frame number
+                if frameNumber == 1:
+
+                    # initialize CSV file if it is first time
+                    InitRangeToCSV(csvRangeBallFile, ballNumber)
+
+                # save object range distance to csv file
+                writeRangeToCSV(csvRangeBallFile, frameNumber, rangeBallList)
+
+        profiler.stop('csv', tick)
+
+    # check if result image is printed at this frame
+    if isSnapshotFrame(printResult, frameNumber):
+
+        # if True then printing the result image
+        printImage2JPG(frame, folderNameResult, frameNumber, Interval)
+
+    # the old loop built the file name in every frame while the flag is on
+    elif printResult == True:
+        countSavedWork('result file name string')
+
+    # check render result video flag
+    if render is not None:
+
+        # write the video
+        tick = profiler.start()
+        render.write(frame)
+        profiler.stop('avi', tick)
+
+    return oldPos
+
+def encodeVideo(fileName, codec, frameRate, frameSize, memoryName, slotNumber, filled, free):
+    """ a function to encode the frames of a shared memory ring buffer into a video file
+
+    It runs in the encoder process of ProcessRender. The slot number of every
+    written frame is taken from the filled queue in write order, the frame is
+    encoded and the slot is given back with the free semaphore. None in the
+    filled queue ends the video.
+
+    :param fileName: file name of the video
+    :type fileName: str
+    :param codec: four character code of the codec, e.g. 'MJPG'
+    :type codec: str
+    :param frameRate: frame per second of the video
+    :type frameRate: float
+    :param frameSize: width and height of the frame
+    :type frameSize: tuple
+    :param memoryName: name of the shared memory of the ring buffer
+    :type memoryName: str
+    :param slotNumber: number of frame slot in the ring buffer
+    :type slotNumber: int
+    :param filled: queue of the slot number of the written frames
+    :type filled: multiprocessing.Queue
+    :param free: semaphore of the free slots
+    :type free: multiprocessing.Semaphore
+    :return: None
+    """
+
+    # open the ring buffer of the writer process
+    memory = shared_memory.SharedMemory(name=memoryName)
+    frames = np.ndarray((slotNumber, frameSize[1], frameSize[0], 3), dtype=np.uint8, buffer=memory.buf)
+
+    writer = cv2.VideoWriter(fileName, cv2.VideoWriter_fourcc(*codec), frameRate, frameSize)
+
+    try:
+
+        # the writer process sees that this process stopped
+        if not writer.isOpened():
+            raise RuntimeError("video writer can not open " + fileName + " with codec " + codec)
+
+        while True:
+            slot = filled.get()
+
+            # the video ends
+            if slot is None:
+                break
+
+            # encode the frame and give the slot back
+            writer.write(frames[slot])
+            free.release()
+
+    finally:
+        writer.release()
+        del frames
+        memory.close()
+
+class ProcessRender:
+    """ a class to encode the result video in a separate process
+
+    It has the write and release functions of cv2.VideoWriter. The frame is
+    copied into the next slot of a ring buffer in shared memory and only the
+    slot number is sent to the encoder process (encodeVideo), so the frame
+    is not pickled. write waits while every slot is waiting to be encoded,
+    and release waits until every written frame is encoded.
+
+    The encoding only runs beside the frame loop if a CPU core is free, with
+    one core the copy into shared memory makes the loop slower, so the
+    asyncRender flag is False by default (see benchmark/benchRender.py).
+    """
+
+    def __init__(self, fileName, codec='MJPG', frameRate=30, frameSize=(1280, 720), slotNumber=8):
+        """
+        :param fileName: file name of the video
+        :type fileName: str
+        :param codec: four character code of the codec. Default is 'MJPG'.
+        :type codec: str
+        :param frameRate: frame per second of the video. Default is 30.
+        :type frameRate: float
+        :param frameSize: width and height of the frame. Default is (1280, 720).
+        :type frameSize: tuple
+        :param slotNumber: number of frame slot in the ring buffer. Default is 8.
+        :type slotNumber: int
+        """
+
+        self.slotNumber = max(1, slotNumber)
+        self.frameShape = (frameSize[1], frameSize[0], 3)
+
+        # one slot for every frame in the shared memory
+        self.memory = shared_memory.SharedMemory(create=True, size=self.slotNumber * int(np.prod(self.frameShape)))
+        self.frames = np.ndarray((self.slotNumber,) + self.frameShape, dtype=np.uint8, buffer=self.memory.buf)
+        self.nextSlot = 0
+
+        # slot number of the written frames and number of free slot
+        self.filled = multiprocessing.Queue()
+        self.free = multiprocessing.Semaphore(self.slotNumber)
+
+        self.process = multiprocessing.Process(target=encodeVideo, daemon=True,
+                                               args=(fileName, codec, frameRate, frameSize, self.memory.name,
+                                                     self.slotNumber, self.filled, self.free))
+        self.process.start()
+
+    def write(self, frame):
+        """ a function to copy one frame into the ring buffer
+
+        :param frame: image with the frame size of the video
+        :type frame: img
+        :return: None
+        """
+
+        # wait for a free slot, the encoder takes the slots in write order
+        while not self.free.acquire(timeout=1.0):
+            if not self.process.is_alive():
+                raise RuntimeError("video encoder process stopped with exit code " + str(self.process.exitcode))
+
+        self.frames[self.nextSlot] = frame
+        self.filled.put(self.nextSlot)
+        self.nextSlot = (self.nextSlot + 1) % self.slotNumber
+
+    def release(self):
+        """ a function to wait until every written frame is encoded and close the video
+
+        :return: None
+        """
+
+        if self.process is None:
+            return
+
+        # end the video and wait for the encoder
+        self.filled.put(None)
+        self.process.join()
+        exitCode = self.process.exitcode
+        self.process = None
+        self.filled.close()
+
+        # remove the ring buffer
+        del self.frames
+        self.memory.close()
+        self.memory.unlink()
+
+        if exitCode != 0:
+            raise RuntimeError("video encoder process stopped with exit code " + str(exitCode))
+
+def openRender(firstFrame=0):
+    """ a function to open the video writer of the result video
+
+    A video can not be continued, so a resumed run writes the frames after
+    firstFrame into a new video named with '-from' and the first frame number.
+
+    :param firstFrame: number of frame processed before a resume. Default is 0.
+    :type firstFrame: int
+    :return: video writer if render flag is True, otherwise None
+    :rtype: cv2.VideoWriter or ProcessRender
+    """
+
+    #checking render flag, if True then render
+    if renderVideoResult == True :
+        fileName = videoResultFile
+        if firstFrame > 0:
+            root, extension = os.path.splitext(videoResultFile)
+            fileName = root + '-from' + str(firstFrame + 1) + extension
+
+        # check the encoder process flag
+        if asyncRender == True:
+            return ProcessRender(fileName, videoCodec, fps, (frameWidth, frameHeigth), renderQueueSize)
+
+        return cv2.VideoWriter(fileName,                                      # Video result name and director
+                               cv2.VideoWriter_fourcc(*videoCodec),           # MJPG format is supported for AVI ext
+                               fps, (frameWidth, frameHeigth))                # Properties of video
+
+    return None
+
+class ProgressLine:
+    """ a class to print a one line progress report (frames done, frames per
+    second and estimated time left) at most once per interval
+    """
+
+    def __init__(self, frameCount, interval=1.0, firstFrame=0):
+        """
+        :param frameCount: total frame of the video, 0 if it is not known
+        :type frameCount: int
+        :param interval: minimum time between two reports in seconds.
+            Default is 1.0.
+        :type interval: float
+        :param firstFrame: number of frame processed before a resume.
+            Default is 0.
+        :type firstFrame: int
+        """
+
+        self.frameCount = frameCount
+        self.firstFrame = firstFrame
+        self.interval = interval
+        self.startTime = time.perf_counter()
+        self.lastTime = self.startTime
+
+    def update(self, frameNumber, force=False):
+        """ a function to print the progress line if the interval has passed
+
+        :param frameNumber: number of processed frame
+        :type frameNumber: int
+        :param force: if True then the line is printed anyway. Default is False.
+        :type force: bool
+        :return: None
+        """
+
+        now = time.perf_counter()
+        if not force and now - self.lastTime < self.interval:
+            return
+        self.lastTime = now
+
+        # get the frames per second since the start
+        elapsed = now - self.startTime
+        framesPerSecond = (frameNumber - self.firstFrame) / elapsed if elapsed > 0 else 0.0
+
+        line = "frame %d" % frameNumber
+
+        # the total frame is only known for video file
+        if self.frameCount > 0:
+            line += "/%d" % self.frameCount
+
+        line += "  %.1f fps" % framesPerSecond
+
+        if self.frameCount > 0 and framesPerSecond > 0:
+            eta = max(0, self.frameCount - frameNumber) / framesPerSecond
+            line += "  ETA %d:%02d" % (eta // 60, eta % 60)
+
+        sys.stderr.write("\r" + line + "   ")
+        sys.stderr.flush()
+
+    def finish(self, frameNumber):
+        """ a function to print the last progress line and end the line
+
+        :param frameNumber: number of processed frame
+        :type frameNumber: int
+        :return: None
+        """
+
+        self.update(frameNumber, True)
+        sys.stderr.write("\n")
+
+def openProgressLine(capture, firstFrame=0):
+    """ a function to open the progress line if showProgress flag is True
+
+    :param capture: video capture of the input video
+    :type capture: cv2.VideoCapture
+    :param firstFrame: number of frame processed before a resume. Default is 0.
+    :type firstFrame: int
+    :return: progress line or None
+    :rtype: ProgressLine
+    """
+
+    if showProgress == True:
+        return ProgressLine(int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), firstFrame=firstFrame)
+
+    return None
+
+def requestStop(signalNumber=None, stackFrame=None):
+    """ a function to ask the running detection loop to stop after the
+    current frame, used as SIGINT and SIGTERM handler
+
+    :param signalNumber: number of the received signal
+    :type signalNumber: int
+    :param stackFrame: current stack frame
+    :type stackFrame: frame
+    :return: None
+    """
+
+    stopRequested.set()
+
+def installStopHandler():
+    """ a function to stop the detection gracefully on SIGINT and SIGTERM,
+    so the CSV files are written and the result video is released
+
+    :return: None
+    """
+
+    signal.signal(signal.SIGINT, requestStop)
+    signal.signal(signal.SIGTERM, requestStop)
+
+def parseArguments(argv=None):
+    """ a function to read the command line options
+
+    :param argv: list of command line arguments. Default is sys.argv.
+    :type argv: list
+    :return: parsed options
+    :rtype: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(description='Detect and track multiple balls in a video.')
+    parser.add_argument('--headless', action='store_true',
+                        help='run without any window (no cv2.imshow and cv2.waitKey)')
+    parser.add_argument('--progress', action='store_true',
+                        help='print frames done, fps and ETA')
+    parser.add_argument('--profile', action='store_true',
+                        help='write latency report of every stage')
+    parser.add_argument('--checkpoint', type=int, metavar='FRAMES',
+                        help='write a checkpoint every FRAMES frames')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue the stopped run from the checkpoint file')
+    parser.add_argument('--live', action='store_true',
+                        help='detect the newest frame of liveSource and drop stale frames')
+    parser.add_argument('--config', metavar='FILE',
+                        help='JSON file with the settings (see DetectorConfig)')
+    parser.add_argument('--set', action='append', metavar='NAME=VALUE',
+                        help='change one setting, for example --set minBallRadius=50')
+
+    return parser.parse_args(argv)
+
+def saveCheckpoint(frameNumber, detectedFrame, oldPos, prevPos, sink, kinematics=None, finished=False,
+                   tracks=None, strideState=None):
+    """ a function to write the state of the detection loop into the checkpoint file
+
+    The buffered rows are written first, so the offset of every CSV file
+    is the end of the last processed frame. The file is written to a
+    temporary file and renamed, so a crash never leaves half a checkpoint.
+
+    :param frameNumber: last processed frame number
+    :type frameNumber: int
+    :param detectedFrame: number of frame where every object is detected
+    :type detectedFrame: int
+    :param oldPos: list of sorted object position of the tracker
+    :type oldPos: list
+    :param prevPos: list of object position of the frame before oldPos
+    :type prevPos: list
+    :param sink: result sink of the CSV files
+    :type sink: ResultSink
+    :param kinematics: kinematics window. Default is None.
+    :type kinematics: KinematicsWindow
+    :param finished: True if the video has been processed until the end.
+        Default is False.
+    :type finished: bool
+    :param tracks: track manager. Default is None.
+    :type tracks: TrackManager
+    :param strideState: stride, frame number of the last detected and
+        tracked frame and sorted object radius of the frameStride mode.
+        Default is None.
+    :type strideState: dict
+    :return: None
+    """
+
+    state = {'video': openFile,
+             'frameNumber': frameNumber,
+             'detectedFrame': detectedFrame,
+             'oldPos': [[int(c) for c in pos] for pos in oldPos],
+             'prevPos': [[int(c) for c in pos] for pos in prevPos],
+             'offsets': sink.offsets(),
+             'finished': finished}
+
+    if kinematics is not None:
+        state['kinematics'] = kinematics.state()
+
+    if tracks is not None:
+        state['tracks'] = tracks.state()
+
+    if strideState is not None:
+        state['stride'] = strideState
+
+    temporaryFile = checkpointFile + '.tmp'
+    with open(temporaryFile, 'w') as writeFile:
+        json.dump(state, writeFile)
+    os.replace(temporaryFile, checkpointFile)
+
+def loadCheckpoint():
+    """ a function to read the checkpoint file of a stopped run
+
+    :return: state written by saveCheckpoint, or None if there is no checkpoint
+    :rtype: dict
+    """
+
+    if not os.path.exists(checkpointFile):
+        return None
+
+    with open(checkpointFile) as readFile:
+        state = json.load(readFile)
+
+    # the checkpoint must belong to the same video
+    if state['video'] != openFile:
+        raise ValueError("checkpoint " + checkpointFile + " belongs to " + state['video'])
+
+    return state
+
+def detectionSettings():
+    """ a function to get every setting that can change the detected objects
+
+    :return: dictionary of setting name and value
+    :rtype: dict
+    """
+
+    names = ['frameWidth', 'frameHeigth', 'minBallRadius', 'maxBallRadius', 'minDistance', 'ballNumber',
+             'lowerTreshold', 'upperTreshold', 'roiTracking', 'coarseScale', 'contourPrefilter',
+             'minContourAreaFactor', 'houghAreaFactor', 'houghAreaCircle', 'houghCaching']
+
+    # the search windows depend on the tracked position of the previous frame
+    if roiTracking == True:
+        names += ['roiPadding', 'trackerEngine']
+
+    # the hough cache uses the circles of the previous frames
+    if houghCaching == True:
+        names += ['houghCacheSize', 'houghCacheAge', 'houghCacheShift', 'houghCacheTolerance']
+
+    # the printed HSV and filtered image turn off the window and coarse search
+    if roiTracking == True or coarseScale > 1:
+        names += ['printHSV', 'printFiltered', 'Interval']
+
+    return {name: globals()[name] for name in names}
+
+def detectionCacheFile(videoFile):
+    """ a function to get the file name of the stored detection of a video
+    with the current detection settings
+
+    The name has the SHA-1 hash of the video content and of the detection
+    settings, so a changed video or a changed detection setting does not
+    use the stored detection.
+
+    :param videoFile: file name of the video
+    :type videoFile: str
+    :return: file name of the NPZ file in detectionCacheFolder
+    :rtype: str
+    """
+
+    # hash of the video content, read in blocks so the video is not loaded at once
+    videoHash = hashlib.sha1()
+    with open(videoFile, 'rb') as readFile:
+        for block in iter(lambda: readFile.read(1 << 20), b''):
+            videoHash.update(block)
+
+    # hash of the detection settings
+    settingHash = hashlib.sha1(json.dumps(detectionSettings(), sort_keys=True).encode())
+
+    return os.path.join(detectionCacheFolder,
+                        videoHash.hexdigest()[:16] + '-' + settingHash.hexdigest()[:16] + '.npz')
+
+class DetectionCache:
+    """ a class to store the detected objects of every frame of a video
+
+    If the file of the video and detection settings exists, the position
+    and radius of every frame are loaded and taken with get instead of
+    running detectBall. Otherwise the detection of every frame is added
+    with add and saved when the whole video is processed. The stored
+    detection is the result of detectBall before tracking, so the tracker,
+    range, kinematics and image output can change without detecting again.
+    The hough transform gives UINT16 position and radius, so these objects
+    are flagged and taken with the same type as detectBall.
+    """
+
+    def __init__(self, cacheFile):
+        """
+        :param cacheFile: file name of the NPZ file from detectionCacheFile
+        :type cacheFile: str
+        """
+
+        self.cacheFile = cacheFile
+        self.stored = os.path.exists(cacheFile)
+
+        if self.stored:
+
+            # number of object of every frame and the position and radius of every object
+            with np.load(cacheFile) as data:
+                self.counts = data['counts']
+                self.pos = data['pos']
+                self.rad = data['rad']
+
+                # a file without the flag has only the contour result
+                if 'hough' in data:
+                    self.hough = data['hough']
+                else:
+                    self.hough = np.zeros(len(self.rad), dtype=np.bool_)
+            self.starts = np.concatenate(([0], np.cumsum(self.counts)[:-1])).astype(np.int64)
+            self.frameCount = len(self.counts)
+
+        else:
+            self.buffers = {'counts': ChunkBuffer((), np.int32),
+                            'pos': ChunkBuffer((2,), np.int64),
+                            'rad': ChunkBuffer((), np.int64),
+                            'hough': ChunkBuffer((), np.bool_)}
+            self.frameCount = 0
+
+    def get(self, frameNumber):
+        """ a function to get the stored detection of one frame
+
+        :param frameNumber: frame number, the first frame is 1
+        :type frameNumber: int
+        :return: list of object position, list of object radius and number
+            of detected object, same as detectBall
+        :rtype: tuple
+        """
+
+        start = self.starts[frameNumber - 1]
+        ballCount = int(self.counts[frameNumber - 1])
+        newPos = self.pos[start:start + ballCount].tolist()
+        radList = self.rad[start:start + ballCount].tolist()
+
+        # the hough objects are UINT16 as in detectBall, so the range is calculated the same way
+        for k in np.flatnonzero(self.hough[start:start + ballCount]):
+            newPos[k] = [np.uint16(newPos[k][0]), np.uint16(newPos[k][1])]
+            radList[k] = np.uint16(radList[k])
+
+        return newPos, radList, ballCount
+
+    def add(self, newPos, radList):
+        """ a function to add the detection of the next frame
+
+        :param newPos: list of object position from detectBall
+        :type newPos: list
+        :param radList: list of object radius from detectBall
+        :type radList: list
+        :return: None
+        """
+
+        self.buffers['counts'].append(len(newPos))
+        self.buffers['pos'].extend(np.asarray(newPos, dtype=np.int64).reshape(-1, 2))
+        self.buffers['rad'].extend(np.asarray(radList, dtype=np.int64))
+        self.buffers['hough'].extend(np.array([isinstance(position[0], np.uint16) for position in newPos],
+                                              dtype=np.bool_))
+        self.frameCount += 1
+
+    def save(self):
+        """ a function to save the added detection and remove the stored
+        detection of the same video with other detection settings
+
+        :return: None
+        """
+
+        # write a temporary file and rename it, so a crash never leaves half a file
+        temporaryFile = self.cacheFile[:-len('.npz')] + '.tmp.npz'
+        np.savez(temporaryFile, **{name: buffer.array() for name, buffer in self.buffers.items()})
+        os.replace(temporaryFile, self.cacheFile)
+
+        # the detection with the old settings is never used again
+        videoPrefix = os.path.basename(self.cacheFile).split('-')[0]
+        for oldFile in glob.glob(os.path.join(os.path.dirname(self.cacheFile), videoPrefix + '-*.npz')):
+            if os.path.abspath(oldFile) != os.path.abspath(self.cacheFile):
+                os.remove(oldFile)
+
+def openDetectionCache(firstFrame=0):
+    """ a function to open the stored detection of openFile if detectionCache flag is True
+
+    :param firstFrame: number of frame that is already processed by a
+        stopped run. Default is 0.
+    :type firstFrame: int
+    :return: detection cache, otherwise None
+    :rtype: DetectionCache
+    """
+
+    if detectionCache != True:
+        return None
+
+    os.makedirs(detectionCacheFolder, exist_ok=True)
+    cache = DetectionCache(detectionCacheFile(openFile))
+
+    if cache.stored:
+        print("detection cache: use the stored detection of " + openFile)
+        return cache
+
+    # a resumed run can not store the detection of the first frames
+    if firstFrame > 0:
+        return None
+
+    return cache
+
+def redrawDetection(frame, frameNumber, newPos, radList, annotate=True):
+    """ a function to make the images of detectBall from a stored detection
+
+    The raw, HSV and filtered image are printed per interval and the circles
+    are drawn without measuring the contours again.
+
+    :param frame: resized image of the current frame
+    :type frame: img
+    :param frameNumber: current frame number
+    :type frameNumber: int
+    :param newPos: list of stored object position
+    :type newPos: list
+    :param radList: list of stored object radius
+    :type radList: list
+    :param annotate: if True then the circles are drawn in the frame.
+        Default is True.
+    :type annotate: bool
+    :return: None
+    """
+
+    # check if raw image is printed at this frame
+    if isSnapshotFrame(printRaw, frameNumber):
+
+        # printing raw image
+        printImage2JPG(frame, folderNameRaw, frameNumber, Interval)
+
+    # the old loop built the file name in every frame while the flag is on
+    elif printRaw == True:
+        countSavedWork('raw file name string')
+
+    # the HSV and filtered image are only made when they are printed
+    if isSnapshotFrame(printHSV, frameNumber) or isSnapshotFrame(printFiltered, frameNumber):
+        findBallContours(frame, frameNumber)
+
+    # check if the result image is used
+    if annotate == True:
+
+        # draw circle surrounding every object
+        for center, radius in zip(newPos, radList):
+            cv2.circle(frame, tuple(center), radius, boundColor, 2)
+
+    else:
+        countSavedWork('circle drawing call')
+
+def needFrame(frameNumber, showFrame, render=None):
+    """ a function to check whether the image of the current frame is used
+    by some output, so the frame must be decoded
+
+    :param frameNumber: current frame number
+    :type frameNumber: int
+    :param showFrame: if True then the frame is shown in a window
+    :type showFrame: bool
+    :param render: video writer of the result video. Default is None.
+    :type render: cv2.VideoWriter
+    :return: True if the frame must be decoded
+    :rtype: bool
+    """
+
+    return (needAnnotation(frameNumber, showFrame, render) or isSnapshotFrame(printRaw, frameNumber)
+            or isSnapshotFrame(printHSV, frameNumber) or isSnapshotFrame(printFiltered, frameNumber))
+
+def chooseStride(oldPos, sortedPos, gap):
+    """ a function to choose the number of frame until the next detected frame in frameStride mode
+
+    :param oldPos: list of sorted object position of the last tracked frame,
+        empty if there is none
+    :type oldPos: list
+    :param sortedPos: list of sorted object position of the detected frame,
+        None if it is not tracked
+    :type sortedPos: list
+    :param gap: number of frame from the last tracked frame to the detected frame
+    :type gap: int
+    :return: frameStride if every object is tracked and moves at most
+        strideMaxMotion pixel in frameStride frames, otherwise 1
+    :rtype: int
+    """
+
+    # a missed object or an unknown velocity detects every frame
+    if sortedPos is None or len(oldPos) != ballNumber or gap < 1:
+        return 1
+
+    # the fastest object in pixel per frame
+    motion = np.asarray(sortedPos, dtype=np.float64) - np.asarray(oldPos, dtype=np.float64)
+    speed = np.hypot(motion[:, 0], motion[:, 1]).max() / gap
+
+    if speed * frameStride > strideMaxMotion:
+        return 1
+
+    return frameStride
+
+def saveSkippedFrames(pending, oldPos, oldRad, sortedPos, sortedRad, render=None, sink=None,
+                      showFrame=False, kinematics=None, tracks=None):
+    """ a function to save the result of the frames that are skipped in frameStride mode
+
+    The position and radius are interpolated linearly between the tracked
+    frame before and the detected frame after the skipped frames. If the
+    frame after is not tracked, the skipped frames are saved without object.
+
+    :param pending: list of frame number and image of every skipped frame,
+        the image is None if it is not decoded
+    :type pending: list
+    :param oldPos: list of sorted object position of the frame before the skipped frames
+    :type oldPos: list
+    :param oldRad: list of sorted object radius of the frame before the skipped frames
+    :type oldRad: list
+    :param sortedPos: list of sorted object position of the frame after the
+        skipped frames, None if it is not tracked
+    :type sortedPos: list
+    :param sortedRad: list of sorted object radius of the frame after the skipped frames
+    :type sortedRad: list
+    :param render: video writer of the result video. Default is None.
+    :type render: cv2.VideoWriter
+    :param sink: result sink of the CSV files. Default is None.
+    :type sink: ResultSink
+    :param showFrame: if True then the frame is shown in a window. Default is False.
+    :type showFrame: bool
+    :param kinematics: kinematics window. Default is None.
+    :type kinematics: KinematicsWindow
+    :param tracks: track manager. Default is None.
+    :type tracks: TrackManager
+    :return: list of sorted object position of the last skipped frame
+    :rtype: list
+    """
+
+    # the objects of both frames are known
+    interpolate = sortedPos is not None and len(oldPos) == ballNumber and len(oldRad) == ballNumber
+    if interpolate:
+        startPos = np.asarray(oldPos, dtype=np.float64)
+        endPos = np.asarray(sortedPos, dtype=np.float64)
+        startRad = np.asarray(oldRad, dtype=np.float64)
+        endRad = np.asarray(sortedRad, dtype=np.float64)
+
+    for k, (frameNumber, frame) in enumerate(pending, 1):
+
+        # interpolate the position and radius at this frame
+        if interpolate:
+            fraction = k / (len(pending) + 1)
+            framePos = np.rint(startPos + (endPos - startPos) * fraction).astype(int).tolist()
+            frameRad = np.rint(startRad + (endRad - startRad) * fraction).astype(int).tolist()
+            ballCount = ballNumber
+        else:
+            framePos, frameRad, ballCount = [], [], 0
+
+        # make the images of this frame from the interpolated objects
+        annotate = frame is not None and needAnnotation(frameNumber, showFrame, render)
+        if frame is not None:
+            redrawDetection(frame, frameNumber, framePos, frameRad, annotate)
+
+        oldPos = saveFrameResult(frame, frameNumber, oldPos, framePos, frameRad, ballCount, render, sink,
+                                 annotate, kinematics, tracks, tracked=True)
+
+    return oldPos
+
+def runDetection(showFrame=True):
+    """ a function to run the detection loop over the input video using
+    the settings above
+
+    If checkpointInterval is above 0, the state of the loop is written to
+    the checkpoint file every checkpointInterval frames and when the loop
+    stops. If resumeRun flag is True, the loop continues after the last
+    frame of the checkpoint and the CSV files are continued from the
+    checkpoint offsets. If detectionCache flag is True, the detection is
+    taken from the stored detection of the video and detection settings,
+    and a frame is only decoded if its image is used by some output. If
+    frameStride is above 1, only every frameStride-th frame is detected
+    while the objects move slowly, see chooseStride and saveSkippedFrames.
+    The stride is kept in the checkpoint, and a stopped stride run ends at
+    the last detected frame, so the resumed run interpolates the same frames.
+
+    :param showFrame: if True then the result is shown in a window and the
+        loop stops when 'q' is pressed. Default is True.
+    :type showFrame: bool
+    :return: number of processed frame and number of frame where every
+        object is detected
+    :rtype: tuple
+    """
+
+    # read the checkpoint of the stopped run
+    checkpoint = None
+    if resumeRun == True:
+        checkpoint = loadCheckpoint()
+
+    # the checkpoint offset is only known for the CSV files
+    if (checkpointInterval > 0 or checkpoint is not None) and outputFormat != 'csv':
+        raise ValueError("checkpoint and resume need outputFormat 'csv'")
+
+    # the video has been processed until the end
+    if checkpoint is not None and checkpoint['finished'] == True:
+        print("checkpoint: " + openFile + " is already processed")
+        return checkpoint['frameNumber'], checkpoint['detectedFrame']
+
+    frameNumber = 0         # Initialize frame umber variable
+    detectedFrame = 0       # Initialize number of frame where every object is detected
+    oldPos = []             # Initialize old object position list
+    prevPos = []            # Initialize object position list of the frame before oldPos
+    offsets = None          # Initialize offset of the CSV files
+
+    # continue from the state of the checkpoint
+    if checkpoint is not None:
+        frameNumber = checkpoint['frameNumber']
+        detectedFrame = checkpoint['detectedFrame']
+        oldPos = checkpoint['oldPos']
+        prevPos = checkpoint['prevPos']
+        offsets = checkpoint['offsets']
+        print("checkpoint: resume after frame %d" % frameNumber)
+
+    #open the video file and seek to the frame after the checkpoint
+    capture = cv2.VideoCapture(openFile)
+    if frameNumber > 0:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, frameNumber)
+
+    # open the result video
+    render = openRender(frameNumber)
+
+    # open the CSV files
+    sink = openResultSink(offsets)
+
+    # open the velocity, speed and acceleration window
+    kinematics = openKinematics()
+    if kinematics is not None and checkpoint is not None and 'kinematics' in checkpoint:
+        kinematics.restore(checkpoint['kinematics'])
+
+    # open the track manager
+    tracks = openTrackManager()
+    if tracks is not None and checkpoint is not None and 'tracks' in checkpoint:
+        tracks.restore(checkpoint['tracks'])
+
+    # open the stored detection
+    cache = openDetectionCache(frameNumber)
+
+    # the stride mode does not detect every frame, so its detection is not stored
+    if frameStride > 1 and cache is not None and not cache.stored:
+        cache = None
+
+    # the stored detection is used for every frame instead of the stride mode
+    strideMode = frameStride > 1 and cache is None
+    stride = 1              # Initialize number of frame until the next detected frame
+    sampleFrame = frameNumber   # Initialize frame number of the last detected frame
+    trackedFrame = frameNumber  # Initialize frame number of oldPos
+    sampleRad = []          # Initialize sorted object radius of oldPos
+    pending = []            # Initialize list of skipped frame number and image
+    strideState = None      # Initialize stride state of the checkpoint
+
+    # continue the stride of the checkpoint, so the same frames are detected and interpolated
+    if strideMode == True and checkpoint is not None and 'stride' in checkpoint:
+        strideState = checkpoint['stride']
+        stride = strideState['stride']
+        sampleFrame = strideState['sampleFrame']
+        trackedFrame = strideState['trackedFrame']
+        sampleRad = strideState['sampleRad']
+
+    # the video position is only used if some image output is used
+    readVideo = (showFrame == True or render is not None or printRaw == True or printHSV == True
+                 or printFiltered == True or printResult == True)
+
+    # start writing JPEG images in separate threads
+    startSnapshotWriter()
+
+    # start recording the stage latency
+    startProfiler()
+
+    # start keeping the hough transform result
+    startHoughCache()
+
+    # open the progress line
+    progress = openProgressLine(capture, frameNumber)
+
+    finished = False        # True if the video is processed until the end
+
+    try:
+
+        # as long as video being opened and no stop signal is received
+        while(capture.isOpened() and not stopRequested.is_set()):
+
+            # take the stored detection of the next frame
+            stored = None
+            if cache is not None and cache.stored:
+
+                # every stored frame has been processed
+                if frameNumber >= cache.frameCount:
+                    finished = True
+                    break
+
+                stored = cache.get(frameNumber + 1)
+
+            # the frame between two detected frames is skipped, the checkpoint frame is always detected
+            if (strideMode == True and frameNumber + 1 - sampleFrame < stride
+                    and not (checkpointInterval > 0 and (frameNumber + 1) % checkpointInterval == 0)):
+
+                # the image is kept until the next detected frame if some output uses it
+                if needFrame(frameNumber + 1, showFrame, render):
+                    ret, frame = readFrame(capture)
+                    if ret == True:
+                        frame = resizeFrame(frame).copy()
+                else:
+                    tick = profiler.start()
+                    ret, frame = capture.grab(), None
+                    profiler.stop('grab', tick)
+
+                # if there isn't any frame ret equal to False
+                if ret == False:
+                    finished = True
+                    break
+
+                frameNumber += 1
+                pending.append((frameNumber, frame))
+                countSavedWork('detection')
+                if frame is None:
+                    countSavedWork('decode')
+
+                # print the progress
+                if progress is not None:
+                    progress.update(frameNumber)
+
+                continue
+
+            # the image of the stored frame is not used, the video is only moved to the next frame
+            if stored is not None and not needFrame(frameNumber + 1, showFrame, render):
+                frame = None
+                if readVideo == True:
+                    tick = profiler.start()
+                    capture.grab()
+                    profiler.stop('grab', tick)
+                countSavedWork('decode')
+
+            else:
+
+                # reading the video file, image send to frame, ret contain boolean True or False
+                tick = profiler.start()
+                ret, frame = readFrame(capture)
+                profiler.stop('decode', tick)
+
+                # if there isn't any frame ret equal to False
+                if ret == False:
+
+                    # break the while loop
+                    finished = True
+                    break
+
+                # resize image so it will have same size
+                tick = profiler.start()
+                frame = resizeFrame(frame)
+                profiler.stop('resize', tick)
+
+            # add the frame number value by 1
+            frameNumber += 1
+
+            # check if the result image is used in this frame
+            annotate = needAnnotation(frameNumber, showFrame, render)
+
+            # check the stored detection
+            if stored is not None:
+
+                # make the images of this frame without detecting again
+                newPos, radList, ballCount = stored
+                if frame is not None:
+                    redrawDetection(frame, frameNumber, newPos, radList, annotate)
+                countSavedWork('detection')
+
+            else:
+
+                # check roi tracking flag
+                windows = None
+                if roiTracking == True:
+
+                    # search only around the predicted position
+                    windows = predictWindows(oldPos, prevPos, roiPadding)
+
+                # detect the object in the frame
+                newPos, radList, ballCount = detectBall(frame, frameNumber, annotate, windows)
+
+                # keep the detection for the next run
+                if cache is not None:
+                    cache.add(newPos, radList)
+
+            # the stride mode tracks the detected frame first, so the skipped frames can be interpolated
+            tracked = False
+            if strideMode == True:
+                sortedPos = None
+                if ballCount == ballNumber:
+                    tick = profiler.start()
+                    newPos, radList = trackBall(oldPos, newPos, radList)
+                    profiler.stop('tracking', tick)
+                    sortedPos = newPos
+                    tracked = True
+
+                # detect every frame while an object moves fast or is missed
+                nextStride = chooseStride(oldPos, sortedPos, frameNumber - trackedFrame)
+                if nextStride < stride:
+                    profiler.count('strideFallback')
+
+                # save the skipped frames before this frame
+                oldPos = saveSkippedFrames(pending, oldPos, sampleRad, sortedPos, radList, render, sink,
+                                           showFrame, kinematics, tracks)
+                pending = []
+                stride = nextStride
+                sampleFrame = frameNumber
+                if tracked == True:
+                    trackedFrame = frameNumber
+                    sampleRad = radList
+                strideState = {'stride': stride, 'sampleFrame': sampleFrame, 'trackedFrame': trackedFrame,
+                               'sampleRad': [int(r) for r in sampleRad]}
+
+            # count the frame where every object is detected
+            if ballCount == ballNumber:
+                detectedFrame += 1
+
+            # track the object and save the result
+            lastPos = oldPos
+            oldPos = saveFrameResult(frame, frameNumber, oldPos, newPos, radList, ballCount, render, sink,
+                                     annotate, kinematics, tracks, tracked)
+
+            # keep the position of the previous frame for the prediction,
+            # the velocity is unknown if the last frame was not tracked
+            if oldPos is not lastPos:
+                prevPos = lastPos
+            else:
+                prevPos = []
+
+            # write the checkpoint every checkpointInterval frames
+            if checkpointInterval > 0 and frameNumber % checkpointInterval == 0:
+                saveCheckpoint(frameNumber, detectedFrame, oldPos, prevPos, sink, kinematics, tracks=tracks,
+                               strideState=strideState)
+
+            # print the progress
+            if progress is not None:
+                progress.update(frameNumber)
+
+            # check show frame flag
+            if showFrame == True:
+
+                # show the image in windows frame
+                cv2.imshow('frame', frame)
+
+                # if 'q' keyword pressed and image has been showed
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+
+                    # break the while loop
+                    break
+
+        # a stopped run with a checkpoint ends at the last detected frame, the
+        # resumed run reads the skipped frames again and interpolates them
+        checkpointed = checkpointInterval > 0 or resumeRun == True
+        if finished == False and checkpointed == True and pending:
+            frameNumber = sampleFrame
+            pending = []
+
+        # the skipped frames after the last detected frame can not be interpolated
+        oldPos = saveSkippedFrames(pending, oldPos, sampleRad, None, [], render, sink, showFrame,
+                                   kinematics, tracks)
+
+        # write the checkpoint of the last processed frame, also when 'q' is pressed
+        if checkpointed == True:
+            saveCheckpoint(frameNumber, detectedFrame, oldPos, prevPos, sink, kinematics, finished, tracks,
+                           strideState)
+
+        # store the detection of the whole video
+        if finished == True and cache is not None and not cache.stored:
+            cache.save()
+
+    finally:
+
+        # write the buffered rows and close the CSV files, also when 'q' is pressed
+        sink.close()
+
+        # write every waiting JPEG image
+        stopSnapshotWriter()
+
+        # count the reused hough transform result
+        stopHoughCache()
+
+        # write the profiling report
+        stopProfiler()
+
+        # release capture
+        capture.release()
+
+        # check render result video
+        if render is not None:
+
+            # release render
+            render.release()
+
+    # end the progress line
+    if progress is not None:
+        progress.finish(frameNumber)
+
+    # check show frame flag
+    if showFrame == True:
+
+        # destroy all created windows frame
+        cv2.destroyAllWindows()
+
+    # print the work that is skipped because no output uses it
+    reportSavedWork()
+
+    return frameNumber, detectedFrame
+
+class StageTimer:
+    """ a class to measure the processing time of one pipeline stage
+
+    The time is accumulated from several threads, so it is protected by a lock.
+    """
+
+    def __init__(self, name):
+        """
+        :param name: name of the stage
+        :type name: str
+        """
+
+        self.name = name
+        self.frames = 0
+        self.busyTime = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, duration):
+        """ a function to add the processing time of one frame
+
+        :param duration: processing time in seconds
+        :type duration: float
+        :return: None
+        """
+
+        with self.lock:
+            self.frames += 1
+            self.busyTime += duration
+
+    def report(self, workers=1):
+        """ a function to get the report line of the stage
+
+        :param workers: number of thread that run this stage
+        :type workers: int
+        :return: report line contain frames per second of the stage
+        :rtype: str
+        """
+
+        # frames per second of one thread and of the whole stage
+        if self.busyTime > 0:
+            fpsThread = self.frames / self.busyTime
+        else:
+            fpsThread = 0.0
+
+        return "%-8s %6d frames  %8.1f frames/s (x%d threads = %.1f)" % (
+            self.name, self.frames, fpsThread, workers, fpsThread * workers)
+
+def runPipeline(workerNumber=4, queueSize=8, showFrame=True):
+    """ a function to run the detection with a reader thread, a pool of
+    detector threads and an ordered writer stage
+
+    The reader thread reads and passes the frame to the detector threads
+    through a bounded queue. The detector threads resize and detect the object
+    (detectBall). The writer stage runs on the main thread, puts the frame back
+    in frame order and calls saveFrameResult, so the CSV files and result.avi
+    have the same order as runDetection. OpenCV releases the GIL, so the
+    detector threads can use several cores.
+
+    :param workerNumber: number of detector threads. Default is 4.
+    :type workerNumber: int
+    :param queueSize: maximum number of frame in the pipeline. Default is 8.
+    :type queueSize: int
+    :param showFrame: if True then the result is shown in a window and the
+        pipeline stops when 'q' is pressed. Default is True.
+    :type showFrame: bool
+    :return: None
+    """
+
+    #open the video file
+    capture = cv2.VideoCapture(openFile)
+
+    # open the result video
+    render = openRender()
+
+    # open the CSV files
+    sink = openResultSink()
+
+    # open the velocity, speed and acceleration window
+    kinematics = openKinematics()
+
+    # open the track manager
+    tracks = openTrackManager()
+
+    # start writing JPEG images in separate threads
+    startSnapshotWriter()
+
+    # start recording the stage latency
+    startProfiler()
+
+    # start keeping the hough transform result
+    startHoughCache()
+
+    # open the progress line
+    progress = openProgressLine(capture)
+
+    # bounded queue between the stages
+    readQueue = queue.Queue(maxsize=queueSize)
+    detectQueue = queue.Queue(maxsize=queueSize)
+
+    # limit the number of frame in the pipeline, so the reorder buffer
+    # of the writer stage is also bounded
+    slots = threading.Semaphore(queueSize)
+
+    # flag to stop the reader if 'q' is pressed or an error happen
+    stopEvent = threading.Event()
+
+    # timer of every stage
+    readTimer = StageTimer('read')
+    detectTimer = StageTimer('detect')
+    writeTimer = StageTimer('write')
+
+    def reader():
+
+        frameNumber = 0
+
+        # as long as video being opened
+        while capture.isOpened() and not stopEvent.is_set():
+
+            # wait for a free slot in the pipeline
+            if not slots.acquire(timeout=0.1):
+                continue
+
+            start = time.perf_counter()
+
+            # reading the video file
+            tick = profiler.start()
+            ret, frame = capture.read()
+            profiler.stop('decode', tick)
+
+            # if there isn't any frame ret equal to False
+            if ret == False:
+                slots.release()
+                break
+
+            frameNumber += 1
+            readTimer.add(time.perf_counter() - start)
+            readQueue.put((frameNumber, frame))
+
+        # tell every detector that there is no frame anymore
+        for i in range(workerNumber):
+            readQueue.put(None)
+
+    def detector():
+
+        while True:
+            item = readQueue.get()
+
+            # no frame anymore
+            if item is None:
+                detectQueue.put(None)
+                return
+
+            frameNumber, frame = item
+
+            # the frame will not be written after a stop
+            if stopEvent.is_set():
+                continue
+
+            start = time.perf_counter()
+
+            try:
+                # resize image so it will have same size, the frame is
+                # still used by the writer thread so no buffer is reused
+                tick = profiler.start()
+                frame = resizeFrame(frame, False)
+                profiler.stop('resize', tick)
+
+                # detect the object in the frame
+                result = detectBall(frame, frameNumber)
+
+            except Exception as error:
+                # pass the error to the writer stage
+                stopEvent.set()
+                detectQueue.put(error)
+                detectQueue.put(None)
+                return
+
+            detectTimer.add(time.perf_counter() - start)
+            detectQueue.put((frameNumber, frame) + result)
+
+    # start the reader and detector threads
+    threads = [threading.Thread(target=reader, daemon=True)]
+    threads += [threading.Thread(target=detector, daemon=True) for i in range(workerNumber)]
+    wallStart = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    oldPos = []             # Initialize old object position list
+    pending = {}            # frame that is waiting for the previous frame
+    nextFrame = 1           # frame number that must be written next
+    finished = 0            # number of detector that has finished
+    error = None
+
+    try:
+
+        # writer stage, run until every detector has finished
+        while finished < workerNumber:
+            item = detectQueue.get()
+
+            if item is None:
+                finished += 1
+                continue
+
+            if isinstance(item, Exception):
+                error = item
+                continue
+
+            pending[item[0]] = item
+
+            # write every frame that is already in order
+            while nextFrame in pending and error is None and not stopEvent.is_set():
+                frameNumber, frame, newPos, radList, ballCount = pending.pop(nextFrame)
+                start = time.perf_counter()
+
+                # track the object and save the result
+                oldPos = saveFrameResult(frame, frameNumber, oldPos, newPos, radList, ballCount, render, sink,
+                                         kinematics=kinematics, tracks=tracks)
+                writeTimer.add(time.perf_counter() - start)
+
+                nextFrame += 1
+                slots.release()
+
+                # print the progress
+                if progress is not None:
+                    progress.update(frameNumber)
+
+                # check show frame flag
+                if showFrame == True:
+
+                    # show the image in windows frame
+                    cv2.imshow('frame', frame)
+
+                    # if 'q' keyword pressed and image has been showed
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        stopEvent.set()
+
+            # stop the reader if a stop signal is received
+            if stopRequested.is_set():
+                stopEvent.set()
+
+            # release the slot of the frame that will not be written
+            if stopEvent.is_set():
+                for i in range(len(pending)):
+                    slots.release()
+                pending.clear()
+
+    finally:
+
+        # stop the reader and detector threads, also when the writer stage fails
+        stopEvent.set()
+
+        # empty the detect queue so no detector waits on a full queue
+        while any(thread.is_alive() for thread in threads):
+            try:
+                detectQueue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+        for thread in threads:
+            thread.join()
+
+        # write the buffered rows and close the CSV files, also when 'q' is pressed
+        sink.close()
+
+        # write every waiting JPEG image
+        stopSnapshotWriter()
+
+        # count the reused hough transform result
+        stopHoughCache()
+
+        # write the profiling report
+        stopProfiler()
+
+        # release capture
+        capture.release()
+
+        # check render result video
+        if render is not None:
+
+            # release render
+            render.release()
+
+    wallTime = time.perf_counter() - wallStart
+
+    # end the progress line
+    if progress is not None:
+        progress.finish(nextFrame - 1)
+
+    # check show frame flag
+    if showFrame == True:
+
+        # destroy all created windows frame
+        cv2.destroyAllWindows()
+
+    if error is not None:
+        raise error
+
+    # print the work that is skipped because no output uses it
+    reportSavedWork()
+
+    # print the frames per second of every stage
+    print(readTimer.report())
+    print(detectTimer.report(workerNumber))
+    print(writeTimer.report())
+    if wallTime > 0:
+        print("total    %6d frames  %8.1f frames/s" % (writeTimer.frames, writeTimer.frames / wallTime))
+
+
+class PacedCapture:
+    """ a class to read a video file at its frame rate like a camera
+
+    A video file is read as fast as possible, so it is paced here to test
+    the live mode without a camera. It has the read, isOpened, get and
+    release functions of cv2.VideoCapture.
+    """
+
+    def __init__(self, capture, frameRate=30):
+        """
+        :param capture: opened video file
+        :type capture: cv2.VideoCapture
+        :param frameRate: frame per second of the pacing. Default is 30.
+        :type frameRate: float
+        """
+
+        self.capture = capture
+        self.interval = 1.0 / frameRate
+        self.nextTime = None
+
+    def read(self):
+        """ a function to wait for the time of the next frame and read it
+
+        :return: ret and frame like cv2.VideoCapture.read()
+        :rtype: tuple
+        """
+
+        now = time.perf_counter()
+        if self.nextTime is None:
+            self.nextTime = now
+        time.sleep(max(0.0, self.nextTime - now))
+        self.nextTime += self.interval
+
+        return self.capture.read()
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def get(self, propertyId):
+        return self.capture.get(propertyId)
+
+    def release(self):
+        self.capture.release()
+
+class LatestFrameReader:
+    """ a class to read a live source in a thread and keep only the newest frame
+
+    The thread reads every frame with its capture time. A frame that is
+    not taken before the next frame arrives is dropped, so the detection
+    always gets the newest frame and the latency does not grow when a frame
+    is slow.
+    """
+
+    def __init__(self, capture):
+        """
+        :param capture: live source with read() like cv2.VideoCapture
+        :type capture: cv2.VideoCapture
+        """
+
+        self.capture = capture
+        self.condition = threading.Condition()
+        self.frame = None
+        self.captureTime = None
+        self.sequence = 0
+        self.dropped = 0
+        self.finished = False
+        self.closed = False
+
+        # start the reader thread
+        self.thread = threading.Thread(target=self._read, daemon=True)
+        self.thread.start()
+
+    def _read(self):
+        """ a function of the reader thread to replace the waiting frame by the newest frame
+
+        :return: None
+        """
+
+        while not self.closed:
+            ret, frame = self.capture.read()
+            captureTime = time.perf_counter()
+
+            with self.condition:
+
+                # the source has no frame anymore
+                if ret == False:
+                    self.finished = True
+                    self.condition.notify_all()
+                    return
+
+                # the waiting frame is stale
+                if self.frame is not None:
+                    self.dropped += 1
+
+                self.sequence += 1
+                self.frame = frame
+                self.captureTime = captureTime
+                self.condition.notify_all()
+
+    def get(self):
+        """ a function to wait for and take the newest frame
+
+        :return: frame number, capture time and frame, or None if the
+            source has ended
+        :rtype: tuple
+        """
+
+        with self.condition:
+            while self.frame is None and not self.finished and not self.closed:
+                self.condition.wait()
+
+            if self.frame is None:
+                return None
+
+            item = (self.sequence, self.captureTime, self.frame)
+            self.frame = None
+            return item
+
+    def close(self):
+        """ a function to stop the reader thread
+
+        :return: None
+        """
+
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+        self.thread.join(timeout=1.0)
+
+def openLiveSource(source):
+    """ a function to open the source of the live mode
+
+    :param source: camera index, stream URL, video file or an object with
+        read() like cv2.VideoCapture (for example a synthetic source)
+    :type source: int or str or object
+    :return: live source
+    :rtype: cv2.VideoCapture
+    """
+
+    # an opened source
+    if not isinstance(source, (int, str)):
+        return source
+
+    capture = cv2.VideoCapture(source)
+
+    # a video file is read at its frame rate like a camera
+    if isinstance(source, str) and os.path.isfile(source) and livePacing == True:
+        frameRate = capture.get(cv2.CAP_PROP_FPS) or fps
+        return PacedCapture(capture, frameRate)
+
+    return capture
+
+def runLive(showFrame=True, source=None):
+    """ a function to run the detection on the newest frame of a live source
+
+    A reader thread keeps only the newest frame, so a slow frame makes the
+    following frames drop instead of waiting. The frame number is the
+    number of the frame in the source, so the CSV files have a gap at every
+    dropped frame. The latency from the capture to the start of the
+    detection ('wait') and to the end of saveFrameResult ('endToEnd') is
+    written with the number of captured, processed and dropped frames to
+    latencyReportFile (.json and .csv).
+
+    :param showFrame: if True then the result is shown in a window and the
+        loop stops when 'q' is pressed. Default is True.
+    :type showFrame: bool
+    :param source: live source, see openLiveSource. Default is None, the
+        liveSource setting.
+    :type source: int or str or object
+    :return: number of processed frame and number of frame where every
+        object is detected
+    :rtype: tuple
+    """
+
+    # open the live source and start reading it
+    capture = openLiveSource(liveSource if source is None else source)
+    reader = LatestFrameReader(capture)
+
+    # open the result video, the CSV files and the kinematics window
+    render = openRender()
+    sink = openResultSink()
+    kinematics = openKinematics()
+    tracks = openTrackManager()
+
+    # start the JPEG writer, the profiler and the hough cache
+    startSnapshotWriter()
+    startProfiler()
+    startHoughCache()
+
+    latency = StageProfiler()   # latency from capture of every processed frame
+    processed = 0           # Initialize number of processed frame
+    detectedFrame = 0       # Initialize number of frame where every object is detected
+    oldPos = []             # Initialize old object position list
+    prevPos = []            # Initialize object position list of the frame before oldPos
+
+    try:
+
+        # as long as no stop signal is received
+        while not stopRequested.is_set():
+
+            # take the newest frame, None if the source has ended
+            item = reader.get()
+            if item is None:
+                break
+            frameNumber, captureTime, frame = item
+            latency.stop('wait', captureTime)
+
+            # resize image so it will have same size
+            frame = resizeFrame(frame)
+
+            # check if the result image is used in this frame
+            annotate = needAnnotation(frameNumber, showFrame, render)
+
+            # search only around the predicted position
+            windows = None
+            if roiTracking == True:
+                windows = predictWindows(oldPos, prevPos, roiPadding)
+
+            # detect the object in the frame
+            newPos, radList, ballCount = detectBall(frame, frameNumber, annotate, windows)
+            if ballCount == ballNumber:
+                detectedFrame += 1
+
+            # track the object and save the result
+            lastPos = oldPos
+            oldPos = saveFrameResult(frame, frameNumber, oldPos, newPos, radList, ballCount, render, sink,
+                                     annotate, kinematics, tracks)
+            if oldPos is not lastPos:
+                prevPos = lastPos
+            else:
+                prevPos = []
+
+            # the result of the frame is emitted
+            latency.stop('endToEnd', captureTime)
+            processed += 1
+
+            # check show frame flag
+            if showFrame == True:
+
+                # show the image in windows frame
+                cv2.imshow('frame', frame)
+
+                # if 'q' keyword pressed and image has been showed
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+
+    finally:
+
+        # stop reading and close every output
+        reader.close()
+        sink.close()
+        stopSnapshotWriter()
+        stopHoughCache()
+        stopProfiler()
+        capture.release()
+        if render is not None:
+            render.release()
+
+    # write the latency report
+    latency.count('captured', reader.sequence)
+    latency.count('processed', processed)
+    latency.count('dropped', reader.dropped)
+    latency.save(latencyReportFile)
+
+    endToEnd = latency.summary()['stages'].get('endToEnd')
+    if endToEnd is not None:
+        print("latency p50 %.1f ms, p95 %.1f ms, p99 %.1f ms, max %.1f ms; processed %d of %d frames (%d dropped)" % (
+            endToEnd['p50Ms'], endToEnd['p95Ms'], endToEnd['p99Ms'], endToEnd['maxMs'],
+            processed, reader.sequence, reader.dropped))
+    print("latency report: " + latencyReportFile + ".json")
+
+    if showFrame == True:
+        cv2.destroyAllWindows()
+
+    reportSavedWork()
+
+    return processed, detectedFrame
+
+def splitSegments(frameCount, segmentNumber):
+    """ a function to split the frames of a video into frame ranges
+
+    :param frameCount: total number of frame in the video
+    :type frameCount: int
+    :param segmentNumber: number of segment
+    :type segmentNumber: int
+    :return: list of (first frame, last frame) of every segment, the frame
+        number starts from 1 like frameNumber in runDetection
+    :rtype: list
+    """
+
+    # there can not be more segment than frame
+    segmentNumber = max(1, min(segmentNumber, frameCount))
+
+    # get the first frame of every segment
+    bounds = [frameCount * i // segmentNumber for i in range(segmentNumber + 1)]
+
+    return [(bounds[i] + 1, bounds[i+1]) for i in range(segmentNumber)]
+
+def segmentFileName(csvFile, segmentIndex):
+    """ a function to get the file name of the CSV file of one segment
+
+    :param csvFile: file name and directory of the merged CSV file
+    :type csvFile: str
+    :param segmentIndex: index of the segment
+    :type segmentIndex: int
+    :return: file name of the segment CSV file
+    :rtype: str
+    """
+
+    return csvFile + '.seg' + str(segmentIndex)
+
+def detectSegment(segmentIndex, firstFrame, lastFrame, settings=None):
+    """ a function to detect and track the object in one frame range
+
+    This function runs in a worker process. It seeks the video to the first
+    frame with CAP_PROP_POS_FRAMES, detects the object in every frame of the
+    range and writes position, radius and range of the frames where every
+    object is detected into the segment CSV files. The identity of the
+    object is only valid inside the segment, it is reconciled later by
+    stitchSegments. A spawned worker starts with the default settings of the
+    file, so the settings of the caller are given with settings and applied
+    first.
+
+    :param segmentIndex: index of the segment
+    :type segmentIndex: int
+    :param firstFrame: first frame number of the segment
+    :type firstFrame: int
+    :param lastFrame: last frame number of the segment
+    :type lastFrame: int
+    :param settings: settings of the caller from DetectorConfig().settings.
+        Default is None, the settings of this process are used.
+    :type settings: dict
+    :return: position of the first and last tracked frame and number of
+        processed frame
+    :rtype: tuple
+    """
+
+    # use the settings of the caller
+    if settings is not None:
+        DetectorConfig(**settings).apply()
+
+    #open the video file and seek to the first frame of the segment
+    capture = cv2.VideoCapture(openFile)
+    capture.set(cv2.CAP_PROP_POS_FRAMES, firstFrame - 1)
+
+    # start writing JPEG images in separate threads
+    startSnapshotWriter()
+
+    # start keeping the hough transform result
+    startHoughCache()
+
+    # open the segment CSV files
+    posFile = open(segmentFileName(csvPosFile, segmentIndex), 'w', newline='')
+    radFile = open(segmentFileName(csvRadFile, segmentIndex), 'w', newline='')
+    rangeFile = open(segmentFileName(csvRangeBallFile, segmentIndex), 'w', newline='')
+    posWriter = csv.writer(posFile)
+    radWriter = csv.writer(radFile)
+    rangeWriter = csv.writer(rangeFile)
+
+    oldPos = []             # Initialize old object position list
+    firstPos = []           # position of the first tracked frame
+    frameNumber = firstFrame - 1
+
+    while frameNumber < lastFrame:
+
+        # reading the video file
+        ret, frame = readFrame(capture)
+
+        # if there isn't any frame ret equal to False
+        if ret == False:
+            break
+
+        # resize image so it will have same size
+        frame = resizeFrame(frame)
+
+        # add the frame number value by 1
+        frameNumber += 1
+
+        # detect the object in the frame, the result image is not used in this mode
+        newPos, radList, ballCount = detectBall(frame, frameNumber, False)
+
+        # if object detected is same with the number object that should be detected
+        if ballCount == ballNumber:
+
+            # track the object inside the segment
+            oldPos, radList = trackBall(oldPos, newPos, radList)
+
+            if not firstPos:
+                firstPos = [list(pos) for pos in oldPos]
+
+            # save the row with segment identity
+            posWriter.writerow([frameNumber] + [int(c) for pos in oldPos for c in pos])
+            radWriter.writerow([frameNumber] + [int(rad) for rad in radList])
+            rangeWriter.writerow([frameNumber] + calcRange(oldPos, ballNumber))
+
+    # release capture and close the segment files
+    capture.release()
+    stopSnapshotWriter()
+    stopHoughCache()
+    posFile.close()
+    radFile.close()
+    rangeFile.close()
+
+    lastPos = [[int(c) for c in pos] for pos in oldPos]
+    firstPos = [[int(c) for c in pos] for pos in firstPos]
+
+    return firstPos, lastPos, frameNumber - firstFrame + 1
+
+def rangeColumnOrder(perm, ballNumber):
+    """ a function to get the column order of the range distance after the
+    object identity has been changed
+
+    :param perm: perm[i] is the segment identity of the object with identity i
+    :type perm: list
+    :param ballNumber: the total number of the object
+    :type ballNumber: int
+    :return: list of column index in the segment row for every range column
+    :rtype: list
+    """
+
+    # column index of every pair in calcRangeBall order
+    column = {}
+    for i in range(ballNumber):
+        for j in range(i + 1, ballNumber):
+            column[(i, j)] = len(column)
+
+    # find the segment column of every pair of the new identity
+    order = []
+    for i in range(ballNumber):
+        for j in range(i + 1, ballNumber):
+            a, b = perm[i], perm[j]
+            order.append(column[(min(a, b), max(a, b))])
+
+    return order
+
+def stitchSegments(segments, results):
+    """ a function to merge the segment CSV files into the usual CSV files
+
+    The identity of the object in every segment is reconciled with the
+    previous segment by tracking the last tracked position of the previous
+    segment to the first tracked position of the segment (trackBall).
+
+    :param segments: list of (first frame, last frame) of every segment
+    :type segments: list
+    :param results: list of return value of detectSegment for every segment
+    :type results: list
+    :return: None
+    """
+
+    # initialize the CSV files
+    if getPositionBall == True:
+        InitPosToCSV(csvPosFile, ballNumber)
+    if getRadiusBall == True:
+        InitRadToCSV(csvRadFile, ballNumber)
+    if getRangeBall == True:
+        InitRangeToCSV(csvRangeBallFile, ballNumber)
+
+    lastPos = []            # last tracked position with the merged identity
+
+    for segmentIndex, (firstPos, segLastPos, frameCount) in enumerate(results):
+
+        # get the identity permutation of the segment
+        if lastPos and firstPos:
+            sortedPos, perm = trackBall([list(p) for p in lastPos],
+                                        [list(p) for p in firstPos],
+                                        list(range(ballNumber)))
+        else:
+            perm = list(range(ballNumber))
+
+        # keep the last position with the merged identity
+        if segLastPos:
+            lastPos = [segLastPos[k] for k in perm]
+
+        rangeOrder = rangeColumnOrder(perm, ballNumber)
+
+        # merge every CSV file with the merged identity
+        for csvFile, flag, columnOrder in (
+                (csvPosFile, getPositionBall, [2*k + c for k in perm for c in (0, 1)]),
+                (csvRadFile, getRadiusBall, list(perm)),
+                (csvRangeBallFile, getRangeBall, rangeOrder)):
+
+            segmentFile = segmentFileName(csvFile, segmentIndex)
+
+            if flag == True:
+                with open(segmentFile, 'r', newline='') as readFile, \
+                        open(csvFile, 'a') as writeFile:
+                    writer = csv.writer(writeFile)
+                    for row in csv.reader(readFile):
+                        writer.writerow([row[0]] + [row[1 + k] for k in columnOrder])
+
+            # remove the segment file
+            os.remove(segmentFile)
+
+def runSegments(workerNumber=4, segmentNumber=None, settings=None):
+    """ a function to run the detection of one video in several processes
+
+    The video is split into frame ranges, every range is detected in its own
+    process (detectSegment) and the result is merged into the usual CSV files
+    (stitchSegments). The result image and result video are not written in
+    this mode because the identity is only known after the merge.
+
+    :param workerNumber: number of worker process. Default is 4.
+    :type workerNumber: int
+    :param segmentNumber: number of segment. Default is same as workerNumber.
+    :type segmentNumber: int
+    :param settings: settings of every worker, e.g. DetectorConfig().settings.
+        Default is None, the current settings of this process.
+    :type settings: dict
+    :return: None
+    """
+
+    # the segments are stitched with the column order of the dense range
+    if rangeMode != 'dense':
+        raise ValueError("segment mode needs rangeMode 'dense'")
+
+    if segmentNumber is None:
+        segmentNumber = workerNumber
+
+    # get the total frame of the video
+    capture = cv2.VideoCapture(openFile)
+    frameCount = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+
+    segments = splitSegments(frameCount, segmentNumber)
+    wallStart = time.perf_counter()
+
+    # the settings of this process, a spawned worker does not inherit them
+    if settings is None:
+        settings = DetectorConfig().settings
+
+    # detect every segment in the process pool
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workerNumber) as pool:
+        futures = [pool.submit(detectSegment, i, first, last, settings)
+                   for i, (first, last) in enumerate(segments)]
+        results = [future.result() for future in futures]
+
+    # merge the segment into the usual CSV files
+    stitchSegments(segments, results)
+
+    # print the frames per second of the run
+    frames = sum(result[2] for result in results)
+    wallTime = time.perf_counter() - wallStart
+    print("%d segments  %d frames  %.1f frames/s" % (len(segments), frames, frames / wallTime))
+
+
+def findVideos(videoSource):
+    """ a function to get the list of video from a directory or a glob pattern
+
+    :param videoSource: directory of the videos or glob pattern such as
+        'D:\\videos\\*.mp4'
+    :type videoSource: str
+    :return: sorted list of video file name
+    :rtype: list
+    """
+
+    # if it is a directory, take every video file inside it
+    if os.path.isdir(videoSource):
+        videos = []
+        for extension in videoExtensions:
+            videos += glob.glob(os.path.join(videoSource, '*' + extension))
+    else:
+        videos = glob.glob(videoSource)
+
+    return sorted(set(videos))
+
+def setOutputFolder(outputFolder):
+    """ a function to change every output file and folder setting into one folder
+
+    The folder gets the same structure as pathFile (CSV files next to an
+    output folder with raw, hsv, filtered, result and video folder).
+
+    :param outputFolder: directory of the output
+    :type outputFolder: str
+    :return: None
+    """
+
+    global csvPosFile, csvRadFile, csvRangeBallFile, csvKinematicsFile, csvTrackFile, checkpointFile
+    global folderNameRaw, folderNameHSV, folderNameFiltered, folderNameResult
+    global videoResultFile
+
+    # create every output folder
+    for name in ('raw', 'hsv', 'filtered', 'result', 'video'):
+        os.makedirs(os.path.join(outputFolder, 'output', name), exist_ok=True)
+
+    csvPosFile = os.path.join(outputFolder, 'dataPosBola.csv')
+    csvRadFile = os.path.join(outputFolder, 'dataRadBola.csv')
+    csvRangeBallFile = os.path.join(outputFolder, 'dataRangeBola.csv')
+    csvKinematicsFile = os.path.join(outputFolder, 'dataKinematicsBola.csv')
+    csvTrackFile = os.path.join(outputFolder, 'dataTrackBola.csv')
+    checkpointFile = os.path.join(outputFolder, 'checkpoint.json')
+    folderNameRaw = os.path.join(outputFolder, 'output', 'raw', '')
+    folderNameHSV = os.path.join(outputFolder, 'output', 'hsv', '')
+    folderNameFiltered = os.path.join(outputFolder, 'output', 'filtered', '')
+    folderNameResult = os.path.join(outputFolder, 'output', 'result', '')
+    videoResultFile = os.path.join(outputFolder, 'output', 'video', 'result.avi')
+
+def processVideo(videoFile, outputFolder, settings=None):
+    """ a function to run the detection of one video into its own output folder
+
+    This function runs in a worker process of runBatch, so changing the
+    settings only affects this process. A spawned worker starts with the
+    default settings of the file, so the settings of the caller are given
+    with settings and applied first.
+
+    :param videoFile: file name and directory of the video
+    :type videoFile: str
+    :param outputFolder: directory of the output of this video
+    :type outputFolder: str
+    :param settings: settings of the caller from DetectorConfig().settings.
+        Default is None, the settings of this process are used.
+    :type settings: dict
+    :return: one manifest row of the video
+    :rtype: dict
+    """
+
+    global openFile
+
+    # use the settings of the caller
+    if settings is not None:
+        DetectorConfig(**settings).apply()
+
+    # set the input and output of this video
+    openFile = videoFile
+    setOutputFolder(outputFolder)
+
+    # run the detection loop without window
+    start = time.perf_counter()
+    frames, detectedFrame = runDetection(showFrame=False)
+    wallTime = time.perf_counter() - start
+
+    # get the detection rate
+    if frames > 0:
+        detectionRate = detectedFrame / frames
+    else:
+        detectionRate = 0.0
+
+    return {'video': videoFile,
+            'output': outputFolder,
+            'frames': frames,
+            'detectedFrames': detectedFrame,
+            'detectionRate': round(detectionRate, 4),
+            'wallTime': round(wallTime, 3)}
+
+def runBatch(videoSource, outputRoot, workerNumber=4, settings=None):
+    """ a function to run the detection of several videos in a process pool
+
+    Every video gets its own output folder inside outputRoot, named by the
+    video file name. A manifest.csv file with the frames processed, wall
+    time and detection rate of every video is written in outputRoot.
+
+    :param videoSource: directory of the videos or glob pattern
+    :type videoSource: str
+    :param outputRoot: directory where the output folder of every video is created
+    :type outputRoot: str
+    :param workerNumber: number of worker process. Default is 4.
+    :type workerNumber: int
+    :param settings: settings of every worker, e.g. DetectorConfig().settings.
+        Default is None, the current settings of this process.
+    :type settings: dict
+    :return: list of manifest row
+    :rtype: list
+    """
+
+    videos = findVideos(videoSource)
+    os.makedirs(outputRoot, exist_ok=True)
+
+    # get the output folder of every video, videos with same name get a number
+    outputFolders = []
+    for videoFile in videos:
+        name = os.path.splitext(os.path.basename(videoFile))[0]
+        folder = os.path.join(outputRoot, name)
+        number = 1
+        while folder in outputFolders:
+            number += 1
+            folder = os.path.join(outputRoot, name + '_' + str(number))
+        outputFolders.append(folder)
+
+    # the settings of this process, a spawned worker does not inherit them
+    if settings is None:
+        settings = DetectorConfig().settings
+
+    # run every video in the process pool
+    manifest = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workerNumber) as pool:
+        futures = [pool.submit(processVideo, videoFile, folder, settings)
+                   for videoFile, folder in zip(videos, outputFolders)]
+
+        for future in futures:
+            row = future.result()
+            manifest.append(row)
+            print("%s  %d frames  %.1f s  detection rate %.2f" % (
+                row['video'], row['frames'], row['wallTime'], row['detectionRate']))
+
+    # write the manifest
+    fieldNames = ['video', 'output', 'frames', 'detectedFrames', 'detectionRate', 'wallTime']
+    with open(os.path.join(outputRoot, 'manifest.csv'), 'w', newline='') as writeFile:
+        writer = csv.DictWriter(writeFile, fieldnames=fieldNames)
+        writer.writeheader()
+        writer.writerows(manifest)
+
+    return manifest
+
+class DetectorConfig:
+    """ a class to keep the settings of the detection
+
+    The settings are the module variables in settingNames (pathFile, radius,
+    HSV treshold, flags, ...). A new config starts from the current value of
+    every setting, can be changed like a dictionary and is used by apply(),
+    which sets the module variables, because every function reads the
+    settings from the module. There is one active config per process.
+
+    A changed pathFile also moves every file and folder setting in
+    pathSettingNames that is still below the old pathFile, like the file
+    names at the top of the file are made from pathFile.
+    """
+
+    def __init__(self, **settings):
+        """
+        :param settings: setting name and value that replace the current value
+        """
+
+        self.settings = {name: globals()[name] for name in settingNames}
+        self.update(settings)
+
+    def update(self, settings):
+        """ a function to change some settings
+
+        :param settings: dictionary of setting name and value
+        :type settings: dict
+        :return: None
+        """
+
+        # pathFile first, so a file name given with it is not moved again
+        for name, value in sorted(settings.items(), key=lambda item: item[0] != 'pathFile'):
+            if name not in self.settings:
+                raise ValueError("unknown setting " + name)
+
+            # JSON has no tuple
+            if isinstance(self.settings[name], tuple) and isinstance(value, list):
+                value = tuple(value)
+
+            # the file names below the old pathFile are moved to the new pathFile
+            if name == 'pathFile':
+                oldPath = self.settings['pathFile']
+                for pathName in pathSettingNames:
+                    if self.settings[pathName].startswith(oldPath):
+                        self.settings[pathName] = value + self.settings[pathName][len(oldPath):]
+
+            self.settings[name] = value
+
+    def __getitem__(self, name):
+        return self.settings[name]
+
+    def __setitem__(self, name, value):
+        self.update({name: value})
+
+    @classmethod
+    def fromFile(cls, configFile):
+        """ a function to read a config from a JSON file
+
+        :param configFile: file name of the JSON file with setting name and value
+        :type configFile: str
+        :return: config with the current settings changed by the file
+        :rtype: DetectorConfig
+        """
+
+        with open(configFile) as readFile:
+            return cls(**json.load(readFile))
+
+    @classmethod
+    def fromArguments(cls, arguments):
+        """ a function to get a config from the command line options
+
+        :param arguments: options from parseArguments (--config and --set)
+        :type arguments: argparse.Namespace
+        :return: config from the --config file changed by every --set NAME=VALUE
+        :rtype: DetectorConfig
+        """
+
+        config = cls.fromFile(arguments.config) if arguments.config else cls()
+
+        for item in arguments.set or []:
+            name, equal, value = item.partition('=')
+            if not equal:
+                raise ValueError("--set needs NAME=VALUE, got " + item)
+
+            # a Python literal (number, True, 'text', ...), otherwise a string
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                pass
+            config[name] = value
+
+        return config
+
+    def save(self, configFile):
+        """ a function to write the config into a JSON file
+
+        :param configFile: file name of the JSON file
+        :type configFile: str
+        :return: None
+        """
+
+        with open(configFile, 'w') as writeFile:
+            json.dump(self.settings, writeFile, indent=2)
+
+    def apply(self):
+        """ a function to set the module settings from the config
+
+        :return: None
+        """
+
+        global lowerTreshold, upperTreshold, boundColor
+
+        globals().update(self.settings)
+
+        # the treshold and boundary color are combined from the settings
+        lowerTreshold = (h_Min, s_Min, v_Min)
+        upperTreshold = (h_Max, s_Max, v_Max)
+        boundColor = (blue, green, red)
+
+def detectFrames(source, config=None):
+    """ a generator to detect and track the object in every frame of a video
+
+    The records are made while the caller iterates, and no image, CSV file
+    or video is written (the print and render flags are turned off until
+    the generator ends). The identity of the object is tracked like the
+    detection loop, so the record of a tracked frame has ids 1 to
+    ballNumber with the sorted positions, radius and range distance. In a
+    frame where not every object is found, 'tracked' is False, ids and
+    ranges are empty and the detected positions are not sorted.
+
+    :param source: opened video capture, file name of a video or index of a
+        camera
+    :type source: cv2.VideoCapture or str or int
+    :param config: config that is applied before the first frame. Default is
+        None, the current settings are used.
+    :type config: DetectorConfig
+    :return: generator of dictionary with 'frame', 'tracked', 'ids',
+        'positions', 'radii' and 'ranges' (also 'velocity', 'speed' and
+        'acceleration' if getKinematicsBall flag is True, and 'neighbors'
+        with [idA, idB, distance] of the near pairs if rangeMode is 'neighbor',
+        and 'tracks' with [ID, x, y, radius, coasting] of every alive track
+        if manageTracks flag is True)
+    :rtype: generator
+    """
+
+    # keep the settings of the caller, they are restored when the generator ends
+    previous = DetectorConfig()
+    capture = source
+
+    try:
+        if config is not None:
+            config.apply()
+
+        # turn off every file output
+        DetectorConfig(printRaw=False, printHSV=False, printFiltered=False, printResult=False,
+                       renderVideoResult=False).apply()
+
+        # open the source if it is not a capture
+        if not isinstance(source, cv2.VideoCapture):
+            capture = cv2.VideoCapture(source)
+
+        startHoughCache()
+        kinematics = openKinematics()
+        tracks = openTrackManager()
+
+        frameNumber = 0         # Initialize frame number variable
+        oldPos = []             # Initialize old object position list
+        prevPos = []            # Initialize object position list of the frame before oldPos
+
+        while capture.isOpened():
+
+            # the frame is not kept after the detection, so the buffer is reused
+            ret, frame = readFrame(capture)
+            if ret == False:
+                break
+            frame = resizeFrame(frame)
+            frameNumber += 1
+
+            # search only around the predicted position
+            windows = None
+            if roiTracking == True:
+                windows = predictWindows(oldPos, prevPos, roiPadding)
+
+            newPos, radList, ballCount = detectBall(frame, frameNumber, False, windows)
+
+            record = {'frame': frameNumber, 'tracked': False, 'ids': [],
+                      'positions': [[int(c) for c in pos] for pos in newPos],
+                      'radii': [int(rad) for rad in radList], 'ranges': []}
+
+            # every alive track, also in a frame with missed or extra object
+            if tracks is not None:
+                ids, trackPos, trackRad, coasting = tracks.update(newPos, radList)
+                record['tracks'] = [[trackId, x, y, radius, coast] for trackId, (x, y), radius, coast in
+                                    zip(ids.tolist(), np.rint(trackPos).astype(int).tolist(),
+                                        np.rint(trackRad).astype(int).tolist(), coasting.tolist())]
+
+            # track the object like saveFrameResult
+            if ballCount == ballNumber:
+                lastPos = oldPos
+                oldPos, radList = trackBall(oldPos, newPos, radList)
+                prevPos = lastPos
+
+                record['tracked'] = True
+                record['ids'] = list(range(1, ballNumber + 1))
+                record['positions'] = [[int(c) for c in pos] for pos in oldPos]
+                record['radii'] = [int(rad) for rad in radList]
+                if rangeMode == 'neighbor':
+                    idA, idB, distance = neighborRange(oldPos, rangeCutoff)
+                    record['neighbors'] = [list(row) for row in zip(idA.tolist(), idB.tolist(),
+                                                                    distance.tolist())]
+                else:
+                    record['ranges'] = list(calcRange(oldPos, ballNumber))
+
+                if kinematics is not None:
+                    velocity, speed, acceleration = kinematics.update(frameNumber, oldPos)
+                    record['velocity'] = velocity.tolist()
+                    record['speed'] = speed.tolist()
+                    record['acceleration'] = acceleration.tolist()
+
+            else:
+                prevPos = []
+
+            yield record
+
+    finally:
+
+        # release the capture that is opened here
+        if capture is not source:
+            capture.release()
+
+        # restore the settings of the caller, also the settings changed by config
+        stopHoughCache()
+        previous.apply()
+
+
+if __name__ == '__main__':
+
+    # read the command line options
+    arguments = parseArguments()
+
+    # apply the settings of the config file and --set options
+    if arguments.config or arguments.set:
+        DetectorConfig.fromArguments(arguments).apply()
+    if arguments.headless:
+        headless = True
+    if arguments.progress:
+        showProgress = True
+    if arguments.profile:
+        profileRun = True
+    if arguments.checkpoint is not None:
+        checkpointInterval = arguments.checkpoint
+    if arguments.resume:
+        resumeRun = True
+    if arguments.live:
+        liveMode = True
+
+    # the settings with every option above, given to the worker processes
+    # because a spawned worker only has the settings of the file
+    settings = DetectorConfig().settings
+
+    # check batch mode flag
+    if batchMode == True:
+
+        # run the detection of every video with process pool
+        runBatch(batchSource, batchOutput, batchWorkers, settings)
+
+    # check segment mode flag
+    elif segmentMode == True:
+
+        # run the detection with process pool
+        runSegments(segmentWorkers, segmentNumber=None, settings=settings)
+
+    # check live mode flag
+    elif liveMode == True:
+
+        # stop gracefully on SIGINT and SIGTERM
+        installStopHandler()
+
+        # run the detection on the newest frame of the live source
+        runLive(not headless)
+
+    # check pipeline mode flag
+    elif pipelineMode == True:
+
+        # stop gracefully on SIGINT and SIGTERM
+        installStopHandler()
+
+        # run the detection with threaded pipeline
+        runPipeline(detectorWorkers, pipelineQueueSize, not headless)
+
+    else:
+
+        # stop gracefully on SIGINT and SIGTERM
+        installStopHandler()
+
+        # run the detection loop
+        runDetection(not headless)